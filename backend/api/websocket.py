@@ -1,9 +1,10 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
 import json
-from typing import Dict, Set, Any, Optional
+from typing import Dict, Set, Any, Iterator, Optional
 import asyncio
 from datetime import datetime
+from itertools import islice
 import logging
 
 logger = logging.getLogger(__name__)
@@ -340,6 +341,22 @@ class WebSocketManager:
             "periodic_updates_active": self.periodic_task and not self.periodic_task.done()
         }
     
+    def iter_connection_details(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield details for a page of connections, built only as they are consumed"""
+        current_time = datetime.now()
+        stop = None if limit is None else offset + limit
+        
+        for info in islice(list(self.connection_info.values()), offset, stop):
+            yield {
+                "client_id": info["client_id"],
+                "channel": info["channel"],
+                "connected_at": info["connected_at"].isoformat(),
+                "connected_duration_seconds": (current_time - info["connected_at"]).total_seconds(),
+                "messages_sent": info["messages_sent"],
+                "messages_received": info["messages_received"],
+                "last_heartbeat": datetime.fromtimestamp(info["last_heartbeat"]).isoformat()
+            }
+    
     def stop_background_tasks(self):
         """Stop background tasks"""
         self._is_running = False
@@ -358,6 +375,24 @@ websocket_manager = WebSocketManager()
 # Start background tasks when module is imported
 websocket_manager.start_background_tasks()
 
+@router.get("/stats")
+async def websocket_stats():
+    """Get connection counts of the /ws channels"""
+    return websocket_manager.get_connection_stats()
+
+@router.get("/stats/details")
+async def websocket_stats_details(
+    offset: int = Query(0, ge=0, description="Offset for pagination"),
+    limit: int = Query(100, ge=1, le=1000, description="Max connections to return")
+):
+    """Get a page of per-connection details of the /ws channels"""
+    return {
+        "total_connections": len(websocket_manager.connection_info),
+        "offset": offset,
+        "limit": limit,
+        "connections": list(websocket_manager.iter_connection_details(offset, limit))
+    }
+
 @router.websocket("/alerts")
 async def websocket_alerts_endpoint(websocket: WebSocket):
     """WebSocket endpoint for system alerts - FIXED"""
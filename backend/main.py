@@ -12,6 +12,7 @@ from api import (
     alerts, locations, device_discovery, auth, mqtt_export  # ✅ ADDED auth and mqtt_export
 )
 from services.protocol_manager import protocol_manager
+from services.protocol_services import stop_all_protocol_services
 from services.websocket_manager import start_websocket_heartbeat
 
 load_dotenv()
@@ -57,6 +58,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️ Error stopping protocols: {e}")
     
+    # Stop the protocol services, releasing resources not owned by a protocol
+    try:
+        await stop_all_protocol_services()
+        print("✅ Protocol services stopped")
+    except Exception as e:
+        print(f"⚠️ Error stopping protocol services: {e}")
+    
     # Close database connection
     try:
         await close_database()
@@ -184,7 +192,7 @@ async def health_check():
         
         # Get WebSocket manager stats  
         from services.websocket_manager import websocket_manager
-        ws_stats = websocket_manager.get_connection_stats()
+        ws_stats = websocket_manager.get_connection_counts()
         
         # Check auth system
         from api.auth import users_storage
@@ -304,5 +312,7 @@ if __name__ == "__main__":
         host=host,
         port=port,
         reload=True if environment == "development" else False,
-        log_level="info"
+        log_level="info",
+        # Broadcasts are compressed once by the WebSocket manager
+        ws_per_message_deflate=False
     )
\ No newline at end of file
@@ -66,7 +66,9 @@ if __name__ == "__main__":
             port=3001,
             reload=True,
             log_level="info",
-            access_log=True
+            access_log=True,
+            # Broadcasts are compressed once by the WebSocket manager
+            ws_per_message_deflate=False
         )
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
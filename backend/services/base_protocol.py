@@ -2,19 +2,97 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 import asyncio
 import logging
+import os
+import time
 from datetime import datetime
+from pathlib import Path
 import random
 
 logger = logging.getLogger(__name__)
 
+# Severity ordering for per-protocol event log thresholds
+LOG_LEVEL_ORDER = {"debug": 10, "info": 20, "warning": 30, "error": 40, "critical": 50}
+
+# Refresh interval of the coarse clock used for hot-path timestamps
+COARSE_CLOCK_INTERVAL = 0.005
+
+# Seconds between monitoring ticks, and before retrying a tick that failed
+MONITORING_INTERVAL = 1.0
+MONITORING_RETRY_DELAY = 5.0
+
+
+def owner_only(path: Path) -> bool:
+    """Whether only the current user can have written a cache path (always true where uids do not exist)"""
+    if not hasattr(os, "getuid"):
+        return True
+    stat = path.stat()
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+class _TimerWheel:
+    """Runs the periodic callbacks of every service from one task"""
+    
+    def __init__(self):
+        # key -> [deadline, interval, callback]
+        self._entries: Dict[Any, list] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+    
+    def register(self, key: Any, interval: float, callback):
+        """Run callback now and then every interval seconds until unregistered"""
+        self._entries[key] = [time.monotonic(), interval, callback]
+        if not self._task or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        else:
+            self._wakeup.set()
+    
+    def unregister(self, key: Any):
+        """Stop running the callback registered under key"""
+        self._entries.pop(key, None)
+    
+    async def _dispatch(self, entry: list, now: float):
+        """Run one expired callback and schedule its next deadline"""
+        try:
+            await entry[2]()
+            # Align to a multiple of the interval so callbacks sharing it expire on the same wakeup
+            entry[0] = (now // entry[1] + 1) * entry[1]
+        except Exception as e:
+            logger.error(f"Error in timer callback {entry[2]}: {e}")
+            entry[0] = now + MONITORING_RETRY_DELAY
+    
+    async def _run(self):
+        """Internal timer loop"""
+        while self._entries:
+            now = time.monotonic()
+            due = [entry for entry in self._entries.values() if entry[0] <= now]
+            if due:
+                await asyncio.gather(*(self._dispatch(entry, now) for entry in due))
+            if not self._entries:
+                break
+            
+            self._wakeup.clear()
+            delay = min(entry[0] for entry in self._entries.values()) - time.monotonic()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+
+
+# Shared by all protocol services of the process
+_timer_wheel = _TimerWheel()
+
 class BaseProtocolService(ABC):
     """Base class for all industrial protocol services"""
     
     def __init__(self, protocol_type: str):
         self.protocol_type = protocol_type
         self.active_connections: Dict[str, Dict] = {}
+        self.log_levels: Dict[str, str] = {}
         self.is_running = False
-        self.monitoring_task: Optional[asyncio.Task] = None
+        # utcnow() refreshed every COARSE_CLOCK_INTERVAL while the coarse clock runs
+        self._coarse_now = datetime.utcnow()
+        self._coarse_clock_task: Optional[asyncio.Task] = None
         logger.info(f"Initialized {protocol_type} protocol service")
     
     @abstractmethod
@@ -43,34 +121,38 @@ class BaseProtocolService(ABC):
         pass
     
     async def start_monitoring(self):
-        """Start monitoring task for real-time data generation"""
-        if not self.monitoring_task or self.monitoring_task.done():
+        """Start real-time data generation on the shared timer wheel"""
+        if not self.is_running:
             self.is_running = True
-            self.monitoring_task = asyncio.create_task(self._monitoring_loop())
+            _timer_wheel.register(self, MONITORING_INTERVAL, self._generate_monitoring_data)
             logger.info(f"Started monitoring for {self.protocol_type}")
     
     async def stop_monitoring(self):
-        """Stop monitoring task"""
+        """Stop real-time data generation"""
         self.is_running = False
-        if self.monitoring_task and not self.monitoring_task.done():
-            self.monitoring_task.cancel()
-            try:
-                await self.monitoring_task
-            except asyncio.CancelledError:
-                pass
+        _timer_wheel.unregister(self)
         logger.info(f"Stopped monitoring for {self.protocol_type}")
     
-    async def _monitoring_loop(self):
-        """Internal monitoring loop - generates real-time data"""
-        while self.is_running:
+    def _start_coarse_clock(self):
+        """Start refreshing the coarse timestamp shared by per-message updates"""
+        if not self._coarse_clock_task or self._coarse_clock_task.done():
+            self._coarse_now = datetime.utcnow()
+            self._coarse_clock_task = asyncio.create_task(self._coarse_clock_loop())
+    
+    async def _stop_coarse_clock(self):
+        """Stop refreshing the coarse timestamp"""
+        if self._coarse_clock_task and not self._coarse_clock_task.done():
+            self._coarse_clock_task.cancel()
             try:
-                await self._generate_monitoring_data()
-                await asyncio.sleep(1)  # Generate data every second
+                await self._coarse_clock_task
             except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in monitoring loop for {self.protocol_type}: {e}")
-                await asyncio.sleep(5)  # Wait before retrying
+                pass
+    
+    async def _coarse_clock_loop(self):
+        """Internal coarse clock loop"""
+        while True:
+            self._coarse_now = datetime.utcnow()
+            await asyncio.sleep(COARSE_CLOCK_INTERVAL)
     
     async def _generate_monitoring_data(self):
         """Generate monitoring data for active connections"""
@@ -126,8 +208,21 @@ class BaseProtocolService(ABC):
         except Exception as e:
             logger.error(f"Error broadcasting monitoring data for {protocol_id}: {e}")
     
+    def _set_log_level(self, protocol_id: str, configuration: Dict[str, Any]):
+        """Remember the event log threshold configured for a protocol"""
+        level = str(configuration.get("logLevel", "info")).lower()
+        self.log_levels[protocol_id] = level if level in LOG_LEVEL_ORDER else "info"
+    
+    def _log_level_enabled(self, protocol_id: str, level: str) -> bool:
+        """Check whether an event of the given level would be persisted for a protocol"""
+        threshold = self.log_levels.get(protocol_id, "info")
+        return LOG_LEVEL_ORDER.get(level, 20) >= LOG_LEVEL_ORDER[threshold]
+    
     async def _log_protocol_event(self, protocol_id: str, level: str, message: str, metadata: Dict = None):
         """Log protocol events - using lazy import to avoid circular imports"""
+        if not self._log_level_enabled(protocol_id, level):
+            return
+        
         try:
             # Lazy import to avoid circular imports
             from models.system_log import SystemLog, LogLevel
@@ -148,6 +243,36 @@ class BaseProtocolService(ABC):
         except Exception as e:
             logger.error(f"Error logging protocol event for {protocol_id}: {e}")
     
+    async def _log_protocol_events(self, protocol_id: str, events: list):
+        """Log a batch of (level, message, metadata, timestamp) protocol events with one insert"""
+        events = [event for event in events if self._log_level_enabled(protocol_id, event[0])]
+        if not events:
+            return
+        
+        try:
+            # Lazy import to avoid circular imports
+            from models.system_log import SystemLog, LogLevel
+            
+            source = f"protocol.{self.protocol_type}.{protocol_id}"
+            await SystemLog.insert_many([
+                SystemLog(
+                    level=LogLevel(level),
+                    source=source,
+                    message=message,
+                    metadata=metadata or {},
+                    timestamp=timestamp
+                )
+                for level, message, metadata, timestamp in events
+            ])
+            
+            # Broadcast log entries
+            from services.websocket_manager import websocket_manager
+            for level, message, metadata, _ in events:
+                await websocket_manager.broadcast_log_entry(level, source, message, metadata)
+            
+        except Exception as e:
+            logger.error(f"Error logging protocol events for {protocol_id}: {e}")
+    
     def generate_mock_value(self, data_type: str) -> Any:
         """Generate mock values based on data type for testing purposes"""
         if data_type == "boolean":
@@ -193,7 +318,7 @@ class BaseProtocolService(ABC):
             "protocol_type": self.protocol_type,
             "is_running": self.is_running,
             "active_connections": len(self.active_connections),
-            "monitoring_active": self.monitoring_task is not None and not self.monitoring_task.done(),
+            "monitoring_active": self.is_running,
             "connection_details": {
                 conn_id: {
                     "status": info.get("status", "unknown"),
@@ -126,18 +126,19 @@ class ProtocolManager:
         """Start all protocols from database that should be running"""
         try:
             protocols = await Protocol.find_all().to_list()
-            started_count = 0
-            
-            for protocol in protocols:
-                # Only start protocols that were previously connected
-                if protocol.status == ProtocolStatus.CONNECTED:
-                    success = await self.start_protocol(
-                        str(protocol.id),
-                        protocol.type,  # Pass ProtocolType enum directly
-                        protocol.configuration
-                    )
-                    if success:
-                        started_count += 1
+            
+            # Only start protocols that were previously connected, concurrently so a
+            # slow or unreachable device does not hold up the others
+            results = await asyncio.gather(*[
+                self.start_protocol(
+                    str(protocol.id),
+                    protocol.type,  # Pass ProtocolType enum directly
+                    protocol.configuration
+                )
+                for protocol in protocols
+                if protocol.status == ProtocolStatus.CONNECTED
+            ])
+            started_count = sum(1 for success in results if success)
             
             logger.info(f"Started {started_count} protocols from database")
             return True
@@ -61,6 +61,10 @@ def _load_protocol_service(protocol_type: ProtocolType) -> Optional[BaseProtocol
     except ImportError as e:
         logger.error(f"Failed to import protocol service for {protocol_type}: {e}")
         return None
+    except RuntimeError as e:
+        # Services refuse to instantiate when their protocol library is missing
+        logger.error(f"Protocol service for {protocol_type} unavailable: {e}")
+        return None
 
 # Helper functions
 def get_all_available_protocols() -> list:
@@ -1,37 +1,176 @@
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from typing import Dict, Any, List, Optional, Sequence, Set, Tuple
 from datetime import datetime
-
-try:
-    from bacpypes.core import run, stop
-    from bacpypes.pdu import Address
-    from bacpypes.app import BIPSimpleApplication
-    from bacpypes.local.device import LocalDeviceObject
-    from bacpypes.basetypes import ServicesSupported, PropertyIdentifier
-    from bacpypes.primitivedata import Real, Unsigned, Boolean, CharacterString
-    from bacpypes.constructeddata import Array
-    from bacpypes.apdu import ReadPropertyRequest, WritePropertyRequest
-    BACNET_AVAILABLE = True
-except ImportError:
-    BACNET_AVAILABLE = False
+from types import SimpleNamespace
 
 from ..base_protocol import BaseProtocolService
 
 logger = logging.getLogger(__name__)
 
+# Properties fetched for every object when reading a device's object list
+_OBJECT_LIST_PROPERTIES = ("objectName", "objectType", "units", "description")
+# Interval at which aggregated error events are flushed to the event log
+_ERROR_FLUSH_INTERVAL = 1.0
+# Upper bounds for ReadPropertyMultiple fan-out
+_RPM_MAX_OBJECTS = 16
+_RPM_CONCURRENCY = 16
+
+# bacpypes is imported on first use so deployments without BACnet skip its import cost
+_bacpypes: Optional[SimpleNamespace] = None
+_bacpypes_checked = False
+
+
+def _load_bacpypes() -> Optional[SimpleNamespace]:
+    """Import bacpypes once and cache the symbols used by the service - None when not installed"""
+    global _bacpypes, _bacpypes_checked
+    if not _bacpypes_checked:
+        _bacpypes_checked = True
+        try:
+            from bacpypes.core import run, stop
+            from bacpypes.pdu import Address
+            from bacpypes.app import BIPSimpleApplication
+            from bacpypes.local.device import LocalDeviceObject
+            from bacpypes.basetypes import ServicesSupported, PropertyReference, ReadAccessSpecification
+            from bacpypes.object import get_datatype
+            from bacpypes.primitivedata import Real, Unsigned, Boolean, CharacterString, ObjectIdentifier
+            from bacpypes.constructeddata import ArrayOf
+            from bacpypes.apdu import ReadPropertyRequest, WritePropertyRequest, ReadPropertyMultipleRequest
+        except ImportError:
+            return None
+        
+        # Services advertised by every local device, built once
+        services = ServicesSupported()
+        services['whoIs'] = 1
+        services['iAm'] = 1
+        services['readProperty'] = 1
+        services['writeProperty'] = 1
+        
+        _bacpypes = SimpleNamespace(
+            run=run, stop=stop, Address=Address,
+            BIPSimpleApplication=BIPSimpleApplication, LocalDeviceObject=LocalDeviceObject,
+            PropertyReference=PropertyReference, ReadAccessSpecification=ReadAccessSpecification,
+            get_datatype=get_datatype, Real=Real, Unsigned=Unsigned, Boolean=Boolean,
+            CharacterString=CharacterString, ReadPropertyRequest=ReadPropertyRequest,
+            ObjectIdentifierArray=ArrayOf(ObjectIdentifier),
+            WritePropertyRequest=WritePropertyRequest, ReadPropertyMultipleRequest=ReadPropertyMultipleRequest,
+            SERVICES=services
+        )
+    return _bacpypes
+
+# A single bacpypes core loop is shared by every BACnet application in the process
+_CORE_LOCK = threading.Lock()
+_CORE_THREAD: Optional[threading.Thread] = None
+# Stopped core thread that had not left run() yet when it was released
+_CORE_STOPPING: Optional[threading.Thread] = None
+# Protocol ids using the core, so repeated starts of one protocol count once
+_CORE_USERS: Set[str] = set()
+# Seconds to wait for a stopped core loop to leave run()
+_CORE_JOIN_TIMEOUT = 5.0
+
+
+def _join_core(thread: threading.Thread):
+    """Stop a core thread and wait until its run() loop has returned"""
+    _bacpypes.stop()
+    thread.join(_CORE_JOIN_TIMEOUT)
+    if thread.is_alive():
+        logger.warning("bacpypes core loop did not stop in time")
+
+
+def _acquire_core(user: str):
+    """Register an application with the shared bacpypes core, starting it on first use (blocking)"""
+    global _CORE_THREAD, _CORE_STOPPING
+    with _CORE_LOCK:
+        _CORE_USERS.add(user)
+        if _CORE_STOPPING is not None:
+            # Never run a second loop next to one that is still shutting down
+            _join_core(_CORE_STOPPING)
+            _CORE_STOPPING = None
+        if _CORE_THREAD is not None and not _CORE_THREAD.is_alive():
+            _CORE_THREAD = None
+        if _CORE_THREAD is None:
+            # Signal handlers can only be installed from the main thread
+            _CORE_THREAD = threading.Thread(
+                target=_bacpypes.run,
+                kwargs={"sigterm": None, "sigusr1": None},
+                name="bacpypes-core",
+                daemon=True
+            )
+            _CORE_THREAD.start()
+
+
+def _release_core(user: str):
+    """Unregister an application and stop the shared core once the last one is gone (blocking)"""
+    global _CORE_THREAD, _CORE_STOPPING
+    with _CORE_LOCK:
+        _CORE_USERS.discard(user)
+        if not _CORE_USERS and _CORE_THREAD is not None:
+            # Joined under the lock so a following acquire cannot start a second run() next to this one
+            _join_core(_CORE_THREAD)
+            if _CORE_THREAD.is_alive():
+                _CORE_STOPPING = _CORE_THREAD
+            _CORE_THREAD = None
+
+
+class BACnetError(Exception):
+    """Base class for BACnet service errors"""
+
+
+class BACnetNotAvailable(BACnetError):
+    """Raised when the bacpypes library is not installed"""
+
+
+class BACnetRequestError(BACnetError):
+    """Base class for failed BACnet property requests - the message is only built when rendered"""
+    
+    operation = "request"
+    
+    def __init__(self, connection_id: str, data_point_config: Dict[str, Any]):
+        super().__init__(connection_id, data_point_config)
+        self.connection_id = connection_id
+        self.data_point_config = data_point_config
+    
+    def __str__(self):
+        config = self.data_point_config
+        target = f"{config.get('objectType')}:{config.get('objectInstance')}.{config.get('propertyId')}"
+        cause = f": {self.__cause__}" if self.__cause__ is not None else ""
+        return f"BACnet {self.operation} failed for {target} on {self.connection_id}{cause}"
+
+
+class BACnetReadError(BACnetRequestError):
+    """Raised when reading a BACnet object property fails"""
+    
+    operation = "read"
+
+
+class BACnetWriteError(BACnetRequestError):
+    """Raised when writing a BACnet object property fails"""
+    
+    operation = "write"
+
+
 class BACnetService(BaseProtocolService):
     """BACnet protocol service - Real implementation using bacpypes"""
     
     def __init__(self):
         super().__init__("bacnet")
-        self.applications: Dict[str, BIPSimpleApplication] = {}
+        self.applications: Dict[str, Any] = {}
         self.discovered_devices: Dict[str, Dict[int, Dict]] = {}
         self.running_apps: Dict[str, bool] = {}
+        # Controllers serve one APDU at a time, so requests are bounded per device address
+        self._per_addr_sem: Dict[Tuple[str, str], asyncio.Semaphore] = {}
+        # Polling sees few (object type, property) shapes, so datatype lookups are memoized
+        self._dtype_cache: Dict[Tuple[str, str], Optional[type]] = {}
+        # Identical errors are collapsed into one event per flush interval: (count, first seen, last error)
+        self._err_agg: Dict[Tuple[str, str], Tuple[int, float, Exception]] = {}
+        self._err_flush_task: Optional[asyncio.Task] = None
     
     async def start_protocol(self, protocol_id: str, configuration: Dict[str, Any]) -> bool:
         """Start BACnet protocol"""
-        if not BACNET_AVAILABLE:
+        bp = _load_bacpypes()
+        if bp is None:
             logger.error("bacpypes library not available")
             return False
         
@@ -42,6 +181,8 @@ class BACnetService(BaseProtocolService):
             max_apdu_length = configuration.get("maxApduLength", 1476)
             segmentation_supported = configuration.get("segmentationSupported", "segmentedBoth")
             vendor_id = configuration.get("vendorId", 999)
+            max_in_flight_per_device = max(1, int(configuration.get("maxInFlightPerDevice", 1)))
+            self._set_log_level(protocol_id, configuration)
             
             await self._log_protocol_event(
                 protocol_id, "info",
@@ -50,7 +191,7 @@ class BACnetService(BaseProtocolService):
             )
             
             # Create device object
-            device_obj = LocalDeviceObject(
+            device_obj = bp.LocalDeviceObject(
                 objectName=device_name,
                 objectIdentifier=('device', device_id),
                 maxApduLengthAccepted=max_apdu_length,
@@ -65,18 +206,14 @@ class BACnetService(BaseProtocolService):
             )
             
             # Set up services supported
-            services_supported = ServicesSupported()
-            services_supported['whoIs'] = 1
-            services_supported['iAm'] = 1
-            services_supported['readProperty'] = 1
-            services_supported['writeProperty'] = 1
-            device_obj.protocolServicesSupported = services_supported
+            device_obj.protocolServicesSupported = bp.SERVICES
             
             # Create application
             try:
-                app = BIPSimpleApplication(device_obj, local_address)
+                app = bp.BIPSimpleApplication(device_obj, local_address)
                 self.applications[protocol_id] = app
                 self.running_apps[protocol_id] = True
+                await asyncio.to_thread(_acquire_core, protocol_id)
                 
                 # Initialize discovered devices storage
                 self.discovered_devices[protocol_id] = {}
@@ -92,6 +229,7 @@ class BACnetService(BaseProtocolService):
                 "local_address": local_address,
                 "max_apdu_length": max_apdu_length,
                 "vendor_id": vendor_id,
+                "max_in_flight_per_device": max_in_flight_per_device,
                 "status": "operational",
                 "last_activity": datetime.utcnow(),
                 "discovered_devices": 0,
@@ -101,6 +239,8 @@ class BACnetService(BaseProtocolService):
             }
             
             await self.start_monitoring()
+            if self._err_flush_task is None or self._err_flush_task.done():
+                self._err_flush_task = asyncio.create_task(self._error_flush_loop())
             await self._log_protocol_event(
                 protocol_id, "info",
                 f"BACnet device {device_id} started successfully"
@@ -128,10 +268,14 @@ class BACnetService(BaseProtocolService):
                     logger.warning(f"Error closing BACnet application: {e}")
                 
                 del self.applications[protocol_id]
+                await asyncio.to_thread(_release_core, protocol_id)
             
             if protocol_id in self.discovered_devices:
                 del self.discovered_devices[protocol_id]
             
+            for key in [key for key in self._per_addr_sem if key[0] == protocol_id]:
+                del self._per_addr_sem[key]
+            
             if protocol_id in self.running_apps:
                 del self.running_apps[protocol_id]
             
@@ -140,11 +284,13 @@ class BACnetService(BaseProtocolService):
             
             if not self.active_connections:
                 await self.stop_monitoring()
+                await self._stop_error_flush()
             
             await self._log_protocol_event(
                 protocol_id, "info",
                 "BACnet device stopped"
             )
+            self.log_levels.pop(protocol_id, None)
             
             return True
             
@@ -157,7 +303,8 @@ class BACnetService(BaseProtocolService):
     
     async def test_connection(self, address: str, configuration: Dict[str, Any]) -> bool:
         """Test BACnet connection"""
-        if not BACNET_AVAILABLE:
+        bp = _load_bacpypes()
+        if bp is None:
             return False
         
         try:
@@ -165,7 +312,7 @@ class BACnetService(BaseProtocolService):
             device_id = configuration.get("deviceId", 99999)
             local_address = configuration.get("localAddress", address)
             
-            device_obj = LocalDeviceObject(
+            device_obj = bp.LocalDeviceObject(
                 objectName="TestDevice",
                 objectIdentifier=('device', device_id),
                 maxApduLengthAccepted=1476,
@@ -174,7 +321,7 @@ class BACnetService(BaseProtocolService):
             )
             
             try:
-                test_app = BIPSimpleApplication(device_obj, local_address)
+                test_app = bp.BIPSimpleApplication(device_obj, local_address)
                 test_app.close()
                 return True
             except Exception:
@@ -185,64 +332,62 @@ class BACnetService(BaseProtocolService):
     
     async def read_data_point(self, connection_id: str, data_point_config: Dict[str, Any]) -> Any:
         """Read BACnet object property"""
-        if not BACNET_AVAILABLE:
-            raise Exception("BACnet library not available")
+        bp = _load_bacpypes()
+        if bp is None:
+            raise BACnetNotAvailable("BACnet library not available")
+        
+        if connection_id not in self.applications:
+            raise BACnetError("BACnet application not active")
+        
+        app = self.applications[connection_id]
+        connection = self.active_connections[connection_id]
+        
+        # Parse data point configuration
+        device_address = data_point_config.get("deviceAddress", "192.168.1.100")
+        object_type = data_point_config.get("objectType", "analogInput")
+        object_instance = data_point_config.get("objectInstance", 0)
+        property_id = data_point_config.get("propertyId", "presentValue")
+        device_id = data_point_config.get("deviceId", 1234)
         
         try:
-            if connection_id not in self.applications:
-                raise Exception("BACnet application not active")
-            
-            app = self.applications[connection_id]
-            connection = self.active_connections[connection_id]
-            
-            # Parse data point configuration
-            device_address = data_point_config.get("deviceAddress", "192.168.1.100")
-            object_type = data_point_config.get("objectType", "analogInput")
-            object_instance = data_point_config.get("objectInstance", 0)
-            property_id = data_point_config.get("propertyId", "presentValue")
-            device_id = data_point_config.get("deviceId", 1234)
-            
             # Create read request
-            request = ReadPropertyRequest(
+            request = bp.ReadPropertyRequest(
                 objectIdentifier=(object_type, object_instance),
                 propertyIdentifier=property_id
             )
-            request.pduDestination = Address(device_address)
+            request.pduDestination = bp.Address(device_address)
             
-            try:
-                # This is a simplified version - real implementation would need
-                # proper async handling of BACnet requests
+            # This is a simplified version - real implementation would need
+            # proper async handling of BACnet requests
+            async with self._device_semaphore(connection_id, device_address):
                 response = await asyncio.to_thread(self._sync_read_property, app, request)
-                
-                # Update statistics
-                connection["read_requests"] += 1
-                connection["last_activity"] = datetime.utcnow()
-                
-                return {
-                    "value": response,
-                    "object_type": object_type,
-                    "object_instance": object_instance,
-                    "property_id": property_id,
-                    "device_address": device_address,
-                    "device_id": device_id,
-                    "status": "Success",
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                
-            except Exception as e:
-                raise Exception(f"BACnet read failed: {str(e)}")
-            
         except Exception as e:
-            raise Exception(f"BACnet read error: {str(e)}")
+            raise BACnetReadError(connection_id, data_point_config) from e
+        
+        # Update statistics
+        connection["read_requests"] += 1
+        connection["last_activity"] = datetime.utcnow()
+        
+        return {
+            "value": response,
+            "object_type": object_type,
+            "object_instance": object_instance,
+            "property_id": property_id,
+            "device_address": device_address,
+            "device_id": device_id,
+            "status": "Success",
+            "timestamp": datetime.utcnow().isoformat()
+        }
     
     async def write_data_point(self, connection_id: str, data_point_config: Dict[str, Any], value: Any) -> bool:
         """Write BACnet object property"""
-        if not BACNET_AVAILABLE:
-            raise Exception("BACnet library not available")
+        bp = _load_bacpypes()
+        if bp is None:
+            raise BACnetNotAvailable("BACnet library not available")
         
         try:
             if connection_id not in self.applications:
-                raise Exception("BACnet application not active")
+                raise BACnetError("BACnet application not active")
             
             app = self.applications[connection_id]
             connection = self.active_connections[connection_id]
@@ -255,21 +400,21 @@ class BACnetService(BaseProtocolService):
             priority = data_point_config.get("priority", None)
             
             # Create write request
-            request = WritePropertyRequest(
+            request = bp.WritePropertyRequest(
                 objectIdentifier=(object_type, object_instance),
                 propertyIdentifier=property_id
             )
-            request.pduDestination = Address(device_address)
+            request.pduDestination = bp.Address(device_address)
             
             # Set value based on type
             if isinstance(value, bool):
-                request.propertyValue = Boolean(value)
+                request.propertyValue = bp.Boolean(value)
             elif isinstance(value, int):
-                request.propertyValue = Unsigned(value)
+                request.propertyValue = bp.Unsigned(value)
             elif isinstance(value, float):
-                request.propertyValue = Real(value)
+                request.propertyValue = bp.Real(value)
             elif isinstance(value, str):
-                request.propertyValue = CharacterString(value)
+                request.propertyValue = bp.CharacterString(value)
             else:
                 request.propertyValue = str(value)
             
@@ -278,59 +423,156 @@ class BACnetService(BaseProtocolService):
             
             try:
                 # Perform write operation
-                await asyncio.to_thread(self._sync_write_property, app, request)
+                async with self._device_semaphore(connection_id, device_address):
+                    await asyncio.to_thread(self._sync_write_property, app, request)
                 
                 # Update statistics
                 connection["write_requests"] += 1
                 connection["last_activity"] = datetime.utcnow()
                 
-                await self._log_protocol_event(
-                    connection_id, "info",
-                    f"BACnet write: {object_type}:{object_instance}.{property_id} = {value}",
-                    {
-                        "object_type": object_type,
-                        "object_instance": object_instance,
-                        "property_id": property_id,
-                        "value": value,
-                        "priority": priority
-                    }
-                )
+                # Only build the message and metadata when the event will be persisted
+                if self._log_level_enabled(connection_id, "info"):
+                    await self._log_protocol_event(
+                        connection_id, "info",
+                        f"BACnet write: {object_type}:{object_instance}.{property_id} = {value}",
+                        {
+                            "object_type": object_type,
+                            "object_instance": object_instance,
+                            "property_id": property_id,
+                            "value": value,
+                            "priority": priority
+                        }
+                    )
                 
                 return True
                 
             except Exception as e:
-                raise Exception(f"BACnet write failed: {str(e)}")
+                raise BACnetWriteError(connection_id, data_point_config) from e
             
         except Exception as e:
+            self._record_error(connection_id, "BACnet write error", e)
+            return False
+    
+    def _record_error(self, connection_id: str, error_kind: str, error: Exception):
+        """Count an error for the next aggregated flush instead of logging it immediately"""
+        key = (connection_id, error_kind)
+        count, first_seen, _ = self._err_agg.get(key, (0, time.time(), error))
+        self._err_agg[key] = (count + 1, first_seen, error)
+    
+    async def _flush_errors(self):
+        """Emit one event per aggregated error key"""
+        if not self._err_agg:
+            return
+        
+        pending, self._err_agg = self._err_agg, {}
+        for (connection_id, error_kind), (count, first_seen, error) in pending.items():
+            message = f"{error_kind}: {error}"
             await self._log_protocol_event(
                 connection_id, "error",
-                f"BACnet write error: {str(e)}"
+                f"{count} x {message}" if count > 1 else message,
+                {
+                    "error_kind": error_kind,
+                    "count": count,
+                    "first_seen": datetime.utcfromtimestamp(first_seen).isoformat()
+                }
             )
-            return False
+    
+    async def _error_flush_loop(self):
+        """Periodically flush aggregated errors"""
+        while True:
+            try:
+                await asyncio.sleep(_ERROR_FLUSH_INTERVAL)
+                await self._flush_errors()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error flushing BACnet error events: {e}")
+    
+    async def _stop_error_flush(self):
+        """Stop the flush task, emitting whatever is still pending"""
+        if self._err_flush_task and not self._err_flush_task.done():
+            self._err_flush_task.cancel()
+            try:
+                await self._err_flush_task
+            except asyncio.CancelledError:
+                pass
+        self._err_flush_task = None
+        await self._flush_errors()
+    
+    def _device_semaphore(self, connection_id: str, device_address: str) -> asyncio.Semaphore:
+        """Get the semaphore bounding in-flight requests to one device address"""
+        key = (connection_id, device_address)
+        semaphore = self._per_addr_sem.get(key)
+        if semaphore is None:
+            connection = self.active_connections.get(connection_id, {})
+            semaphore = asyncio.Semaphore(connection.get("max_in_flight_per_device", 1))
+            self._per_addr_sem[key] = semaphore
+        return semaphore
     
     def _sync_read_property(self, app, request):
         """Synchronous BACnet read property helper"""
         # This is a simplified implementation
         # Real implementation would need proper BACnet request handling
-        try:
-            response = app.request(request)
-            if response:
-                return response.propertyValue
-            else:
-                raise Exception("No response received")
-        except Exception as e:
-            raise Exception(f"BACnet communication error: {str(e)}")
+        response = app.request(request)
+        if not response:
+            raise BACnetError("No response received")
+        return response.propertyValue
     
     def _sync_write_property(self, app, request):
         """Synchronous BACnet write property helper"""
         # This is a simplified implementation
         # Real implementation would need proper BACnet request handling
-        try:
-            response = app.request(request)
-            if not response:
-                raise Exception("Write confirmation not received")
-        except Exception as e:
-            raise Exception(f"BACnet communication error: {str(e)}")
+        response = app.request(request)
+        if not response:
+            raise BACnetError("Write confirmation not received")
+    
+    def _sync_read_property_multiple(self, app, request):
+        """Synchronous BACnet read property multiple helper"""
+        # This is a simplified implementation
+        # Real implementation would need proper BACnet request handling
+        response = app.request(request)
+        if not response:
+            raise BACnetError("No response received")
+        return response.listOfReadAccessResults
+    
+    async def _rpm(self, connection_id: str, app, device_address: str, object_ids: Sequence[Tuple[str, int]],
+                   property_ids: Sequence[str]) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        """Read several properties of several objects with a single ReadPropertyMultiple request"""
+        bp = _bacpypes
+        request = bp.ReadPropertyMultipleRequest(
+            listOfReadAccessSpecs=[
+                bp.ReadAccessSpecification(
+                    objectIdentifier=object_id,
+                    listOfPropertyReferences=[
+                        bp.PropertyReference(propertyIdentifier=property_id) for property_id in property_ids
+                    ]
+                )
+                for object_id in object_ids
+            ]
+        )
+        request.pduDestination = bp.Address(device_address)
+        
+        async with self._device_semaphore(connection_id, device_address):
+            access_results = await asyncio.to_thread(self._sync_read_property_multiple, app, request)
+        
+        values: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        for access_result in access_results:
+            object_id = tuple(access_result.objectIdentifier)
+            properties = values.setdefault(object_id, {})
+            for element in access_result.listOfResults:
+                read_result = element.readResult
+                if read_result.propertyAccessError is not None:
+                    continue
+                key = (object_id[0], element.propertyIdentifier)
+                if key in self._dtype_cache:
+                    datatype = self._dtype_cache[key]
+                else:
+                    datatype = self._dtype_cache[key] = bp.get_datatype(*key)
+                if datatype is None:
+                    continue
+                properties[element.propertyIdentifier] = read_result.propertyValue.cast_out(datatype)
+        
+        return values
     
     async def discover_devices(self, connection_id: str, network_range: str = None) -> List[Dict]:
         """Discover BACnet devices on network"""
@@ -356,6 +598,9 @@ class BACnetService(BaseProtocolService):
             if connection_id not in self.applications:
                 raise Exception("BACnet application not active")
             
+            app = self.applications[connection_id]
+            max_apdu_length = self.active_connections[connection_id].get("max_apdu_length", 1476)
+            
             # Read object-list property from device object
             config = {
                 "deviceAddress": device_address,
@@ -366,14 +611,75 @@ class BACnetService(BaseProtocolService):
             
             result = await self.read_data_point(connection_id, config)
             
-            # Parse object list
-            objects = []
-            if result and "value" in result:
-                # Process object list (simplified)
-                objects.append({
+            # Array values carry their length at index 0, keep only object identifiers
+            object_list = result["value"].cast_out(_bacpypes.ObjectIdentifierArray)
+            object_ids = [tuple(object_id) for object_id in object_list.value[1:]]
+            
+            if not object_ids:
+                return [{
                     "type": "device",
                     "instance": device_id,
                     "name": f"Device {device_id}"
+                }]
+            
+            # Fetch the descriptive properties of every object with batched RPM requests
+            chunk_size = max(1, min(max_apdu_length // 8, _RPM_MAX_OBJECTS))
+            chunks = [object_ids[i:i + chunk_size] for i in range(0, len(object_ids), chunk_size)]
+            semaphore = asyncio.Semaphore(_RPM_CONCURRENCY)
+            
+            async def read_chunk(chunk):
+                async with semaphore:
+                    try:
+                        return await self._rpm(connection_id, app, device_address, chunk, _OBJECT_LIST_PROPERTIES)
+                    except Exception as e:
+                        # Devices without ReadPropertyMultiple support are read property by property below
+                        logger.debug(f"BACnet RPM failed for {device_address}, falling back to single reads: {e}")
+                        return {}
+            
+            properties_by_object: Dict[Tuple[str, int], Dict[str, Any]] = {}
+            for chunk_result in await asyncio.gather(*(read_chunk(chunk) for chunk in chunks)):
+                properties_by_object.update(chunk_result)
+            
+            async def read_one(object_id, property_id):
+                async with semaphore:
+                    try:
+                        response = await self.read_data_point(connection_id, {
+                            "deviceAddress": device_address,
+                            "objectType": object_id[0],
+                            "objectInstance": object_id[1],
+                            "propertyId": property_id
+                        })
+                    except BACnetError:
+                        return None
+                key = (object_id[0], property_id)
+                if key not in self._dtype_cache:
+                    self._dtype_cache[key] = _bacpypes.get_datatype(*key)
+                datatype = self._dtype_cache[key]
+                return response["value"].cast_out(datatype) if datatype is not None else None
+            
+            # Objects the RPM requests did not answer get their properties read concurrently
+            remaining = [
+                (object_id, property_id)
+                for object_id in object_ids if object_id not in properties_by_object
+                for property_id in _OBJECT_LIST_PROPERTIES
+            ]
+            if remaining:
+                values = await asyncio.gather(*(read_one(object_id, property_id) for object_id, property_id in remaining))
+                for (object_id, property_id), value in zip(remaining, values):
+                    properties = properties_by_object.setdefault(object_id, {})
+                    if value is not None:
+                        properties[property_id] = value
+            
+            objects = []
+            for object_id in object_ids:
+                object_type, instance = object_id
+                properties = properties_by_object.get(object_id, {})
+                objects.append({
+                    "type": properties.get("objectType") or object_type,
+                    "instance": instance,
+                    "name": properties.get("objectName") or f"{object_type} {instance}",
+                    "units": properties.get("units"),
+                    "description": properties.get("description")
                 })
             
             return objects
@@ -1,27 +1,367 @@
 import asyncio
+import hashlib
+import itertools
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import os
+import pickle
+import socket
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import AsyncIterator, Dict, Any, Iterator, List, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone
 
 try:
-    import canopen
     import can
+    try:
+        # The asyncio fork awaits SDO transfers directly instead of going through the executor
+        import canopen_asyncio as canopen
+        CANOPEN_ASYNC_SDO = True
+    except ImportError:
+        import canopen
+        CANOPEN_ASYNC_SDO = False
     CANOPEN_AVAILABLE = True
 except ImportError:
     CANOPEN_AVAILABLE = False
+    CANOPEN_ASYNC_SDO = False
 
-from ..base_protocol import BaseProtocolService
+if CANOPEN_AVAILABLE:
+    _OD_RECORD = canopen.objectdictionary.Record
+    _OD_ARRAY = canopen.objectdictionary.Array
+    _OD_VARIABLE = canopen.objectdictionary.Variable
+    # OD entries with subindices; plain variables carry data and access type themselves
+    _OD_COMPOSITE = (_OD_RECORD, _OD_ARRAY)
+    _OD_OBJECT_TYPES = {_OD_RECORD: "RECORD", _OD_ARRAY: "ARRAY", _OD_VARIABLE: "VAR"}
+else:
+    _OD_COMPOSITE = ()
+    _OD_OBJECT_TYPES = {}
+
+from ..base_protocol import BaseProtocolService, owner_only
 
 logger = logging.getLogger(__name__)
 
+# OD indices form a small bounded set, so their hex strings are memoized
+_HEX: Dict[int, str] = {}
+
+
+def _hex(value: int) -> str:
+    """Memoized hex() for object dictionary indices"""
+    text = _HEX.get(value)
+    if text is None:
+        text = _HEX[value] = hex(value)
+    return text
+
+
+class SDOError(Exception):
+    """Base class for failed SDO transfers - the message is only built when rendered"""
+    
+    __slots__ = ("index", "subindex")
+    operation = "transfer"
+    
+    def __init__(self, index: int, subindex: int):
+        super().__init__(index, subindex)
+        self.index = index
+        self.subindex = subindex
+    
+    def __str__(self):
+        cause = f": {self.__cause__}" if self.__cause__ is not None else ""
+        return f"SDO {self.operation} failed for {_hex(self.index)}.{self.subindex}{cause}"
+
+
+class SDOReadError(SDOError):
+    """Raised when an SDO upload fails"""
+    
+    __slots__ = ()
+    operation = "read"
+
+
+class SDOWriteError(SDOError):
+    """Raised when an SDO download fails"""
+    
+    __slots__ = ()
+    operation = "write"
+
+
+class SDOResult:
+    """Result of one SDO read.
+    
+    The timestamp is captured as an integer and only formatted when read;
+    keys()/__getitem__ keep the dict shape the other services return.
+    """
+    
+    __slots__ = ("value", "node_id", "index", "subindex", "data_type", "status", "error", "_ts_ns")
+    _KEYS = ("value", "node_id", "index", "subindex", "data_type", "status", "timestamp")
+    
+    def __init__(self, value: Any, node_id: int, index: int, subindex: int, data_type: str,
+                 status: str = "Success", error: Optional[str] = None):
+        self.value = value
+        self.node_id = node_id
+        self.index = index
+        self.subindex = subindex
+        self.data_type = data_type
+        self.status = status
+        self.error = error
+        self._ts_ns = time.time_ns()
+    
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self._ts_ns / 1e9, tz=timezone.utc).isoformat()
+    
+    def keys(self) -> List[str]:
+        return list(self._KEYS) + (["error"] if self.error is not None else [])
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == "index":
+            return _hex(self.index)
+        if key in self._KEYS or (key == "error" and self.error is not None):
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self.keys()}
+
+
+# Errors raised by canopen for aborted or timed out SDO transfers
+_SDO_ERRORS = (canopen.SdoAbortedError, canopen.SdoCommunicationError) if CANOPEN_AVAILABLE else ()
+
+# COB-ID range of TPDO1-4 / RPDO1-4 in the predefined connection set
+_PDO_COB_ID_MIN = 0x180
+_PDO_COB_ID_MAX = 0x57F
+# Received PDOs waiting for the consumer task; frames beyond this are dropped
+_PDO_QUEUE_SIZE = 10000
+# Recycled payload buffers per listener, sized for CAN-FD frames
+_PDO_POOL_SIZE = 1024
+_PDO_BUFFER_SIZE = 64
+# Outgoing frames are sent in small groups with a pause so the CAN TX buffer can drain
+_TX_QUEUE_SIZE = 256
+_TX_BATCH_SIZE = 4
+_TX_BATCH_DELAY = 0.001
+
+_ListenerBase = can.Listener if CANOPEN_AVAILABLE else object
+
+
+class PdoListener(_ListenerBase):
+    """Hands PDO frames from the CAN notifier thread to the event loop.
+    
+    The notifier thread only copies the payload into a pooled buffer and
+    schedules a put_nowait, all processing happens in the consumer task so
+    reception never waits on Python-side work. The consumer hands buffers
+    back through release().
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue,
+                 pool_size: int = _PDO_POOL_SIZE):
+        self.loop = loop
+        self.queue = queue
+        self.dropped = 0
+        self.pool_size = pool_size
+        self.buffers = deque(bytearray(_PDO_BUFFER_SIZE) for _ in range(pool_size))
+    
+    def on_message_received(self, msg):
+        if _PDO_COB_ID_MIN <= msg.arbitration_id <= _PDO_COB_ID_MAX:
+            try:
+                buf = self.buffers.pop()
+            except IndexError:
+                # Pool drained by a slow consumer, the extra buffer is recycled later
+                buf = bytearray(_PDO_BUFFER_SIZE)
+            length = len(msg.data)
+            buf[:length] = msg.data
+            self.loop.call_soon_threadsafe(
+                self._enqueue, (msg.arbitration_id, buf, length, msg.timestamp)
+            )
+    
+    __call__ = on_message_received
+    
+    def _enqueue(self, frame):
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self.release(frame[1])
+    
+    def release(self, buf: bytearray):
+        """Return a payload buffer to the pool"""
+        if len(self.buffers) < self.pool_size:
+            self.buffers.append(buf)
+
+
+def _probe_can(bustype: str, channel: str) -> bool:
+    """Open and close a CAN network in a worker process so driver state never leaks into the server"""
+    try:
+        import can
+        import canopen
+        
+        test_bus = can.interface.Bus(channel=channel, bustype=bustype)
+        test_network = canopen.Network()
+        test_network.bus = test_bus
+        
+        # Test connection
+        test_network.connect()
+        test_network.disconnect()
+        test_bus.shutdown()
+        
+        return True
+    except Exception:
+        return False
+
+
+# Parsed EDS files are persisted here so restarts skip the INI parsing - an empty value disables it
+EDS_CACHE_DIR = os.getenv("CANOPEN_EDS_CACHE_DIR", str(Path.home() / ".cache" / "canopen_eds"))
+
+
+def _eds_cache_dir() -> Optional[Path]:
+    """The owner-only EDS cache directory, or None when caching is disabled or the directory is not private"""
+    if not EDS_CACHE_DIR:
+        return None
+    cache_dir = Path(EDS_CACHE_DIR)
+    try:
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if owner_only(cache_dir):
+            return cache_dir
+    except OSError as e:
+        logger.warning(f"EDS cache directory {cache_dir} unavailable: {e}")
+        return None
+    logger.warning(f"Not using EDS cache {cache_dir}: it must be owned by this user and not writable by others")
+    return None
+
+
+def _import_od_cached(eds_file: str, node_id: int):
+    """Parse an EDS file for a node, reusing a pickled ObjectDictionary keyed by file content hash and node id"""
+    with open(eds_file, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    cache_dir = _eds_cache_dir()
+    # $NODEID expressions (COB-IDs and other defaults) are resolved at parse time, so the node id is part of the key
+    cache_path = cache_dir / f"{digest}-{node_id}.pkl" if cache_dir else None
+    
+    if cache_path is not None:
+        try:
+            if owner_only(cache_path):
+                with open(cache_path, "rb") as f:
+                    return pickle.load(f)
+            logger.warning(f"Ignoring EDS cache {cache_path} not owned by this user")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable EDS cache {cache_path}: {e}")
+    
+    od = canopen.import_od(eds_file, node_id)
+    
+    if cache_path is not None:
+        try:
+            fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(od, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Could not persist EDS cache {cache_path}: {e}")
+    
+    return od
+
+
+@dataclass(slots=True)
+class ConnState:
+    """State of one CANopen network connection.
+    
+    Counters are plain attributes for the SDO hot path; the mapping-style
+    helpers keep it usable wherever the base service expects a connection dict.
+    """
+    network: Any
+    bustype: str
+    channel: str
+    bitrate: int
+    node_id: int
+    eds_file: Optional[str] = None
+    status: str = "connected"
+    last_activity_ns: int = field(default_factory=time.monotonic_ns)
+    last_updated: Optional[datetime] = None
+    nodes_discovered: int = 0
+    sdo_requests: int = 0
+    pdo_messages: int = 0
+    base_throughput: int = 1000  # bytes per second estimate
+    extra: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def last_activity(self) -> datetime:
+        """Last activity as a datetime, only materialized when read"""
+        elapsed_ns = time.monotonic_ns() - self.last_activity_ns
+        return datetime.utcnow() - timedelta(microseconds=elapsed_ns / 1000)
+    
+    @last_activity.setter
+    def last_activity(self, value: datetime):
+        elapsed = datetime.utcnow() - value
+        self.last_activity_ns = time.monotonic_ns() - elapsed // timedelta(microseconds=1) * 1000
+    
+    def keys(self) -> List[str]:
+        return list(_CONN_STATE_KEYS) + list(self.extra)
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in _CONN_STATE_KEYS:
+            return getattr(self, key)
+        return self.extra[key]
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def update(self, values: Dict[str, Any]):
+        for key, value in values.items():
+            if key in _CONN_STATE_KEYS:
+                setattr(self, key, value)
+            else:
+                self.extra[key] = value
+
+
+# Keys exposed through the mapping helpers (network and raw timestamps stay internal)
+_CONN_STATE_KEYS = tuple(
+    "last_activity" if f.name == "last_activity_ns" else f.name
+    for f in fields(ConnState) if f.name not in ("network", "extra")
+)
+
+
 class CANopenService(BaseProtocolService):
     """CANopen protocol service - Real implementation using canopen library"""
     
     def __init__(self):
         super().__init__("canopen")
-        self.networks: Dict[str, canopen.Network] = {}
-        self.nodes: Dict[str, Dict[int, canopen.RemoteNode]] = {}
-        self.eds_cache: Dict[str, str] = {}
+        # Connection state (including the network) lives in active_connections as ConnState
+        self.active_connections: Dict[str, ConnState] = {}
+        self.nodes: Dict[Tuple[str, int], canopen.RemoteNode] = {}
+        # Parsed object dictionaries keyed by (EDS file path, node id), shared by all protocols
+        self.eds_cache: Dict[Tuple[str, int], canopen.ObjectDictionary] = {}
+        # EDS keys referenced by each protocol and number of protocols referencing each key
+        self._eds_keys_by_proto: Dict[str, Set[Tuple[str, int]]] = defaultdict(set)
+        self._eds_refcount: Dict[Tuple[str, int], int] = {}
+        # EDS key each node was created from, and serialized OD listings keyed by EDS key
+        # (or by (connection, node) for nodes without one) - callers must not mutate them
+        self._node_eds: Dict[Tuple[str, int], Tuple[str, int]] = {}
+        self._od_snapshot_cache: Dict[Any, List[Dict]] = {}
+        # PDO reception: notifier listener, consumer task and last frame per COB-ID
+        self._pdo_listeners: Dict[str, PdoListener] = {}
+        self._pdo_tasks: Dict[str, asyncio.Task] = {}
+        self.pdo_frames: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        # PDO transmission: bounded send queue and flusher task per connection
+        self._tx_queues: Dict[str, asyncio.Queue] = {}
+        self._tx_tasks: Dict[str, asyncio.Task] = {}
+        # One bus + network per physical channel, shared by protocols: (network, refcount)
+        self._bus_pool: Dict[Tuple[str, str, int], Tuple[Any, int]] = {}
+        # Connection probes run in a separate process, created on first test
+        self._probe_pool: Optional[ProcessPoolExecutor] = None
     
     async def start_protocol(self, protocol_id: str, configuration: Dict[str, Any]) -> bool:
         """Start CANopen protocol"""
@@ -42,60 +382,97 @@ class CANopenService(BaseProtocolService):
                 {"node_id": node_id, "bitrate": bitrate, "channel": channel, "bustype": bustype}
             )
             
-            # Create CAN bus interface
-            try:
-                if bustype == "socketcan":
-                    bus = can.interface.Bus(channel=channel, bustype=bustype, bitrate=bitrate)
-                elif bustype == "virtual":
-                    bus = can.interface.Bus(channel=channel, bustype=bustype)
-                else:
-                    bus = can.interface.Bus(channel=channel, bustype=bustype, bitrate=bitrate)
-                    
-            except Exception as e:
-                logger.error(f"Failed to create CAN bus: {e}")
+            # Get the shared network for this channel, creating bus and network on first use
+            bus_key = (bustype, channel, bitrate)
+            network, refcount = self._bus_pool.get(bus_key, (None, 0))
+            if network is not None and eds_file and node_id and node_id in network.nodes:
+                # Nodes are keyed by id in the shared network, one protocol would replace the other's
+                await self._log_protocol_event(
+                    protocol_id, "error",
+                    f"CANopen node {node_id} is already used by another protocol on {channel}"
+                )
                 return False
+            if network is None:
+                try:
+                    if bustype == "socketcan":
+                        bus = can.interface.Bus(channel=channel, bustype=bustype, bitrate=bitrate)
+                        rx_buffer_size = configuration.get("rxBufferSize")
+                        if rx_buffer_size:
+                            # Larger kernel receive buffer so bursts survive slow draining
+                            try:
+                                bus.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, int(rx_buffer_size))
+                            except Exception as e:
+                                logger.warning(f"Could not set CAN receive buffer size: {e}")
+                    elif bustype == "virtual":
+                        bus = can.interface.Bus(channel=channel, bustype=bustype)
+                    else:
+                        bus = can.interface.Bus(channel=channel, bustype=bustype, bitrate=bitrate)
+                        
+                except Exception as e:
+                    logger.error(f"Failed to create CAN bus: {e}")
+                    return False
+                
+                # Create CANopen network
+                network = canopen.Network()
+                network.bus = bus
+                
+                # Connect to network
+                try:
+                    network.connect()
+                except Exception as e:
+                    logger.error(f"Failed to connect to CANopen network: {e}")
+                    bus.shutdown()
+                    return False
             
-            # Create CANopen network
-            network = canopen.Network()
-            network.bus = bus
+            # Taken before the awaits below so concurrent starts share this network; released on failure
+            self._bus_pool[bus_key] = (network, refcount + 1)
+            pdo_listener = None
             
-            # Connect to network
             try:
-                network.connect()
-            except Exception as e:
-                logger.error(f"Failed to connect to CANopen network: {e}")
-                bus.shutdown()
-                return False
-            
-            # Store network
-            self.networks[protocol_id] = network
-            self.nodes[protocol_id] = {}
-            
-            # Add master node if EDS file provided
-            if eds_file and node_id:
-                try:
-                    master_node = network.add_node(node_id, eds_file)
-                    self.nodes[protocol_id][node_id] = master_node
-                    self.eds_cache[f"{protocol_id}_{node_id}"] = eds_file
-                except Exception as e:
-                    logger.warning(f"Could not add master node: {e}")
-            
-            # Store connection info
-            self.active_connections[protocol_id] = {
-                "bustype": bustype,
-                "channel": channel,
-                "bitrate": bitrate,
-                "node_id": node_id,
-                "eds_file": eds_file,
-                "status": "connected",
-                "last_activity": datetime.utcnow(),
-                "nodes_discovered": len(self.nodes[protocol_id]),
-                "sdo_requests": 0,
-                "pdo_messages": 0,
-                "base_throughput": 1000  # bytes per second estimate
-            }
-            
-            await self.start_monitoring()
+                # Attach the PDO listener to the network notifier
+                pdo_queue = asyncio.Queue(maxsize=_PDO_QUEUE_SIZE)
+                pdo_listener = PdoListener(asyncio.get_running_loop(), pdo_queue)
+                network.notifier.add_listener(pdo_listener)
+                
+                # Store connection info
+                connection = ConnState(
+                    network=network,
+                    bustype=bustype,
+                    channel=channel,
+                    bitrate=bitrate,
+                    node_id=node_id,
+                    eds_file=eds_file
+                )
+                
+                # Add master node if EDS file provided
+                if eds_file and node_id:
+                    try:
+                        od = await self._load_object_dictionary(protocol_id, eds_file, node_id)
+                        if node_id in network.nodes:
+                            raise Exception(f"node {node_id} was added by another protocol meanwhile")
+                        self.nodes[(protocol_id, node_id)] = network.add_node(node_id, od)
+                        self._node_eds[(protocol_id, node_id)] = (eds_file, node_id)
+                        connection.nodes_discovered += 1
+                    except Exception as e:
+                        logger.warning(f"Could not add master node: {e}")
+                
+                self.active_connections[protocol_id] = connection
+                self._pdo_listeners[protocol_id] = pdo_listener
+                self.pdo_frames[protocol_id] = {}
+                self._pdo_tasks[protocol_id] = asyncio.create_task(self._pdo_consumer(protocol_id, pdo_listener))
+                self._tx_queues[protocol_id] = asyncio.Queue(maxsize=_TX_QUEUE_SIZE)
+                self._tx_tasks[protocol_id] = asyncio.create_task(self._tx_flusher(protocol_id))
+                
+                await self.start_monitoring()
+            except Exception:
+                if protocol_id in self.active_connections:
+                    # Registered far enough for the regular teardown, which also releases the bus
+                    await self.stop_protocol(protocol_id)
+                else:
+                    if pdo_listener is not None and network.notifier is not None:
+                        network.notifier.remove_listener(pdo_listener)
+                    self._release_bus(bus_key, network)
+                raise
             await self._log_protocol_event(
                 protocol_id, "info",
                 f"CANopen network connected on {channel}"
@@ -113,30 +490,63 @@ class CANopenService(BaseProtocolService):
     async def stop_protocol(self, protocol_id: str) -> bool:
         """Stop CANopen protocol"""
         try:
-            if protocol_id in self.networks:
-                network = self.networks[protocol_id]
-                try:
-                    network.disconnect()
-                    if hasattr(network, 'bus') and network.bus:
-                        network.bus.shutdown()
-                except Exception as e:
-                    logger.warning(f"Error disconnecting CANopen network: {e}")
+            connection = self.active_connections.pop(protocol_id, None)
+            pdo_listener = self._pdo_listeners.pop(protocol_id, None)
+            if connection is not None:
+                network = connection.network
+                if pdo_listener is not None and network.notifier is not None:
+                    network.notifier.remove_listener(pdo_listener)
                 
-                del self.networks[protocol_id]
-            
-            if protocol_id in self.nodes:
-                del self.nodes[protocol_id]
-            
-            # Clean up EDS cache for this protocol
-            cache_keys_to_remove = [key for key in self.eds_cache.keys() if key.startswith(f"{protocol_id}_")]
-            for key in cache_keys_to_remove:
-                del self.eds_cache[key]
+                # Free this protocol's node ids on the (possibly shared) network
+                for key in [key for key in self.nodes if key[0] == protocol_id]:
+                    if key[1] in network.nodes:
+                        del network[key[1]]
+                
+                self._release_bus((connection.bustype, connection.channel, connection.bitrate), network)
             
-            if protocol_id in self.active_connections:
-                del self.active_connections[protocol_id]
+            pdo_task = self._pdo_tasks.pop(protocol_id, None)
+            if pdo_task and not pdo_task.done():
+                pdo_task.cancel()
+                try:
+                    await pdo_task
+                except asyncio.CancelledError:
+                    pass
+            self.pdo_frames.pop(protocol_id, None)
+            
+            tx_task = self._tx_tasks.pop(protocol_id, None)
+            if tx_task and not tx_task.done():
+                tx_task.cancel()
+                try:
+                    await tx_task
+                except asyncio.CancelledError:
+                    pass
+            tx_queue = self._tx_queues.pop(protocol_id, None)
+            while tx_queue is not None and not tx_queue.empty():
+                _, _, future = tx_queue.get_nowait()
+                if not future.done():
+                    future.set_exception(Exception("CANopen network disconnected"))
+            
+            for key in [key for key in self.nodes if key[0] == protocol_id]:
+                del self.nodes[key]
+                self._node_eds.pop(key, None)
+                self._od_snapshot_cache.pop(key, None)
+            
+            # Release this protocol's EDS references, dropping dictionaries no protocol uses anymore
+            for eds_key in self._eds_keys_by_proto.pop(protocol_id, ()):
+                remaining = self._eds_refcount.get(eds_key, 1) - 1
+                if remaining > 0:
+                    self._eds_refcount[eds_key] = remaining
+                else:
+                    self._eds_refcount.pop(eds_key, None)
+                    self.eds_cache.pop(eds_key, None)
+                    self._od_snapshot_cache.pop(eds_key, None)
             
             if not self.active_connections:
                 await self.stop_monitoring()
+                # The probe worker process is not needed while no protocol runs
+                if self._probe_pool is not None:
+                    self._probe_pool.shutdown(wait=False, cancel_futures=True)
+                    self._probe_pool = None
             
             await self._log_protocol_event(
                 protocol_id, "info",
@@ -152,6 +562,20 @@ class CANopenService(BaseProtocolService):
             )
             return False
     
+    def _release_bus(self, bus_key: Tuple[str, str, int], network):
+        """Drop one reference to a shared network, shutting the bus down when no protocol uses it anymore"""
+        _, refcount = self._bus_pool.get(bus_key, (network, 1))
+        if refcount > 1:
+            self._bus_pool[bus_key] = (network, refcount - 1)
+            return
+        self._bus_pool.pop(bus_key, None)
+        try:
+            network.disconnect()
+            if hasattr(network, 'bus') and network.bus:
+                network.bus.shutdown()
+        except Exception as e:
+            logger.warning(f"Error disconnecting CANopen network: {e}")
+    
     async def test_connection(self, address: str, configuration: Dict[str, Any]) -> bool:
         """Test CANopen connection"""
         if not CANOPEN_AVAILABLE:
@@ -161,21 +585,16 @@ class CANopenService(BaseProtocolService):
             bustype = configuration.get("bustype", "virtual")  # Use virtual for testing
             channel = configuration.get("channel", "test")
             
-            try:
-                # Create test bus
-                test_bus = can.interface.Bus(channel=channel, bustype=bustype)
-                test_network = canopen.Network()
-                test_network.bus = test_bus
-                
-                # Test connection
-                test_network.connect()
-                test_network.disconnect()
-                test_bus.shutdown()
-                
-                return True
-            except Exception:
-                return False
-                
+            if self._probe_pool is None:
+                self._probe_pool = ProcessPoolExecutor(max_workers=1)
+            
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._probe_pool, _probe_can, bustype, channel)
+            
+        except BrokenProcessPool:
+            # A driver crashed the probe process - start a fresh one next time
+            self._probe_pool = None
+            return False
         except Exception:
             return False
     
@@ -184,55 +603,102 @@ class CANopenService(BaseProtocolService):
         if not CANOPEN_AVAILABLE:
             raise Exception("CANopen library not available")
         
-        try:
-            if connection_id not in self.networks:
-                raise Exception("CANopen network not connected")
-            
-            network = self.networks[connection_id]
+        if connection_id not in self.active_connections:
+            raise Exception("CANopen network not connected")
+        
+        return await self._sdo_upload_one(connection_id, data_point_config)
+    
+    async def read_data_points_batch(self, connection_id: str, data_point_configs: List[Dict[str, Any]]) -> List[SDOResult]:
+        """Read several object dictionary entries with concurrent SDO uploads"""
+        if not CANOPEN_AVAILABLE:
+            raise Exception("CANopen library not available")
+        
+        if connection_id not in self.active_connections:
+            raise Exception("CANopen network not connected")
+        
+        results = await asyncio.gather(
+            *(self._sdo_upload_one(connection_id, config) for config in data_point_configs),
+            return_exceptions=True
+        )
+        
+        response = []
+        for config, result in zip(data_point_configs, results):
+            if isinstance(result, Exception):
+                response.append(SDOResult(
+                    None,
+                    config.get("nodeId", 1),
+                    config.get("index", 0x1000),
+                    config.get("subindex", 0),
+                    config.get("dataType", "UNSIGNED32"),
+                    status="Error",
+                    error=str(result)
+                ))
+            else:
+                response.append(result)
+        
+        return response
+    
+    def _get_node(self, connection_id: str, node_id: int):
+        """Get a node of the network, adding it on first use"""
+        key = (connection_id, node_id)
+        node = self.nodes.get(key)
+        if node is None:
             connection = self.active_connections[connection_id]
-            
-            node_id = data_point_config.get("nodeId", 1)
-            index = data_point_config.get("index", 0x1000)  # Device type
-            subindex = data_point_config.get("subindex", 0)
-            data_type = data_point_config.get("dataType", "UNSIGNED32")
-            
-            # Get or create node
-            if node_id not in self.nodes[connection_id]:
+            network = connection.network
+            if node_id in network.nodes:
+                # A second RemoteNode would share the SDO response COB-ID with the one already listening
+                if any(
+                    owner_id != connection_id and owned_node_id == node_id
+                    and owner_id in self.active_connections
+                    and self.active_connections[owner_id].network is network
+                    for owner_id, owned_node_id in self.nodes
+                ):
+                    raise Exception(f"Node {node_id} is already used by another protocol on this network")
+                node = network.nodes[node_id]
+            else:
                 # Try to add node (may need EDS file for complex operations)
                 try:
                     node = network.add_node(node_id)
-                    self.nodes[connection_id][node_id] = node
                 except Exception as e:
                     logger.warning(f"Could not add node {node_id}: {e}")
                     # Create basic remote node
                     node = canopen.RemoteNode(node_id, network.object_dictionary)
-                    self.nodes[connection_id][node_id] = node
+            self.nodes[key] = node
+            connection.nodes_discovered += 1
+        
+        return node
+    
+    async def _sdo_upload_one(self, connection_id: str, data_point_config: Dict[str, Any]) -> SDOResult:
+        """Perform a single SDO read and build its result"""
+        connection = self.active_connections[connection_id]
+        
+        node_id = data_point_config.get("nodeId", 1)
+        index = data_point_config.get("index", 0x1000)  # Device type
+        subindex = data_point_config.get("subindex", 0)
+        data_type = data_point_config.get("dataType", "UNSIGNED32")
+        
+        node = self._get_node(connection_id, node_id)
+        
+        # Perform SDO read
+        try:
+            if data_point_config.get("blockTransfer"):
+                # Multi-byte domain objects are pulled in one block transaction
+                value = await asyncio.to_thread(self._sdo_block_upload, node, index, subindex)
             else:
-                node = self.nodes[connection_id][node_id]
-            
-            # Perform SDO read
-            try:
-                value = await asyncio.to_thread(node.sdo.upload, index, subindex)
-                
-                # Update statistics
-                connection["sdo_requests"] += 1
-                connection["last_activity"] = datetime.utcnow()
-                
-                return {
-                    "value": value,
-                    "node_id": node_id,
-                    "index": hex(index),
-                    "subindex": subindex,
-                    "data_type": data_type,
-                    "status": "Success",
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                
-            except Exception as e:
-                raise Exception(f"SDO read failed: {str(e)}")
-            
-        except Exception as e:
-            raise Exception(f"CANopen read error: {str(e)}")
+                value = await self._sdo_upload(node, index, subindex)
+        except _SDO_ERRORS as e:
+            raise SDOReadError(index, subindex) from e
+        
+        # Update statistics
+        connection.sdo_requests += 1
+        connection.last_activity_ns = time.monotonic_ns()
+        
+        return SDOResult(value, node_id, index, subindex, data_type)
+    
+    def _sdo_block_upload(self, node, index: int, subindex: int) -> bytes:
+        """Synchronous SDO block upload helper"""
+        with node.sdo.open(index, subindex, "rb", block_transfer=True) as stream:
+            return stream.read()
     
     async def write_data_point(self, connection_id: str, data_point_config: Dict[str, Any], value: Any) -> bool:
         """Write CANopen object dictionary entry via SDO"""
@@ -240,52 +706,45 @@ class CANopenService(BaseProtocolService):
             raise Exception("CANopen library not available")
         
         try:
-            if connection_id not in self.networks:
+            if connection_id not in self.active_connections:
                 raise Exception("CANopen network not connected")
             
-            network = self.networks[connection_id]
             connection = self.active_connections[connection_id]
             
+            cob_id = data_point_config.get("cobId")
+            if cob_id is not None:
+                return await self._write_pdo(connection_id, cob_id, data_point_config, value)
+            
             node_id = data_point_config.get("nodeId", 1)
             index = data_point_config.get("index", 0x2000)
             subindex = data_point_config.get("subindex", 0)
             data_type = data_point_config.get("dataType", "UNSIGNED32")
             
-            # Get or create node
-            if node_id not in self.nodes[connection_id]:
-                try:
-                    node = network.add_node(node_id)
-                    self.nodes[connection_id][node_id] = node
-                except Exception:
-                    node = canopen.RemoteNode(node_id, network.object_dictionary)
-                    self.nodes[connection_id][node_id] = node
-            else:
-                node = self.nodes[connection_id][node_id]
+            node = self._get_node(connection_id, node_id)
             
             # Perform SDO write
             try:
-                await asyncio.to_thread(node.sdo.download, index, subindex, value)
-                
-                # Update statistics
-                connection["sdo_requests"] += 1
-                connection["last_activity"] = datetime.utcnow()
-                
-                await self._log_protocol_event(
-                    connection_id, "info",
-                    f"CANopen SDO write: Node {node_id}, Index {hex(index)}.{subindex} = {value}",
-                    {
-                        "node_id": node_id,
-                        "index": hex(index),
-                        "subindex": subindex,
-                        "value": value,
-                        "data_type": data_type
-                    }
-                )
-                
-                return True
-                
-            except Exception as e:
-                raise Exception(f"SDO write failed: {str(e)}")
+                await self._sdo_download(node, index, subindex, value)
+            except _SDO_ERRORS as e:
+                raise SDOWriteError(index, subindex) from e
+            
+            # Update statistics
+            connection.sdo_requests += 1
+            connection.last_activity_ns = time.monotonic_ns()
+            
+            await self._log_protocol_event(
+                connection_id, "info",
+                f"CANopen SDO write: Node {node_id}, Index {_hex(index)}.{subindex} = {value}",
+                {
+                    "node_id": node_id,
+                    "index": _hex(index),
+                    "subindex": subindex,
+                    "value": value,
+                    "data_type": data_type
+                }
+            )
+            
+            return True
             
         except Exception as e:
             await self._log_protocol_event(
@@ -294,25 +753,136 @@ class CANopenService(BaseProtocolService):
             )
             return False
     
+    async def _write_pdo(self, connection_id: str, cob_id: int, data_point_config: Dict[str, Any], value: Any) -> bool:
+        """Transmit a raw PDO frame built from the written value"""
+        if isinstance(value, (bytes, bytearray, list, tuple)):
+            data = bytes(value)
+        else:
+            data = int(value).to_bytes(data_point_config.get("length", 4), "little")
+        
+        await self.send_pdo(connection_id, cob_id, data)
+        
+        if self._log_level_enabled(connection_id, "info"):
+            await self._log_protocol_event(
+                connection_id, "info",
+                f"CANopen PDO write: COB-ID {_hex(cob_id)} = {data.hex()}",
+                {"cob_id": _hex(cob_id), "data": data.hex()}
+            )
+        return True
+    
+    async def send_pdo(self, connection_id: str, cob_id: int, data: bytes):
+        """Queue a frame for transmission and wait until it was handed to the bus"""
+        queue = self._tx_queues.get(connection_id)
+        if queue is None:
+            raise Exception("CANopen network not connected")
+        
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((cob_id, data, future))
+        await future
+    
+    async def _tx_flusher(self, protocol_id: str):
+        """Send queued frames in small groups, pausing between groups"""
+        queue = self._tx_queues[protocol_id]
+        network = self.active_connections[protocol_id].network
+        while True:
+            try:
+                batch = [await queue.get()]
+                while len(batch) < _TX_BATCH_SIZE and not queue.empty():
+                    batch.append(queue.get_nowait())
+                
+                for cob_id, data, future in batch:
+                    try:
+                        network.send_message(cob_id, data)
+                    except Exception as e:
+                        if not future.done():
+                            future.set_exception(e)
+                    else:
+                        if not future.done():
+                            future.set_result(None)
+                
+                await asyncio.sleep(_TX_BATCH_DELAY)
+            except asyncio.CancelledError:
+                break
+    
+    async def _pdo_consumer(self, protocol_id: str, listener: PdoListener):
+        """Drain received PDOs and record the latest frame per COB-ID"""
+        frames = self.pdo_frames[protocol_id]
+        queue = listener.queue
+        while True:
+            try:
+                cob_id, buf, length, timestamp = await queue.get()
+                connection = self.active_connections.get(protocol_id)
+                if connection is None:
+                    listener.release(buf)
+                    break
+                
+                connection.pdo_messages += 1
+                connection.last_activity_ns = time.monotonic_ns()
+                frame = frames.get(cob_id)
+                if frame is None:
+                    frame = frames[cob_id] = {"data": bytearray(), "timestamp": timestamp}
+                # Copy into the per-COB-ID buffer in place so the pooled one can be reused
+                frame["data"][:] = memoryview(buf)[:length]
+                frame["timestamp"] = timestamp
+                listener.release(buf)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error processing PDO for {protocol_id}: {e}")
+    
+    async def _load_object_dictionary(self, protocol_id: str, eds_file: str, node_id: int):
+        """Get the parsed object dictionary of an EDS file for a node id, parsing it only once"""
+        eds_key = (eds_file, node_id)
+        od = self.eds_cache.get(eds_key)
+        if od is None:
+            od = await asyncio.to_thread(_import_od_cached, eds_file, node_id)
+            self.eds_cache[eds_key] = od
+        
+        protocol_keys = self._eds_keys_by_proto[protocol_id]
+        if eds_key not in protocol_keys:
+            protocol_keys.add(eds_key)
+            self._eds_refcount[eds_key] = self._eds_refcount.get(eds_key, 0) + 1
+        # Nodes with the same EDS file and node id share this dictionary, which RemoteNodes only read
+        return od
+    
+    async def _sdo_upload(self, node, index: int, subindex: int) -> Any:
+        """Upload an SDO value, natively async when canopen-asyncio is installed"""
+        if CANOPEN_ASYNC_SDO:
+            return await node.sdo.aupload(index, subindex)
+        return await asyncio.to_thread(node.sdo.upload, index, subindex)
+    
+    async def _sdo_download(self, node, index: int, subindex: int, value: Any):
+        """Download an SDO value, natively async when canopen-asyncio is installed"""
+        if CANOPEN_ASYNC_SDO:
+            await node.sdo.adownload(index, subindex, value)
+        else:
+            await asyncio.to_thread(node.sdo.download, index, subindex, value)
+    
     async def add_node(self, connection_id: str, node_id: int, eds_file: str = None) -> bool:
         """Add a node to the CANopen network"""
         try:
-            if connection_id not in self.networks:
+            if connection_id not in self.active_connections:
                 raise Exception("CANopen network not connected")
             
-            network = self.networks[connection_id]
+            connection = self.active_connections[connection_id]
+            network = connection.network
+            
+            if node_id in network.nodes and (connection_id, node_id) not in self.nodes:
+                raise Exception(f"Node {node_id} is already used by another protocol on this network")
             
             if eds_file:
-                node = network.add_node(node_id, eds_file)
-                self.eds_cache[f"{connection_id}_{node_id}"] = eds_file
+                od = await self._load_object_dictionary(connection_id, eds_file, node_id)
+                node = network.add_node(node_id, od)
+                self._node_eds[(connection_id, node_id)] = (eds_file, node_id)
             else:
                 node = network.add_node(node_id)
-            
-            self.nodes[connection_id][node_id] = node
+                self._node_eds.pop((connection_id, node_id), None)
+            self._od_snapshot_cache.pop((connection_id, node_id), None)
             
             # Update connection stats
-            connection = self.active_connections[connection_id]
-            connection["nodes_discovered"] = len(self.nodes[connection_id])
+            if self.nodes.get((connection_id, node_id)) is None:
+                connection.nodes_discovered += 1
+            self.nodes[(connection_id, node_id)] = node
             
             await self._log_protocol_event(
                 connection_id, "info",
@@ -332,18 +902,17 @@ class CANopenService(BaseProtocolService):
     async def node_guard(self, connection_id: str, node_id: int) -> Dict[str, Any]:
         """Perform node guarding on specific node"""
         try:
-            if connection_id not in self.networks:
+            if connection_id not in self.active_connections:
                 raise Exception("CANopen network not connected")
             
-            if node_id not in self.nodes[connection_id]:
+            node = self.nodes.get((connection_id, node_id))
+            if node is None:
                 raise Exception(f"Node {node_id} not found")
             
-            node = self.nodes[connection_id][node_id]
-            
             # Read node state via heartbeat or node guarding
             try:
                 # Try to read device status
-                device_status = await asyncio.to_thread(node.sdo.upload, 0x1002, 0)  # Manufacturer status register
+                device_status = await self._sdo_upload(node, 0x1002, 0)  # Manufacturer status register
                 
                 return {
                     "node_id": node_id,
@@ -363,55 +932,84 @@ class CANopenService(BaseProtocolService):
         except Exception as e:
             raise Exception(f"CANopen node guard error: {str(e)}")
     
-    async def read_object_dictionary(self, connection_id: str, node_id: int) -> List[Dict]:
+    async def read_object_dictionary(self, connection_id: str, node_id: int,
+                                     limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
         """Read available object dictionary entries from node"""
+        return [entry async for entry in self.iter_object_dictionary(connection_id, node_id, limit, offset)]
+    
+    async def iter_object_dictionary(self, connection_id: str, node_id: int,
+                                     limit: Optional[int] = None, offset: int = 0) -> AsyncIterator[Dict]:
+        """Yield object dictionary entries from node, optionally one page at a time"""
         try:
-            if connection_id not in self.networks:
+            if connection_id not in self.active_connections:
                 raise Exception("CANopen network not connected")
             
-            if node_id not in self.nodes[connection_id]:
+            node = self.nodes.get((connection_id, node_id))
+            if node is None:
                 raise Exception(f"Node {node_id} not found")
             
-            node = self.nodes[connection_id][node_id]
+            stop = None if limit is None else offset + limit
             
-            # Get object dictionary from node
-            od_entries = []
+            # The OD is static per EDS file and node id, so its listing is built only once
+            cache_key = self._node_eds.get((connection_id, node_id)) or (connection_id, node_id)
+            cached = self._od_snapshot_cache.get(cache_key)
+            if cached is not None:
+                for entry in itertools.islice(cached, offset, stop):
+                    yield entry
+                return
             
-            if hasattr(node, 'object_dictionary'):
-                od = node.object_dictionary
-                
-                for index in od:
-                    try:
-                        obj = od[index]
-                        entry = {
-                            "index": hex(index),
-                            "name": getattr(obj, 'name', f'Object_{hex(index)}'),
-                            "object_type": getattr(obj, 'object_type', 'Unknown'),
-                            "data_type": getattr(obj, 'data_type', 'Unknown'),
-                            "access_type": getattr(obj, 'access_type', 'Unknown'),
-                            "subindices": []
-                        }
-                        
-                        # Add subindices if available
-                        if hasattr(obj, '__iter__'):
-                            for subindex in obj:
-                                try:
-                                    subobj = obj[subindex]
-                                    entry["subindices"].append({
-                                        "subindex": subindex,
-                                        "name": getattr(subobj, 'name', f'Sub_{subindex}'),
-                                        "data_type": getattr(subobj, 'data_type', 'Unknown'),
-                                        "access_type": getattr(subobj, 'access_type', 'Unknown')
-                                    })
-                                except:
-                                    continue
-                        
-                        od_entries.append(entry)
-                        
-                    except Exception:
-                        continue
+            if not hasattr(node, 'object_dictionary'):
+                return
+            entries = self._iter_od_entries(node.object_dictionary)
             
-            return od_entries
+            # Only a complete scan can populate the snapshot cache
+            if offset or stop is not None:
+                for entry in itertools.islice(entries, offset, stop):
+                    yield entry
+                return
+            
+            od_entries = []
+            for entry in entries:
+                od_entries.append(entry)
+                yield entry
+            self._od_snapshot_cache[cache_key] = od_entries
             
         except Exception as e:
             raise Exception(f"CANopen OD read error: {str(e)}")
+    
+    @staticmethod
+    def _iter_od_entries(od) -> Iterator[Dict]:
+        """Build listing entries for an object dictionary one index at a time"""
+        for index in od:
+            try:
+                obj = od[index]
+                entry = {
+                    "index": _hex(index),
+                    "name": obj.name,
+                    "object_type": _OD_OBJECT_TYPES.get(type(obj), "Unknown"),
+                    "data_type": 'Unknown',
+                    "access_type": 'Unknown',
+                    "subindices": []
+                }
+                
+                if isinstance(obj, _OD_COMPOSITE):
+                    # Add subindices, which are always plain variables
+                    for subindex in obj:
+                        try:
+                            subobj = obj[subindex]
+                            entry["subindices"].append({
+                                "subindex": subindex,
+                                "name": subobj.name,
+                                "data_type": subobj.data_type,
+                                "access_type": subobj.access_type
+                            })
+                        except Exception:
+                            continue
+                else:
+                    entry["data_type"] = obj.data_type
+                    entry["access_type"] = obj.access_type
+                
+                yield entry
+                
+            except Exception:
+                continue
@@ -1,8 +1,20 @@
+import array
 import asyncio
+import ctypes
+import ctypes.util
+import hashlib
 import logging
+import operator
+import os
+import pickle
 import struct
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+from queue import SimpleQueue
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
 
 try:
     from pycomm3 import LogixDriver, SLCDriver
@@ -11,22 +23,556 @@ try:
 except ImportError:
     ETHERNETIP_AVAILABLE = False
 
-from ..base_protocol import BaseProtocolService
+# pycomm3 driver class per lowercased plcType, unknown types default to LogixDriver.
+# Custom driver classes can be registered here without touching the service.
+_DRIVER_BY_TYPE = {
+    "logix": LogixDriver,
+    "controllogix": LogixDriver,
+    "compactlogix": LogixDriver,
+    "slc": SLCDriver,
+    "micrologix": SLCDriver,
+} if ETHERNETIP_AVAILABLE else {}
+
+try:
+    # Optional native CIP stack, used when a connection selects backend "libplctag"
+    _libplctag_path = ctypes.util.find_library("plctag")
+    _plctag = ctypes.CDLL(_libplctag_path) if _libplctag_path else None
+except OSError:
+    _plctag = None
+LIBPLCTAG_AVAILABLE = _plctag is not None
+
+from ..base_protocol import BaseProtocolService, owner_only
 
 logger = logging.getLogger(__name__)
 
+# Concurrent single-tag reads are coalesced into multi-request packets
+_READ_BATCH_MAX = 32
+_READ_BATCH_WAIT = 0.002
+# Estimated request bytes per packet, kept below the 500 byte CIP connection size
+_CIP_REQUEST_LIMIT = 450
+
+# Slots of the per-connection stats array
+_READS = 0
+_WRITES = 1
+_LAST_ACTIVITY = 2  # time.monotonic_ns()
+
+# Seconds a normalized tag list is served from cache
+_TAG_LIST_TTL = 60
+
+_TAG_FIELDS = ("name", "data_type", "alias", "external_access")
+_tag_attrs = operator.attrgetter("tag_name", "data_type", "alias", "external_access")
+
+# Seconds a stopped connection's sessions stay open for reuse by a new connection to the same PLC
+_WARM_POOL_TTL = 300
+
+# Uploaded tag and UDT definitions are persisted here, keyed by controller identity
+EIP_TAG_CACHE_DIR = Path.home() / ".cache" / "iiot"
+# Default seconds a persisted tag list is trusted; a program download can change tags without changing the identity
+_TAG_CACHE_TTL = 3600
+
+
+def _tag_cache_path(info: Dict[str, Any]) -> Path:
+    """Cache file for a controller, identified by vendor, product, serial and firmware"""
+    identity = "|".join(str(info.get(key)) for key in ("vendor", "product_code", "serial", "revision", "version"))
+    return EIP_TAG_CACHE_DIR / f"eip_{hashlib.sha256(identity.encode()).hexdigest()[:16]}.pkl"
+
+
+def _init_logix_tags(driver, ttl: float = _TAG_CACHE_TTL) -> bool:
+    """Hydrate the driver's tag and data type definitions from disk, uploading them on a miss.
+    
+    Cache files older than ttl seconds are uploaded again. Returns True when the cache was used.
+    """
+    cache_path = _tag_cache_path(driver.info or {})
+    try:
+        # Unpickling runs code, so only files no other user could have written are loaded
+        if not (owner_only(EIP_TAG_CACHE_DIR) and owner_only(cache_path)):
+            logger.warning(f"Ignoring tag cache {cache_path}: it must be owned by this user and not writable by others")
+        elif time.time() - cache_path.stat().st_mtime <= ttl:
+            with cache_path.open("rb") as f:
+                driver._tags, driver._data_types = pickle.load(f)
+            return True
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable tag cache {cache_path}: {e}")
+    
+    driver.get_tag_list(program='*')
+    
+    try:
+        EIP_TAG_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if owner_only(EIP_TAG_CACHE_DIR):
+            tmp_path = cache_path.with_suffix(".tmp")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((driver._tags, driver._data_types), f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(cache_path)
+    except Exception as e:
+        logger.warning(f"Could not persist tag cache {cache_path}: {e}")
+    
+    return False
+
+
+def _chunk_by_cip_size(tags: List[str], limit: int = _CIP_REQUEST_LIMIT) -> List[List[str]]:
+    """Split tag names into groups whose estimated multi-request size fits one packet"""
+    chunks = []
+    chunk = []
+    size = 0
+    for tag in tags:
+        # Service header plus the symbolic path and element count of the tag
+        tag_size = len(tag) + 6
+        if chunk and size + tag_size > limit:
+            chunks.append(chunk)
+            chunk = []
+            size = 0
+        chunk.append(tag)
+        size += tag_size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+# libplctag status codes
+_PLCTAG_STATUS_OK = 0
+_PLCTAG_STATUS_PENDING = 1
+
+# libplctag accessor suffix and element size per CIP data type
+_PLCTAG_TYPES = {
+    "BOOL": ("uint8", 1),
+    "SINT": ("int8", 1),
+    "USINT": ("uint8", 1),
+    "INT": ("int16", 2),
+    "UINT": ("uint16", 2),
+    "DINT": ("int32", 4),
+    "UDINT": ("uint32", 4),
+    "LINT": ("int64", 8),
+    "ULINT": ("uint64", 8),
+    "REAL": ("float32", 4),
+    "LREAL": ("float64", 8),
+}
+
+# libplctag PLC family names for the configured plcType
+_PLCTAG_PLC_NAMES = {
+    "logix": "ControlLogix",
+    "controllogix": "ControlLogix",
+    "compactlogix": "CompactLogix",
+    "slc": "SLC500",
+    "micrologix": "MicroLogix",
+}
+
+if LIBPLCTAG_AVAILABLE:
+    _plctag.plc_tag_create.argtypes = [ctypes.c_char_p, ctypes.c_int]
+    _plctag.plc_tag_create.restype = ctypes.c_int32
+    for _name in ("plc_tag_read", "plc_tag_write"):
+        getattr(_plctag, _name).argtypes = [ctypes.c_int32, ctypes.c_int]
+        getattr(_plctag, _name).restype = ctypes.c_int
+    for _name in ("plc_tag_status", "plc_tag_destroy", "plc_tag_abort"):
+        getattr(_plctag, _name).argtypes = [ctypes.c_int32]
+        getattr(_plctag, _name).restype = ctypes.c_int
+    _plctag.plc_tag_decode_error.argtypes = [ctypes.c_int]
+    _plctag.plc_tag_decode_error.restype = ctypes.c_char_p
+    _PLCTAG_CTYPES = {
+        "int8": ctypes.c_int8, "uint8": ctypes.c_uint8,
+        "int16": ctypes.c_int16, "uint16": ctypes.c_uint16,
+        "int32": ctypes.c_int32, "uint32": ctypes.c_uint32,
+        "int64": ctypes.c_int64, "uint64": ctypes.c_uint64,
+        "float32": ctypes.c_float, "float64": ctypes.c_double,
+    }
+    for _suffix, _ctype in _PLCTAG_CTYPES.items():
+        getattr(_plctag, f"plc_tag_get_{_suffix}").argtypes = [ctypes.c_int32, ctypes.c_int]
+        getattr(_plctag, f"plc_tag_get_{_suffix}").restype = _ctype
+        getattr(_plctag, f"plc_tag_set_{_suffix}").argtypes = [ctypes.c_int32, ctypes.c_int, _ctype]
+        getattr(_plctag, f"plc_tag_set_{_suffix}").restype = ctypes.c_int
+
+# Read/write result in the shape of pycomm3's Tag
+PlcTagResult = namedtuple("PlcTagResult", "tag value type error")
+
+
+class LibplctagDriver:
+    """pycomm3-style driver on top of the libplctag C library.
+    
+    Tag handles are created once per tag name and kept in tag_cache; all
+    requests of one read()/write() call are started before waiting, so
+    libplctag packs them into shared CIP requests on its persistent session.
+    """
+    
+    def __init__(self, host: str, port: int = 44818, path: str = "1,0", plc_type: str = "logix",
+                 tag_types: Optional[Dict[str, str]] = None, timeout: float = 10.0):
+        gateway = host if port == 44818 else f"{host}:{port}"
+        plc = _PLCTAG_PLC_NAMES.get(plc_type.lower(), "ControlLogix")
+        self._attributes = f"protocol=ab_eip&gateway={gateway}&path={path}&plc={plc}"
+        # Data types of tags by name, used to pick the element size and accessor
+        self.tag_types = tag_types if tag_types is not None else {}
+        self.timeout = timeout
+        self.tag_cache: Dict[str, Tuple[int, str]] = {}
+    
+    def open(self) -> bool:
+        """Sessions are opened by libplctag when the first tag is created"""
+        return True
+    
+    def close(self):
+        for handle, _ in self.tag_cache.values():
+            _plctag.plc_tag_destroy(handle)
+        self.tag_cache.clear()
+    
+    def _handle(self, name: str, data_type: Optional[str] = None) -> Tuple[int, str]:
+        """Get the long-lived libplctag handle of a tag, creating it on first use"""
+        cached = self.tag_cache.get(name)
+        if cached is not None:
+            return cached
+        
+        data_type = (data_type or self.tag_types.get(name, "DINT")).upper()
+        if data_type not in _PLCTAG_TYPES:
+            raise ValueError(f"Unsupported data type for libplctag: {data_type}")
+        _, elem_size = _PLCTAG_TYPES[data_type]
+        attributes = f"{self._attributes}&elem_size={elem_size}&elem_count=1&name={name}"
+        handle = _plctag.plc_tag_create(attributes.encode(), int(self.timeout * 1000))
+        if handle < 0:
+            raise Exception(_plctag.plc_tag_decode_error(handle).decode())
+        
+        self.tag_cache[name] = (handle, data_type)
+        return handle, data_type
+    
+    def _wait(self, handles: List[int], statuses: List[int]) -> List[int]:
+        """Poll started operations until they complete, aborting those still pending at the timeout"""
+        deadline = time.monotonic() + self.timeout
+        while _PLCTAG_STATUS_PENDING in statuses:
+            if time.monotonic() > deadline:
+                for i, status in enumerate(statuses):
+                    if status == _PLCTAG_STATUS_PENDING:
+                        _plctag.plc_tag_abort(handles[i])
+                        statuses[i] = -1
+                break
+            time.sleep(0.001)
+            statuses = [
+                _plctag.plc_tag_status(handle) if status == _PLCTAG_STATUS_PENDING else status
+                for handle, status in zip(handles, statuses)
+            ]
+        return statuses
+    
+    def _error(self, status: int) -> Optional[str]:
+        if status == _PLCTAG_STATUS_OK:
+            return None
+        return _plctag.plc_tag_decode_error(status).decode()
+    
+    def read(self, *tags: str):
+        handles = []
+        types = []
+        statuses = []
+        for name in tags:
+            try:
+                handle, data_type = self._handle(name)
+                status = _plctag.plc_tag_read(handle, 0)
+            except Exception:
+                handle, data_type, status = -1, None, -1
+            handles.append(handle)
+            types.append(data_type)
+            statuses.append(status)
+        
+        statuses = self._wait(handles, statuses)
+        
+        results = []
+        for name, handle, data_type, status in zip(tags, handles, types, statuses):
+            error = self._error(status) if data_type else "Tag could not be created"
+            if error:
+                results.append(PlcTagResult(name, None, data_type, error))
+                continue
+            value = getattr(_plctag, f"plc_tag_get_{_PLCTAG_TYPES[data_type][0]}")(handle, 0)
+            if data_type == "BOOL":
+                value = bool(value)
+            results.append(PlcTagResult(name, value, data_type, None))
+        
+        return results[0] if len(tags) == 1 else results
+    
+    def write(self, *writes: Tuple[str, Any, str]):
+        handles = []
+        statuses = []
+        for name, value, data_type in writes:
+            try:
+                handle, data_type = self._handle(name, data_type)
+                getattr(_plctag, f"plc_tag_set_{_PLCTAG_TYPES[data_type][0]}")(handle, 0, value)
+                status = _plctag.plc_tag_write(handle, 0)
+            except Exception:
+                handle, status = -1, -1
+            handles.append(handle)
+            statuses.append(status)
+        
+        statuses = self._wait(handles, statuses)
+        
+        results = [
+            PlcTagResult(name, value, data_type, self._error(status))
+            for (name, value, data_type), status in zip(writes, statuses)
+        ]
+        return results[0] if len(writes) == 1 else results
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None):
+    """Complete a future from the driver thread's callback, unless it was cancelled meanwhile"""
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def _driver_loop(work: SimpleQueue):
+    """Run driver calls one at a time on the thread owning the driver until a None sentinel"""
+    while True:
+        item = work.get()
+        if item is None:
+            break
+        func, args, future, loop = item
+        try:
+            result = func(*args)
+        except Exception as e:
+            loop.call_soon_threadsafe(_resolve, future, None, e)
+        else:
+            loop.call_soon_threadsafe(_resolve, future, result)
+
+
+class DriverWorker:
+    """A driver together with the thread that owns it.
+    
+    Drivers are not thread-safe, so every call goes through the worker's
+    queue and runs on its thread, one at a time.
+    """
+    
+    def __init__(self, driver, name: str):
+        self.driver = driver
+        self._work = SimpleQueue()
+        self._thread = threading.Thread(target=_driver_loop, args=(self._work,), name=name, daemon=True)
+        self._thread.start()
+    
+    async def run(self, func, *args) -> Any:
+        """Run func(*args) on the worker thread"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._work.put((func, args, future, loop))
+        return await future
+    
+    async def call(self, method: str, *args) -> Any:
+        """Call a driver method on the worker thread"""
+        return await self.run(getattr(self.driver, method), *args)
+    
+    def stop(self):
+        self._work.put(None)
+
+
+def _drain(queue: asyncio.Queue, batch: list, limit: int):
+    """Move already queued items into batch without waiting"""
+    while len(batch) < limit:
+        try:
+            batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+
+
 class EthernetIpService(BaseProtocolService):
     """EtherNet/IP protocol service - Real implementation using pycomm3"""
     
+    # Sessions of stopped connections by session-shaping configuration, see _warm_key: (pool, device info, parked at)
+    _warm_pool: Dict[Tuple, Tuple[List[DriverWorker], Dict, float]] = {}
+    
     def __init__(self):
+        if not (ETHERNETIP_AVAILABLE or LIBPLCTAG_AVAILABLE):
+            raise RuntimeError("pycomm3 or libplctag required for EtherNet/IP")
         super().__init__("ethernet-ip")
-        self.drivers: Dict[str, LogixDriver] = {}
+        # Pool of driver sessions per connection, used round-robin
+        self.drivers: Dict[str, List[DriverWorker]] = {}
+        self._rr_idx: Dict[str, int] = {}
+        self._result_has_type: Dict[str, bool] = {}
+        # Read/write counters and last activity per connection, see get_connection_info
+        self._stats: Dict[str, array.array] = {}
+        # Bounds the requests in flight to each PLC, see the maxInflight setting
+        self._inflight: Dict[str, asyncio.Semaphore] = {}
+        # (connection_id, program) -> (expiry, normalized tag list)
+        self._tag_lists: Dict[Tuple[str, Optional[str]], Tuple[float, List[Dict]]] = {}
+        self._warm_keys: Dict[str, Tuple] = {}
+        self._warm_reaper: Optional[asyncio.Task] = None
         self.device_info: Dict[str, Dict] = {}
+        # Pending single-tag reads and the task batching them, per connection
+        self._read_queues: Dict[str, asyncio.Queue] = {}
+        self._read_batchers: Dict[str, asyncio.Task] = {}
+        # Data types seen per tag name, needed by the libplctag backend
+        self._tag_types: Dict[str, Dict[str, str]] = {}
+    
+    @staticmethod
+    def _backend_error(configuration: Dict[str, Any]) -> Optional[str]:
+        """Why the configured backend cannot be used, or None when its library is installed"""
+        if configuration.get("backend", "pycomm3") == "libplctag":
+            return None if LIBPLCTAG_AVAILABLE else "libplctag library not available"
+        return None if ETHERNETIP_AVAILABLE else "pycomm3 library not available"
+    
+    def _make_driver(self, protocol_id: Optional[str], configuration: Dict[str, Any]):
+        """Create the driver for a connection using the configured backend"""
+        target_host = configuration.get("targetHost", "192.168.1.100")
+        target_port = configuration.get("targetPort", 44818)
+        plc_type = configuration.get("plcType", "logix")  # logix, slc, micrologix
+        use_tag_cache = configuration.get("tagCache", False)
+        
+        if configuration.get("backend", "pycomm3") == "libplctag":
+            return LibplctagDriver(
+                target_host, port=target_port,
+                path=configuration.get("path", "1,0"),
+                plc_type=plc_type,
+                tag_types=self._tag_types.setdefault(protocol_id, {}) if protocol_id is not None else {},
+                timeout=configuration.get("timeout", 10.0)
+            )
+        
+        driver_cls = _DRIVER_BY_TYPE.get(plc_type.lower(), LogixDriver)
+        if driver_cls is LogixDriver:
+            # Logix tag definitions are loaded after open() from the tag cache instead
+            return LogixDriver(target_host, port=target_port, init_tags=not use_tag_cache)
+        return driver_cls(target_host, port=target_port)
+    
+    def _next_worker(self, protocol_id: str) -> DriverWorker:
+        """Pick the next session of the connection's pool"""
+        pool = self.drivers[protocol_id]
+        idx = self._rr_idx.get(protocol_id, 0)
+        self._rr_idx[protocol_id] = idx + 1
+        return pool[idx % len(pool)]
+    
+    async def _open_worker(self, protocol_id: str, configuration: Dict[str, Any], slot: int) -> DriverWorker:
+        """Create and open one pooled driver session, stopping its thread again on failure"""
+        driver = self._make_driver(protocol_id, configuration)
+        
+        # Set timeout
+        driver.connection_size = 504  # Standard connection size
+        
+        worker = DriverWorker(driver, f"eip-driver-{protocol_id}-{slot}")
+        try:
+            await worker.call("open")
+        except Exception:
+            worker.stop()
+            raise
+        return worker
+    
+    async def _open_pool(self, protocol_id: str, configuration: Dict[str, Any]) -> Tuple[List[DriverWorker], Dict]:
+        """Open the session pool of a connection and read the device information"""
+        target_host = configuration.get("targetHost", "192.168.1.100")
+        use_tag_cache = configuration.get("tagCache", False)
+        tag_cache_ttl = float(configuration.get("tagCacheTtl", _TAG_CACHE_TTL))
+        pool_size = max(1, int(configuration.get("poolSize", 4)))
+        
+        # Open the session pool in parallel; the first session must connect,
+        # further ones are optional as PLCs limit their number of sessions
+        pool = []
+        try:
+            opened = await asyncio.gather(
+                *[self._open_worker(protocol_id, configuration, slot) for slot in range(pool_size)],
+                return_exceptions=True
+            )
+            pool = [worker for worker in opened if isinstance(worker, DriverWorker)]
+            if isinstance(opened[0], BaseException):
+                raise opened[0]
+            if len(pool) < pool_size:
+                logger.warning(f"Only {len(pool)} of {pool_size} EtherNet/IP sessions opened to {target_host}")
+            
+            worker = pool[0]
+            driver = worker.driver
+            
+            if use_tag_cache and ETHERNETIP_AVAILABLE and isinstance(driver, LogixDriver):
+                cached = await worker.run(_init_logix_tags, driver, tag_cache_ttl)
+                logger.debug(f"Tag definitions for {target_host} {'loaded from cache' if cached else 'uploaded'}")
+                # Definitions are only read by the drivers, so the pool shares one copy
+                for other in pool[1:]:
+                    other.driver._tags = driver._tags
+                    other.driver._data_types = driver._data_types
+            
+            # Get device information
+            device_info = {}
+            try:
+                if hasattr(driver, 'get_plc_info'):
+                    info = await worker.call("get_plc_info")
+                    if info:
+                        device_info = {
+                            "vendor": getattr(info, 'vendor', 'Unknown'),
+                            "product_type": getattr(info, 'product_type', 'Unknown'),
+                            "product_code": getattr(info, 'product_code', 0),
+                            "version": getattr(info, 'version', 'Unknown'),
+                            "serial": getattr(info, 'serial', 'Unknown')
+                        }
+            except Exception as e:
+                logger.warning(f"Could not get device info: {e}")
+                device_info = {"status": "connected", "info": "Limited device info"}
+            
+            return pool, device_info
+            
+        except Exception:
+            await self._close_pool(pool)
+            raise
+    
+    async def _close_pool(self, pool: List[DriverWorker]):
+        """Close every session of a pool and stop the worker threads"""
+        for worker in pool:
+            try:
+                await worker.call("close")
+            except Exception:
+                pass
+            worker.stop()
+    
+    @staticmethod
+    def _warm_key(configuration: Dict[str, Any]) -> Tuple:
+        """Every configuration value that shapes the opened sessions - parked sessions are only reused on a full match"""
+        return (
+            configuration.get("targetHost", "192.168.1.100"),
+            configuration.get("targetPort", 44818),
+            str(configuration.get("plcType", "logix")).lower(),
+            configuration.get("backend", "pycomm3"),
+            str(configuration.get("path", "1,0")),
+            max(1, int(configuration.get("poolSize", 4))),
+            float(configuration.get("timeout", 10.0)),
+            bool(configuration.get("tagCache", False)),
+            float(configuration.get("tagCacheTtl", _TAG_CACHE_TTL))
+        )
+    
+    async def _warm_pool_alive(self, pool: List[DriverWorker]) -> bool:
+        """Check parked sessions before reuse; sessions without a cheap request to probe with are reopened"""
+        try:
+            for worker in pool:
+                driver = worker.driver
+                if isinstance(driver, LibplctagDriver):
+                    # libplctag re-establishes its session on the next request by itself
+                    continue
+                if hasattr(driver, "get_plc_info"):
+                    await worker.call("get_plc_info")
+                else:
+                    await worker.call("close")
+                    await worker.call("open")
+            return True
+        except Exception as e:
+            logger.info(f"Discarding parked EtherNet/IP sessions that no longer respond: {e}")
+            return False
+    
+    async def _reap_warm_pool(self):
+        """Close parked sessions nobody reused within the TTL"""
+        while self._warm_pool:
+            await asyncio.sleep(_WARM_POOL_TTL / 10)
+            now = time.monotonic()
+            for key, (pool, _, parked_at) in list(self._warm_pool.items()):
+                if now - parked_at > _WARM_POOL_TTL:
+                    del self._warm_pool[key]
+                    await self._close_pool(pool)
+    
+    async def get_connection_info(self, protocol_id: str) -> Optional[Dict[str, Any]]:
+        """Get connection information, with the counters materialized from the stats array"""
+        info = self.active_connections.get(protocol_id)
+        stats = self._stats.get(protocol_id)
+        if info is None or stats is None:
+            return info
+        idle_ns = time.monotonic_ns() - stats[_LAST_ACTIVITY]
+        return {
+            **info,
+            "tags_read": stats[_READS],
+            "tags_written": stats[_WRITES],
+            "last_activity": datetime.utcnow() - timedelta(microseconds=idle_ns / 1000)
+        }
     
     async def start_protocol(self, protocol_id: str, configuration: Dict[str, Any]) -> bool:
         """Start EtherNet/IP protocol"""
-        if not ETHERNETIP_AVAILABLE:
-            logger.error("pycomm3 library not available")
+        backend_error = self._backend_error(configuration)
+        if backend_error:
+            logger.error(backend_error)
             return False
         
         try:
@@ -34,6 +580,7 @@ class EthernetIpService(BaseProtocolService):
             target_port = configuration.get("targetPort", 44818)
             plc_type = configuration.get("plcType", "logix")  # logix, slc, micrologix
             timeout = configuration.get("timeout", 10.0)
+            self._set_log_level(protocol_id, configuration)
             
             await self._log_protocol_event(
                 protocol_id, "info",
@@ -41,45 +588,28 @@ class EthernetIpService(BaseProtocolService):
                 {"target_host": target_host, "target_port": target_port, "plc_type": plc_type}
             )
             
-            # Create appropriate driver based on PLC type
-            if plc_type.lower() in ['logix', 'controllogix', 'compactlogix']:
-                driver = LogixDriver(target_host, port=target_port)
-            elif plc_type.lower() in ['slc', 'micrologix']:
-                driver = SLCDriver(target_host, port=target_port)
+            # Reuse the sessions of a recently stopped connection to the same PLC
+            warm_key = self._warm_key(configuration)
+            warm = self._warm_pool.pop(warm_key, None)
+            if warm is not None and not await self._warm_pool_alive(warm[0]):
+                await self._close_pool(warm[0])
+                warm = None
+            if warm is not None:
+                pool, device_info, _ = warm
+                if isinstance(pool[0].driver, LibplctagDriver):
+                    self._tag_types[protocol_id] = pool[0].driver.tag_types
             else:
-                driver = LogixDriver(target_host, port=target_port)  # Default to Logix
-            
-            # Set timeout
-            driver.connection_size = 504  # Standard connection size
-            
-            # Test connection by opening it
-            try:
-                driver.open()
-                
-                # Get device information
-                device_info = {}
                 try:
-                    if hasattr(driver, 'get_plc_info'):
-                        info = driver.get_plc_info()
-                        if info:
-                            device_info = {
-                                "vendor": getattr(info, 'vendor', 'Unknown'),
-                                "product_type": getattr(info, 'product_type', 'Unknown'),
-                                "product_code": getattr(info, 'product_code', 0),
-                                "version": getattr(info, 'version', 'Unknown'),
-                                "serial": getattr(info, 'serial', 'Unknown')
-                            }
+                    pool, device_info = await self._open_pool(protocol_id, configuration)
                 except Exception as e:
-                    logger.warning(f"Could not get device info: {e}")
-                    device_info = {"status": "connected", "info": "Limited device info"}
-                
-                # Store connection
-                self.drivers[protocol_id] = driver
-                self.device_info[protocol_id] = device_info
-                
-            except Exception as e:
-                logger.error(f"EtherNet/IP connection failed: {e}")
-                return False
+                    logger.error(f"EtherNet/IP connection failed: {e}")
+                    return False
+            
+            # Store connection
+            self.drivers[protocol_id] = pool
+            self._rr_idx[protocol_id] = 0
+            self.device_info[protocol_id] = device_info
+            self._warm_keys[protocol_id] = warm_key
             
             # Store connection info
             self.active_connections[protocol_id] = {
@@ -88,12 +618,15 @@ class EthernetIpService(BaseProtocolService):
                 "plc_type": plc_type,
                 "status": "connected",
                 "device_info": device_info,
-                "last_activity": datetime.utcnow(),
-                "tags_read": 0,
-                "tags_written": 0,
+                "pool_size": len(pool),
                 "base_throughput": 5000  # bytes per second estimate
             }
             
+            self._stats[protocol_id] = array.array('Q', [0, 0, time.monotonic_ns()])
+            self._inflight[protocol_id] = asyncio.Semaphore(max(1, int(configuration.get("maxInflight", 8))))
+            self._read_queues[protocol_id] = asyncio.Queue()
+            self._read_batchers[protocol_id] = asyncio.create_task(self._read_batcher(protocol_id))
+            
             await self.start_monitoring()
             await self._log_protocol_event(
                 protocol_id, "info",
@@ -112,16 +645,40 @@ class EthernetIpService(BaseProtocolService):
     async def stop_protocol(self, protocol_id: str) -> bool:
         """Stop EtherNet/IP protocol"""
         try:
-            if protocol_id in self.drivers:
-                driver = self.drivers[protocol_id]
+            batcher = self._read_batchers.pop(protocol_id, None)
+            if batcher and not batcher.done():
+                batcher.cancel()
                 try:
-                    driver.close()
-                except:
+                    await batcher
+                except asyncio.CancelledError:
                     pass
-                del self.drivers[protocol_id]
+            queue = self._read_queues.pop(protocol_id, None)
+            while queue is not None and not queue.empty():
+                _, future = queue.get_nowait()
+                if not future.done():
+                    future.set_exception(Exception("Connection closed"))
+            
+            # Park the sessions for reuse instead of closing them right away
+            pool = self.drivers.pop(protocol_id, None)
+            warm_key = self._warm_keys.pop(protocol_id, None)
+            if pool:
+                replaced = self._warm_pool.pop(warm_key, None)
+                if replaced is not None:
+                    await self._close_pool(replaced[0])
+                self._warm_pool[warm_key] = (pool, self.device_info.get(protocol_id, {}), time.monotonic())
+                if self._warm_reaper is None or self._warm_reaper.done():
+                    self._warm_reaper = asyncio.create_task(self._reap_warm_pool())
+            self._rr_idx.pop(protocol_id, None)
+            self._stats.pop(protocol_id, None)
+            self._inflight.pop(protocol_id, None)
+            for key in [key for key in self._tag_lists if key[0] == protocol_id]:
+                del self._tag_lists[key]
+            self.log_levels.pop(protocol_id, None)
+            self._result_has_type.pop(protocol_id, None)
             
             if protocol_id in self.device_info:
                 del self.device_info[protocol_id]
+            self._tag_types.pop(protocol_id, None)
             
             if protocol_id in self.active_connections:
                 del self.active_connections[protocol_id]
@@ -145,23 +702,29 @@ class EthernetIpService(BaseProtocolService):
     
     async def test_connection(self, address: str, configuration: Dict[str, Any]) -> bool:
         """Test EtherNet/IP connection"""
-        if not ETHERNETIP_AVAILABLE:
-            return False
-        
         try:
             target_host = configuration.get("targetHost", address.split(':')[0])
             target_port = configuration.get("targetPort", 44818)
-            plc_type = configuration.get("plcType", "logix")
+            if self._backend_error(configuration):
+                return False
             
-            if plc_type.lower() in ['logix', 'controllogix', 'compactlogix']:
-                driver = LogixDriver(target_host, port=target_port)
-            else:
-                driver = SLCDriver(target_host, port=target_port)
+            if configuration.get("backend", "pycomm3") == "libplctag":
+                # libplctag only opens its session with the first tag, so probe the CIP port directly
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(target_host, target_port),
+                    timeout=configuration.get("timeout", 10.0)
+                )
+                writer.close()
+                return True
+            
+            driver = self._make_driver(None, {
+                **configuration, "targetHost": target_host, "targetPort": target_port, "tagCache": False
+            })
             
             try:
-                driver.open()
+                await asyncio.to_thread(driver.open)
                 # Try to read a simple tag or perform basic communication
-                driver.close()
+                await asyncio.to_thread(driver.close)
                 return True
             except Exception:
                 try:
@@ -175,70 +738,150 @@ class EthernetIpService(BaseProtocolService):
     
     async def read_data_point(self, connection_id: str, data_point_config: Dict[str, Any]) -> Any:
         """Read EtherNet/IP tag"""
-        if not ETHERNETIP_AVAILABLE:
-            raise Exception("EtherNet/IP library not available")
-        
         try:
             if connection_id not in self.drivers:
                 raise Exception("Connection not active")
             
-            driver = self.drivers[connection_id]
-            connection = self.active_connections[connection_id]
+            stats = self._stats[connection_id]
             
             tag_name = data_point_config.get("tagName", "TestTag")
             data_type = data_point_config.get("dataType", "DINT")
             
-            # Read tag value
-            result = await asyncio.to_thread(driver.read, tag_name)
+            tag_types = self._tag_types.get(connection_id)
+            if tag_types is not None and tag_name not in tag_types:
+                tag_types[tag_name] = data_type
+            
+            # Read tag value, batched with other reads pending on this connection
+            future = asyncio.get_running_loop().create_future()
+            self._read_queues[connection_id].put_nowait((tag_name, future))
+            result = await future
             
             if result.error:
                 raise Exception(f"Read error: {result.error}")
             
             # Update statistics
-            connection["tags_read"] += 1
-            connection["last_activity"] = datetime.utcnow()
+            stats[_READS] += 1
+            stats[_LAST_ACTIVITY] = time.monotonic_ns()
+            
+            # Whether results carry a type is fixed per driver, so it is probed only once
+            has_type = self._result_has_type.get(connection_id)
+            if has_type is None:
+                has_type = self._result_has_type[connection_id] = hasattr(result, 'type')
             
+            # Integer timestamp; formatting is left to whoever presents the value
             return {
                 "value": result.value,
                 "tag_name": tag_name,
-                "data_type": result.type if hasattr(result, 'type') else data_type,
+                "data_type": result.type if has_type else data_type,
                 "status": "Good",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp_ns": time.time_ns()
             }
             
         except Exception as e:
             raise Exception(f"EtherNet/IP read error: {str(e)}")
     
+    async def _read_batcher(self, protocol_id: str):
+        """Coalesce queued single-tag reads into multi-tag driver reads"""
+        queue = self._read_queues[protocol_id]
+        while True:
+            batch = []
+            try:
+                batch.append(await queue.get())
+                _drain(queue, batch, _READ_BATCH_MAX)
+                if len(batch) < _READ_BATCH_MAX:
+                    # Give concurrent callers a moment to join the batch
+                    await asyncio.sleep(_READ_BATCH_WAIT)
+                    _drain(queue, batch, _READ_BATCH_MAX)
+                
+                # Packets go out concurrently over the session pool
+                reads = []
+                offset = 0
+                for chunk in _chunk_by_cip_size([tag for tag, _ in batch]):
+                    futures = [future for _, future in batch[offset:offset + len(chunk)]]
+                    offset += len(chunk)
+                    reads.append(self._read_chunk(protocol_id, self._next_worker(protocol_id), chunk, futures))
+                await asyncio.gather(*reads)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(Exception("Connection closed"))
+                break
+            except Exception as e:
+                logger.error(f"EtherNet/IP read batch error for {protocol_id}: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+    
+    async def _request(self, protocol_id: str, worker: DriverWorker, method: str, *args) -> Any:
+        """Send one request to the PLC, waiting while maxInflight requests are outstanding"""
+        async with self._inflight[protocol_id]:
+            return await worker.call(method, *args)
+    
+    async def _read_tags(self, protocol_id: str, worker: DriverWorker, tags: List[str]) -> list:
+        """Read tags on one session, always returning a list of results"""
+        results = await self._request(protocol_id, worker, "read", *tags)
+        return [results] if len(tags) == 1 else results
+    
+    async def _write_tags(self, protocol_id: str, worker: DriverWorker, writes: List[tuple]) -> list:
+        """Write tags on one session, always returning a list of results"""
+        results = await self._request(protocol_id, worker, "write", *writes)
+        return [results] if len(writes) == 1 else results
+    
+    async def _read_chunk(self, protocol_id: str, worker: DriverWorker, chunk: List[str], futures: List[asyncio.Future]):
+        """Read one packet worth of tags and resolve the waiting futures"""
+        try:
+            results = await self._read_tags(protocol_id, worker, chunk)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+    
+    @staticmethod
+    def _normalize_tags(tags) -> List[Dict]:
+        """Convert driver tag objects into tag list entries"""
+        try:
+            return [dict(zip(_TAG_FIELDS, _tag_attrs(tag))) for tag in tags]
+        except AttributeError:
+            return [{
+                "name": tag.tag_name if hasattr(tag, 'tag_name') else str(tag),
+                "data_type": tag.data_type if hasattr(tag, 'data_type') else "Unknown",
+                "alias": tag.alias if hasattr(tag, 'alias') else None,
+                "external_access": tag.external_access if hasattr(tag, 'external_access') else None
+            } for tag in tags]
+    
     async def write_data_point(self, connection_id: str, data_point_config: Dict[str, Any], value: Any) -> bool:
         """Write EtherNet/IP tag"""
-        if not ETHERNETIP_AVAILABLE:
-            raise Exception("EtherNet/IP library not available")
-        
         try:
             if connection_id not in self.drivers:
                 raise Exception("Connection not active")
             
-            driver = self.drivers[connection_id]
-            connection = self.active_connections[connection_id]
+            worker = self._next_worker(connection_id)
+            stats = self._stats[connection_id]
             
             tag_name = data_point_config.get("tagName", "TestTag")
             data_type = data_point_config.get("dataType", "DINT")
             
             # Write tag value
-            result = await asyncio.to_thread(driver.write, (tag_name, value, data_type))
+            result = await self._request(connection_id, worker, "write", (tag_name, value, data_type))
             
             if result.error:
                 raise Exception(f"Write error: {result.error}")
             
             # Update statistics
-            connection["tags_written"] += 1
-            connection["last_activity"] = datetime.utcnow()
+            stats[_WRITES] += 1
+            stats[_LAST_ACTIVITY] = time.monotonic_ns()
             
-            await self._log_protocol_event(
-                connection_id, "info",
-                f"EtherNet/IP write: {tag_name} = {value}",
-                {"tag_name": tag_name, "value": value, "data_type": data_type}
-            )
+            if self._log_level_enabled(connection_id, "info"):
+                await self._log_protocol_event(
+                    connection_id, "info",
+                    f"EtherNet/IP write: {tag_name} = {value}",
+                    {"tag_name": tag_name, "value": value, "data_type": data_type}
+                )
             
             return True
             
@@ -255,29 +898,30 @@ class EthernetIpService(BaseProtocolService):
             if connection_id not in self.drivers:
                 raise Exception("Connection not active")
             
-            driver = self.drivers[connection_id]
-            
             # Prepare tag names list
             tags = [tag.get("tagName") for tag in tag_list]
             
-            # Read multiple tags
-            results = await asyncio.to_thread(driver.read, *tags)
-            
-            # Process results
-            response = []
-            for i, result in enumerate(results):
-                tag_config = tag_list[i] if i < len(tag_list) else {}
-                response.append({
-                    "tag_name": tags[i],
-                    "value": result.value if not result.error else None,
-                    "data_type": result.type if hasattr(result, 'type') else "Unknown",
-                    "status": "Good" if not result.error else "Error",
-                    "error": result.error if result.error else None,
-                    "timestamp": datetime.utcnow().isoformat()
-                })
-            
-            return response
-            
+            # Read multiple tags, one packet-sized chunk per session of the pool in parallel
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(self._read_tags(connection_id, self._next_worker(connection_id), chunk))
+                    for chunk in _chunk_by_cip_size(tags)
+                ]
+            results = [result for task in tasks for result in task.result()]
+            
+            # Process results, all tags share the timestamp of the read
+            timestamp = datetime.utcnow().isoformat()
+            return [{
+                "tag_name": tag_name,
+                "value": result.value if not result.error else None,
+                "data_type": getattr(result, 'type', "Unknown"),
+                "status": "Good" if not result.error else "Error",
+                "error": result.error if result.error else None,
+                "timestamp": timestamp
+            } for tag_name, result in zip(tags, results)]
+            
+        except ExceptionGroup as eg:
+            raise Exception(f"EtherNet/IP multi-read error: {str(eg.exceptions[0])}")
         except Exception as e:
             raise Exception(f"EtherNet/IP multi-read error: {str(e)}")
     
@@ -287,8 +931,6 @@ class EthernetIpService(BaseProtocolService):
             if connection_id not in self.drivers:
                 raise Exception("Connection not active")
             
-            driver = self.drivers[connection_id]
-            
             # Prepare write data
             writes = []
             for tag in tag_data:
@@ -298,8 +940,16 @@ class EthernetIpService(BaseProtocolService):
                     tag.get("dataType", "DINT")
                 ))
             
-            # Write multiple tags
-            results = await asyncio.to_thread(driver.write, *writes)
+            # Write multiple tags, one chunk per session of the pool in parallel. Half the
+            # packet budget is sized on tag names, leaving the rest for the written values.
+            async with asyncio.TaskGroup() as tg:
+                tasks = []
+                offset = 0
+                for chunk in _chunk_by_cip_size([write[0] for write in writes], _CIP_REQUEST_LIMIT // 2):
+                    worker = self._next_worker(connection_id)
+                    tasks.append(tg.create_task(self._write_tags(connection_id, worker, writes[offset:offset + len(chunk)])))
+                    offset += len(chunk)
+            results = [result for task in tasks for result in task.result()]
             
             # Check for errors
             errors = [result.error for result in results if result.error]
@@ -307,13 +957,20 @@ class EthernetIpService(BaseProtocolService):
             if errors:
                 raise Exception(f"Write errors: {', '.join(errors)}")
             
-            await self._log_protocol_event(
-                connection_id, "info",
-                f"EtherNet/IP multi-write: {len(tag_data)} tags written successfully"
-            )
+            if self._log_level_enabled(connection_id, "info"):
+                await self._log_protocol_event(
+                    connection_id, "info",
+                    f"EtherNet/IP multi-write: {len(tag_data)} tags written successfully"
+                )
             
             return True
             
+        except ExceptionGroup as eg:
+            await self._log_protocol_event(
+                connection_id, "error",
+                f"EtherNet/IP multi-write error: {str(eg.exceptions[0])}"
+            )
+            return False
         except Exception as e:
             await self._log_protocol_event(
                 connection_id, "error",
@@ -327,22 +984,19 @@ class EthernetIpService(BaseProtocolService):
             if connection_id not in self.drivers:
                 raise Exception("Connection not active")
             
-            driver = self.drivers[connection_id]
+            cached = self._tag_lists.get((connection_id, program))
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            
+            worker = self._next_worker(connection_id)
             
             # Get tag list (if supported)
             try:
-                if hasattr(driver, 'get_tag_list'):
-                    tags = await asyncio.to_thread(driver.get_tag_list, program)
-                    
-                    result = []
-                    for tag in tags:
-                        result.append({
-                            "name": tag.tag_name if hasattr(tag, 'tag_name') else str(tag),
-                            "data_type": tag.data_type if hasattr(tag, 'data_type') else "Unknown",
-                            "alias": tag.alias if hasattr(tag, 'alias') else None,
-                            "external_access": tag.external_access if hasattr(tag, 'external_access') else None
-                        })
+                if hasattr(worker.driver, 'get_tag_list'):
+                    tags = await worker.call("get_tag_list", program)
                     
+                    result = self._normalize_tags(tags)
+                    self._tag_lists[(connection_id, program)] = (time.monotonic() + _TAG_LIST_TTL, result)
                     return result
                 else:
                     return [{"info": "Tag listing not supported for this PLC type"}]
@@ -1,37 +1,318 @@
+import array
 import asyncio
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
+import time
+import socket
+import struct
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
 
 try:
+    from pymodbus.client import AsyncModbusTcpClient
+    PYMODBUS_AVAILABLE = True
+except ImportError:
+    PYMODBUS_AVAILABLE = False
+
+try:
+    # Blocking fallback client, run through the default executor
     import modbus_tk.defines as modbus_defines
     from modbus_tk import modbus_tcp
-    MODBUS_AVAILABLE = True
+    from modbus_tk.modbus import ModbusError
+    MODBUS_TK_AVAILABLE = True
 except ImportError:
-    MODBUS_AVAILABLE = False
+    MODBUS_TK_AVAILABLE = False
+
+MODBUS_AVAILABLE = PYMODBUS_AVAILABLE or MODBUS_TK_AVAILABLE
 
 from ..base_protocol import BaseProtocolService
 
 logger = logging.getLogger(__name__)
 
+# Concurrent reads are coalesced into range reads per function code
+_READ_BATCH_MAX = 32
+_READ_BATCH_WAIT = 0.002
+# Protocol limits for a single read request
+_MAX_READ_REGISTERS = 125
+_MAX_READ_BITS = 2000
+# Ranges separated by at most this many unused addresses are read as one block
+_MERGE_GAP = 4
+# Slots of the per-connection stats array
+_READS = 0
+_WRITES = 1
+_LAST_ACTIVITY = 2  # time.monotonic_ns()
+
+# Idle seconds before a connection is pinged, also used as the TCP keepalive idle time
+_KEEPALIVE_INTERVAL = 30
+
+
+# struct code and register width of the multi-register data types
+_REGISTER_FORMATS = {
+    "int16": ("h", 1),
+    "uint16": ("H", 1),
+    "int32": ("i", 2),
+    "uint32": ("I", 2),
+    "float": ("f", 2),
+    "float32": ("f", 2),
+    "float64": ("d", 4),
+    "double": ("d", 4),
+}
+
+
+# Compiled struct formats, reused across reads and writes of the same shape
+_STRUCTS: Dict[str, struct.Struct] = {}
+
+
+def _struct(fmt: str) -> struct.Struct:
+    compiled = _STRUCTS.get(fmt)
+    if compiled is None:
+        compiled = _STRUCTS[fmt] = struct.Struct(fmt)
+    return compiled
+
+
+def _swap_words(words: list, width: int) -> list:
+    """Reverse the word order inside each value, for low word first devices"""
+    return [word for i in range(0, len(words), width) for word in reversed(words[i:i + width])]
+
+
+def _decode_registers(registers, data_type: str, swap_words: bool = False) -> list:
+    """Reinterpret a block of big-endian registers as values of data_type in one pack/unpack"""
+    register_format = _REGISTER_FORMATS.get(data_type)
+    if register_format is None:
+        return [int(register) for register in registers]
+    
+    code, width = register_format
+    count = len(registers) // width
+    words = registers[:count * width]
+    if swap_words and width > 1:
+        words = _swap_words(words, width)
+    return list(_struct(f">{count}{code}").unpack(_struct(f">{len(words)}H").pack(*words)))
+
+
+def _encode_registers(values, data_type: str, swap_words: bool = False) -> list:
+    """Pack values of data_type into big-endian registers in one pack/unpack"""
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    
+    register_format = _REGISTER_FORMATS.get(data_type)
+    if register_format is None:
+        # Plain register values, negative ones written as two's complement
+        return [int(value) & 0xFFFF for value in values]
+    
+    code, width = register_format
+    if code not in "fd":
+        values = [int(value) for value in values]
+    words = list(_struct(f">{len(values) * width}H").unpack(_struct(f">{len(values)}{code}").pack(*values)))
+    if swap_words and width > 1:
+        words = _swap_words(words, width)
+    return words
+
+
+def _tune_socket(sock, keepalive_idle: int):
+    """Disable Nagle and enable TCP keepalive on a client socket"""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if keepalive_idle and hasattr(socket, "TCP_KEEPIDLE"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, keepalive_idle)
+    except OSError as e:
+        logger.warning(f"Could not set Modbus socket options: {e}")
+
+
+async def _open_client(host: str, port: int, timeout: float, keepalive_idle: int = _KEEPALIVE_INTERVAL):
+    """Connect a Modbus TCP client, natively async when pymodbus is installed"""
+    if PYMODBUS_AVAILABLE:
+        client = AsyncModbusTcpClient(host, port=port, timeout=timeout)
+        await client.connect()
+        if not client.connected:
+            client.close()
+            raise Exception(f"Could not connect to {host}:{port}")
+        sock = client.transport.get_extra_info("socket") if client.transport else None
+    else:
+        client = modbus_tcp.TcpMaster(host, port)
+        client.set_timeout(timeout)
+        # Connect now rather than on the first request so the socket can be tuned
+        await asyncio.to_thread(client.open)
+        sock = client._sock
+    
+    if sock is not None:
+        _tune_socket(sock, keepalive_idle)
+    return client
+
+
+# Client method (pymodbus) and function constant (modbus_tk) per Modbus function code
+_READ_METHODS = {
+    1: "read_coils",
+    2: "read_discrete_inputs",
+    3: "read_holding_registers",
+    4: "read_input_registers",
+}
+_WRITE_METHODS = {
+    5: "write_coil",
+    6: "write_register",
+    15: "write_coils",
+    16: "write_registers",
+}
+if MODBUS_TK_AVAILABLE:
+    _READ_FC = {
+        1: modbus_defines.READ_COILS,
+        2: modbus_defines.READ_DISCRETE_INPUTS,
+        3: modbus_defines.READ_HOLDING_REGISTERS,
+        4: modbus_defines.READ_INPUT_REGISTERS,
+    }
+    _WRITE_FC = {
+        5: modbus_defines.WRITE_SINGLE_COIL,
+        6: modbus_defines.WRITE_SINGLE_REGISTER,
+        15: modbus_defines.WRITE_MULTIPLE_COILS,
+        16: modbus_defines.WRITE_MULTIPLE_REGISTERS,
+    }
+else:
+    _READ_FC = {}
+    _WRITE_FC = {}
+
+# Single coil values on the wire
+_COIL_ON = 0xFF00
+_COIL_OFF = 0x0000
+
+
+class _ExceptionResponse(Exception):
+    """The device answered a request with a Modbus exception code"""
+
+
+async def _execute_read(client, unit_id: int, function_code: int, address: int, count: int):
+    """Read count bits or registers starting at address"""
+    if PYMODBUS_AVAILABLE:
+        try:
+            method = _READ_METHODS[function_code]
+        except KeyError:
+            raise Exception(f"Unsupported function code: {function_code}")
+        
+        response = await getattr(client, method)(address, count, slave=unit_id)
+        if response.isError():
+            raise _ExceptionResponse(str(response))
+        # Bit responses are padded to whole bytes
+        return response.bits[:count] if function_code in (1, 2) else response.registers
+    
+    try:
+        modbus_function = _READ_FC[function_code]
+    except KeyError:
+        raise Exception(f"Unsupported function code: {function_code}")
+    
+    try:
+        return await asyncio.to_thread(client.execute, unit_id, modbus_function, address, count)
+    except ModbusError as e:
+        raise _ExceptionResponse(str(e)) from e
+
+
+async def _execute_write(client, unit_id: int, function_code: int, address: int, value: Any):
+    """Write a coil, register or block of them starting at address"""
+    if function_code == 5:  # Write Single Coil
+        write_value = bool(value)
+    elif function_code == 6:  # Write Single Register
+        write_value = int(value) & 0xFFFF
+    elif function_code == 15:  # Write Multiple Coils
+        write_value = list(map(bool, value)) if isinstance(value, list) else [bool(value)]
+    elif function_code == 16:  # Write Multiple Registers
+        write_value = value if isinstance(value, list) else [int(value) & 0xFFFF]
+    else:
+        raise Exception(f"Unsupported write function code: {function_code}")
+    
+    if PYMODBUS_AVAILABLE:
+        response = await getattr(client, _WRITE_METHODS[function_code])(address, write_value, slave=unit_id)
+        if response.isError():
+            raise Exception(str(response))
+        return
+    
+    if function_code == 5:
+        write_value = _COIL_ON if write_value else _COIL_OFF
+    
+    await asyncio.to_thread(
+        client.execute,
+        unit_id,
+        _WRITE_FC[function_code],
+        address,
+        len(write_value) if isinstance(write_value, list) else 1,
+        write_value
+    )
+
+
+def _drain(queue: asyncio.Queue, batch: list, limit: int):
+    """Move already queued items into batch without waiting"""
+    while len(batch) < limit:
+        try:
+            batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+
+
+def _merge_ranges(requests: list, max_span: int, merge_gap: int = 0) -> List[list]:
+    """Group (address, count, future) requests into ranges that can be read as one block"""
+    groups = []
+    group = None
+    start = end = 0
+    for request in sorted(requests, key=lambda r: r[0]):
+        address, count, _ = request
+        if group and address <= end + merge_gap and max(end, address + count) - start <= max_span:
+            group.append(request)
+            end = max(end, address + count)
+        else:
+            group = [request]
+            groups.append(group)
+            start, end = address, address + count
+    return groups
+
+
 class ModbusTcpService(BaseProtocolService):
     """Modbus TCP protocol service - Real implementation"""
     
     def __init__(self):
+        if not MODBUS_AVAILABLE:
+            raise RuntimeError("pymodbus or modbus-tk required for Modbus TCP")
         super().__init__("modbus-tcp")
-        self.masters: Dict[str, modbus_tcp.TcpMaster] = {}
+        # Pool of AsyncModbusTcpClient sessions per connection (modbus_tk TcpMaster as fallback),
+        # used round-robin; each session handles one transaction at a time
+        self.clients: Dict[str, List[Any]] = {}
+        self._client_locks: Dict[str, List[asyncio.Lock]] = {}
+        self._rr_idx: Dict[str, int] = {}
+        # Read/write counters and last activity per connection, see get_connection_info
+        self._stats: Dict[str, array.array] = {}
+        # Tasks pinging idle connections
+        self._keepalive_tasks: Dict[str, asyncio.Task] = {}
+        # Pending reads and the task batching them, per connection
+        self._read_queues: Dict[str, asyncio.Queue] = {}
+        self._read_batchers: Dict[str, asyncio.Task] = {}
+    
+    def _next_client(self, protocol_id: str) -> Tuple[Any, asyncio.Lock]:
+        """Pick the next session of the connection's pool"""
+        pool = self.clients[protocol_id]
+        idx = self._rr_idx.get(protocol_id, 0)
+        self._rr_idx[protocol_id] = idx + 1
+        slot = idx % len(pool)
+        return pool[slot], self._client_locks[protocol_id][slot]
+    
+    async def get_connection_info(self, protocol_id: str) -> Optional[Dict[str, Any]]:
+        """Get connection information, with the counters materialized from the stats array"""
+        info = self.active_connections.get(protocol_id)
+        stats = self._stats.get(protocol_id)
+        if info is None or stats is None:
+            return info
+        idle_ns = time.monotonic_ns() - stats[_LAST_ACTIVITY]
+        return {
+            **info,
+            "reads": stats[_READS],
+            "writes": stats[_WRITES],
+            "last_activity": datetime.utcnow() - timedelta(microseconds=idle_ns / 1000)
+        }
     
     async def start_protocol(self, protocol_id: str, configuration: Dict[str, Any]) -> bool:
         """Start Modbus TCP protocol"""
-        if not MODBUS_AVAILABLE:
-            logger.error("modbus-tk library not available")
-            return False
-        
         try:
             host = configuration.get("host", "localhost")
             port = configuration.get("port", 502)
             unit_id = configuration.get("unitId", 1)
             timeout = configuration.get("timeout", 5.0)
+            keepalive_interval = configuration.get("keepaliveInterval", _KEEPALIVE_INTERVAL)
+            self._set_log_level(protocol_id, configuration)
             
             await self._log_protocol_event(
                 protocol_id, "info",
@@ -39,26 +320,36 @@ class ModbusTcpService(BaseProtocolService):
                 {"host": host, "port": port, "unit_id": unit_id}
             )
             
-            # Create Modbus TCP master
-            master = modbus_tcp.TcpMaster(host, port)
-            master.set_timeout(timeout)
+            pool_size = max(1, int(configuration.get("poolSize", 4)))
+            
+            # Create the Modbus TCP client pool; the first session must connect,
+            # further ones are optional as devices limit their number of connections
+            opened = await asyncio.gather(
+                *[_open_client(host, port, timeout, keepalive_interval) for _ in range(pool_size)],
+                return_exceptions=True
+            )
+            pool = [client for client in opened if not isinstance(client, BaseException)]
+            if isinstance(opened[0], BaseException):
+                logger.error(f"Modbus connection failed: {opened[0]}")
+                for client in pool:
+                    client.close()
+                return False
+            if len(pool) < pool_size:
+                logger.warning(f"Only {len(pool)} of {pool_size} Modbus sessions opened to {host}:{port}")
             
             # Test connection
             try:
                 # Try to read holding register 0 to test connection
-                await asyncio.to_thread(
-                    master.execute, 
-                    unit_id, 
-                    modbus_defines.READ_HOLDING_REGISTERS, 
-                    0, 
-                    1
-                )
+                await _execute_read(pool[0], unit_id, 3, 0, 1)
             except Exception as e:
                 logger.error(f"Modbus connection test failed: {e}")
-                master.close()
+                for client in pool:
+                    client.close()
                 return False
             
-            self.masters[protocol_id] = master
+            self.clients[protocol_id] = pool
+            self._client_locks[protocol_id] = [asyncio.Lock() for _ in pool]
+            self._rr_idx[protocol_id] = 0
             
             # Store connection info
             self.active_connections[protocol_id] = {
@@ -66,11 +357,20 @@ class ModbusTcpService(BaseProtocolService):
                 "port": port,
                 "unit_id": unit_id,
                 "timeout": timeout,
+                "pool_size": len(pool),
+                "merge_gap": configuration.get("mergeGap", _MERGE_GAP),
                 "status": "connected",
-                "last_activity": datetime.utcnow(),
                 "base_throughput": 1000  # bytes per second estimate
             }
             
+            self._stats[protocol_id] = array.array('Q', [0, 0, time.monotonic_ns()])
+            self._read_queues[protocol_id] = asyncio.Queue()
+            self._read_batchers[protocol_id] = asyncio.create_task(self._read_batcher(protocol_id))
+            if keepalive_interval:
+                self._keepalive_tasks[protocol_id] = asyncio.create_task(
+                    self._keepalive_loop(protocol_id, keepalive_interval)
+                )
+            
             await self.start_monitoring()
             await self._log_protocol_event(
                 protocol_id, "info",
@@ -89,10 +389,25 @@ class ModbusTcpService(BaseProtocolService):
     async def stop_protocol(self, protocol_id: str) -> bool:
         """Stop Modbus TCP protocol"""
         try:
-            if protocol_id in self.masters:
-                master = self.masters[protocol_id]
-                master.close()
-                del self.masters[protocol_id]
+            for task in (self._read_batchers.pop(protocol_id, None), self._keepalive_tasks.pop(protocol_id, None)):
+                if task and not task.done():
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+            queue = self._read_queues.pop(protocol_id, None)
+            while queue is not None and not queue.empty():
+                future = queue.get_nowait()[-1]
+                if not future.done():
+                    future.set_exception(Exception("Connection closed"))
+            
+            for client in self.clients.pop(protocol_id, ()):
+                client.close()
+            self._client_locks.pop(protocol_id, None)
+            self._rr_idx.pop(protocol_id, None)
+            self._stats.pop(protocol_id, None)
+            self.log_levels.pop(protocol_id, None)
             
             if protocol_id in self.active_connections:
                 del self.active_connections[protocol_id]
@@ -116,31 +431,21 @@ class ModbusTcpService(BaseProtocolService):
     
     async def test_connection(self, address: str, configuration: Dict[str, Any]) -> bool:
         """Test Modbus TCP connection"""
-        if not MODBUS_AVAILABLE:
-            return False
-        
         try:
             host = configuration.get("host", address)
             port = configuration.get("port", 502)
             unit_id = configuration.get("unitId", 1)
             timeout = configuration.get("timeout", 5.0)
             
-            master = modbus_tcp.TcpMaster(host, port)
-            master.set_timeout(timeout)
+            client = await _open_client(host, port, timeout)
             
             try:
                 # Test with a simple read operation
-                await asyncio.to_thread(
-                    master.execute,
-                    unit_id,
-                    modbus_defines.READ_HOLDING_REGISTERS,
-                    0,
-                    1
-                )
-                master.close()
+                await _execute_read(client, unit_id, 3, 0, 1)
+                client.close()
                 return True
             except Exception:
-                master.close()
+                client.close()
                 return False
                 
         except Exception:
@@ -148,111 +453,171 @@ class ModbusTcpService(BaseProtocolService):
     
     async def read_data_point(self, connection_id: str, data_point_config: Dict[str, Any]) -> Any:
         """Read Modbus register"""
-        if not MODBUS_AVAILABLE:
-            raise Exception("Modbus library not available")
-        
         try:
-            if connection_id not in self.masters:
+            if connection_id not in self.clients:
                 raise Exception("Connection not active")
             
-            master = self.masters[connection_id]
-            connection = self.active_connections[connection_id]
+            stats = self._stats[connection_id]
             
             function_code = data_point_config.get("functionCode", 3)  # Read Holding Registers
             register_address = data_point_config.get("registerAddress", 0)
             register_count = data_point_config.get("registerCount", 1)
-            unit_id = connection.get("unit_id", 1)
             data_type = data_point_config.get("dataType", "integer")
             
-            # Map function codes to modbus_tk functions
-            if function_code == 1:
-                modbus_function = modbus_defines.READ_COILS
-            elif function_code == 2:
-                modbus_function = modbus_defines.READ_DISCRETE_INPUTS
-            elif function_code == 3:
-                modbus_function = modbus_defines.READ_HOLDING_REGISTERS
-            elif function_code == 4:
-                modbus_function = modbus_defines.READ_INPUT_REGISTERS
-            else:
+            if function_code not in _READ_METHODS:
                 raise Exception(f"Unsupported function code: {function_code}")
             
-            # Execute read operation
-            result = await asyncio.to_thread(
-                master.execute,
-                unit_id,
-                modbus_function,
-                register_address,
-                register_count
-            )
+            # Execute read operation, merged with adjacent reads pending on this connection
+            future = asyncio.get_running_loop().create_future()
+            self._read_queues[connection_id].put_nowait((function_code, register_address, register_count, future))
+            result = await future
             
             # Update connection activity
-            connection["last_activity"] = datetime.utcnow()
+            stats[_READS] += 1
+            stats[_LAST_ACTIVITY] = time.monotonic_ns()
             
             # Process result based on data type
             if function_code in [1, 2]:  # Coils/Discrete Inputs
-                return bool(result[0]) if result else False
+                values = [bool(bit) for bit in result]
             else:  # Holding/Input Registers
-                if data_type == "float" and len(result) >= 2:
-                    # Combine two registers for float (IEEE 754)
-                    combined = (result[0] << 16) | result[1]
-                    return float(combined)
-                elif data_type == "integer":
-                    return int(result[0]) if result else 0
-                else:
-                    return result[0] if result else 0
+                values = _decode_registers(result, data_type, data_point_config.get("swapWords", False))
+            
+            if not values:
+                return result[0] if result else (False if function_code in [1, 2] else 0)
+            return values[0] if len(values) == 1 else values
             
         except Exception as e:
             raise Exception(f"Modbus read error: {str(e)}")
     
+    async def _read_batcher(self, protocol_id: str):
+        """Coalesce queued reads into one request per contiguous register range"""
+        queue = self._read_queues[protocol_id]
+        while True:
+            batch = []
+            try:
+                batch.append(await queue.get())
+                _drain(queue, batch, _READ_BATCH_MAX)
+                if len(batch) < _READ_BATCH_MAX:
+                    # Give concurrent callers a moment to join the batch
+                    await asyncio.sleep(_READ_BATCH_WAIT)
+                    _drain(queue, batch, _READ_BATCH_MAX)
+                
+                connection = self.active_connections[protocol_id]
+                unit_id = connection.get("unit_id", 1)
+                merge_gap = connection.get("merge_gap", _MERGE_GAP)
+                
+                by_function = defaultdict(list)
+                for function_code, address, count, future in batch:
+                    by_function[function_code].append((address, count, future))
+                
+                # Merged ranges go out concurrently over the session pool
+                reads = []
+                for function_code, requests in by_function.items():
+                    if function_code in (1, 2):
+                        max_span = _MAX_READ_BITS
+                    else:
+                        max_span = _MAX_READ_REGISTERS
+                    
+                    for group in _merge_ranges(requests, max_span, merge_gap):
+                        reads.append(self._read_group(protocol_id, unit_id, function_code, group))
+                await asyncio.gather(*reads)
+            except asyncio.CancelledError:
+                for item in batch:
+                    if not item[-1].done():
+                        item[-1].set_exception(Exception("Connection closed"))
+                break
+            except Exception as e:
+                logger.error(f"Modbus read batch error for {protocol_id}: {e}")
+                for item in batch:
+                    if not item[-1].done():
+                        item[-1].set_exception(e)
+    
+    async def _keepalive_loop(self, protocol_id: str, interval: float):
+        """Ping every pooled session with FC3(0, 1) once the connection has been idle for interval seconds"""
+        while True:
+            try:
+                await asyncio.sleep(interval)
+                connection = self.active_connections.get(protocol_id)
+                if connection is None:
+                    break
+                stats = self._stats[protocol_id]
+                if time.monotonic_ns() - stats[_LAST_ACTIVITY] < interval * 1_000_000_000:
+                    continue
+                
+                unit_id = connection.get("unit_id", 1)
+                for client, lock in zip(self.clients[protocol_id], self._client_locks[protocol_id]):
+                    try:
+                        async with lock:
+                            await _execute_read(client, unit_id, 3, 0, 1)
+                    except Exception as e:
+                        logger.warning(f"Modbus keepalive failed for {protocol_id}: {e}")
+                stats[_LAST_ACTIVITY] = time.monotonic_ns()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Modbus keepalive error for {protocol_id}: {e}")
+    
+    async def _read_group(self, protocol_id: str, unit_id: int, function_code: int, group: list):
+        """Read one merged range and hand every requester its slice"""
+        start = group[0][0]
+        span = max(address + count for address, count, _ in group) - start
+        client, lock = self._next_client(protocol_id)
+        try:
+            async with lock:
+                result = await _execute_read(client, unit_id, function_code, start, span)
+        except Exception as e:
+            if isinstance(e, _ExceptionResponse) and len(group) > 1:
+                # One unmapped address fails the whole block, so only requests that fail alone get the error
+                await asyncio.gather(*(
+                    self._read_group(protocol_id, unit_id, function_code, [request]) for request in group
+                ))
+                return
+            for _, _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for address, count, future in group:
+            if not future.done():
+                offset = address - start
+                future.set_result(result[offset:offset + count])
+    
     async def write_data_point(self, connection_id: str, data_point_config: Dict[str, Any], value: Any) -> bool:
         """Write to Modbus register"""
-        if not MODBUS_AVAILABLE:
-            raise Exception("Modbus library not available")
-        
         try:
-            if connection_id not in self.masters:
+            if connection_id not in self.clients:
                 raise Exception("Connection not active")
             
-            master = self.masters[connection_id]
+            client, lock = self._next_client(connection_id)
             connection = self.active_connections[connection_id]
             
             function_code = data_point_config.get("functionCode", 6)  # Write Single Register
             register_address = data_point_config.get("registerAddress", 0)
             unit_id = connection.get("unit_id", 1)
             
-            if function_code == 5:  # Write Single Coil
-                modbus_function = modbus_defines.WRITE_SINGLE_COIL
-                write_value = 0xFF00 if value else 0x0000
-            elif function_code == 6:  # Write Single Register
-                modbus_function = modbus_defines.WRITE_SINGLE_REGISTER
-                write_value = int(value)
-            elif function_code == 15:  # Write Multiple Coils
-                modbus_function = modbus_defines.WRITE_MULTIPLE_COILS
-                write_value = [bool(v) for v in (value if isinstance(value, list) else [value])]
-            elif function_code == 16:  # Write Multiple Registers
-                modbus_function = modbus_defines.WRITE_MULTIPLE_REGISTERS
-                write_value = value if isinstance(value, list) else [int(value)]
-            else:
-                raise Exception(f"Unsupported write function code: {function_code}")
+            if function_code == 16:
+                # Typed values are packed into their registers up front
+                value = _encode_registers(
+                    value,
+                    data_point_config.get("dataType", "integer"),
+                    data_point_config.get("swapWords", False)
+                )
             
             # Execute write operation
-            await asyncio.to_thread(
-                master.execute,
-                unit_id,
-                modbus_function,
-                register_address,
-                len(write_value) if isinstance(write_value, list) else 1,
-                write_value
-            )
+            async with lock:
+                await _execute_write(client, unit_id, function_code, register_address, value)
             
             # Update connection activity
-            connection["last_activity"] = datetime.utcnow()
+            stats = self._stats[connection_id]
+            stats[_WRITES] += 1
+            stats[_LAST_ACTIVITY] = time.monotonic_ns()
             
-            await self._log_protocol_event(
-                connection_id, "info",
-                f"Modbus write: Register {register_address} = {value}",
-                {"function_code": function_code, "register": register_address, "value": value}
-            )
+            if self._log_level_enabled(connection_id, "info"):
+                await self._log_protocol_event(
+                    connection_id, "info",
+                    f"Modbus write: Register {register_address} = {value}",
+                    {"function_code": function_code, "register": register_address, "value": value}
+                )
             
             return True
             
@@ -283,6 +648,25 @@ class ModbusTcpService(BaseProtocolService):
         result = await self.read_data_point(connection_id, config)
         return result if isinstance(result, list) else [result]
     
+    async def read_multiple_registers(self, connection_id: str, specs: List[Tuple[int, int]]) -> List[list]:
+        """Read several (address, count) holding register ranges, merged into as few requests as possible"""
+        if connection_id not in self.clients:
+            raise Exception("Connection not active")
+        
+        loop = asyncio.get_running_loop()
+        queue = self._read_queues[connection_id]
+        futures = []
+        for address, count in specs:
+            future = loop.create_future()
+            queue.put_nowait((3, address, count, future))
+            futures.append(future)
+        
+        results = await asyncio.gather(*futures)
+        stats = self._stats[connection_id]
+        stats[_READS] += len(specs)
+        stats[_LAST_ACTIVITY] = time.monotonic_ns()
+        return [list(result) for result in results]
+    
     async def write_single_coil(self, connection_id: str, address: int, value: bool) -> bool:
         """Write single coil"""
         config = {
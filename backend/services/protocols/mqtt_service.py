@@ -1,8 +1,14 @@
+import array
 import asyncio
 import json
 import logging
-from typing import Dict, Any, Optional, Callable
-from datetime import datetime
+import socket
+import ssl
+import sys
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from datetime import datetime, timedelta
 
 try:
     import paho.mqtt.client as mqtt
@@ -10,18 +16,190 @@ try:
 except ImportError:
     MQTT_AVAILABLE = False
 
+try:
+    import orjson
+    
+    def _json_dumps(value) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(value) -> bytes:
+        return json.dumps(value).encode()
+    
+    _json_loads = json.loads
+
 from ..base_protocol import BaseProtocolService
 
 logger = logging.getLogger(__name__)
 
+# Concurrent publishes are handed to paho in batches
+_PUBLISH_BATCH_MAX = 256
+_PUBLISH_BATCH_WAIT = 0.002
+
+# TLS 1.2 suites with hardware-accelerated AES-GCM, TLS 1.3 suites are AEAD already
+_TLS_CIPHERS = "ECDHE-ECDSA-AES128-GCM-SHA256:ECDHE-RSA-AES128-GCM-SHA256:ECDHE-ECDSA-AES256-GCM-SHA384:ECDHE-RSA-AES256-GCM-SHA384"
+_tls_contexts: Dict[str, ssl.SSLContext] = {}
+
+# Hot-path log events are buffered per connection and written in batches
+_LOG_RING_SIZE = 8192
+_LOG_FLUSH_INTERVAL = 0.1
+
+# Topics whose last message is kept per connection, least recently updated are evicted
+_LAST_MESSAGES_MAX = 10000
+# Payload buffers of evicted topics kept for reuse
+_PAYLOAD_POOL_MAX = 1024
+
+
+def _drain(queue: asyncio.Queue, batch: list, limit: int):
+    """Move already queued items into batch without waiting"""
+    while len(batch) < limit:
+        try:
+            batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+
+
+def _publish_batch(pool: list, offset: int, batch: list) -> list:
+    """Publish (topic, payload, qos, retain, future) items round-robin over the pool,
+    returning the pool slot and a message info or exception per item"""
+    results = []
+    for i, (topic, payload, qos, retain, _) in enumerate(batch):
+        slot = (offset + i) % len(pool)
+        try:
+            results.append((slot, pool[slot].publish(topic, payload, qos, retain)))
+        except Exception as e:
+            results.append((slot, e))
+    return results
+
+
+def _attach_to_loop(client, loop: asyncio.AbstractEventLoop):
+    """Drive the client's socket from the event loop instead of paho's network thread"""
+    # Socket callbacks may fire from the connect() worker thread, and the socket is
+    # closed right after on_socket_close returns, so hand the loop the fd number
+    def on_socket_open(client, userdata, sock):
+        loop.call_soon_threadsafe(loop.add_reader, sock.fileno(), client.loop_read)
+    
+    def on_socket_close(client, userdata, sock):
+        loop.call_soon_threadsafe(loop.remove_reader, sock.fileno())
+    
+    def on_socket_register_write(client, userdata, sock):
+        loop.call_soon_threadsafe(loop.add_writer, sock.fileno(), client.loop_write)
+    
+    def on_socket_unregister_write(client, userdata, sock):
+        loop.call_soon_threadsafe(loop.remove_writer, sock.fileno())
+    
+    client.on_socket_open = on_socket_open
+    client.on_socket_close = on_socket_close
+    client.on_socket_register_write = on_socket_register_write
+    client.on_socket_unregister_write = on_socket_unregister_write
+
+
+class _TopicTrie:
+    """Subscription topic filters by level, matching a topic in O(depth) instead of testing every filter"""
+    
+    __slots__ = ("children", "filters")
+    
+    def __init__(self):
+        self.children: Dict[str, "_TopicTrie"] = {}
+        self.filters: List[str] = []
+    
+    def add(self, topic_filter: str):
+        node = self
+        for level in topic_filter.split("/"):
+            node = node.children.setdefault(level, _TopicTrie())
+        if topic_filter not in node.filters:
+            node.filters.append(topic_filter)
+    
+    def remove(self, topic_filter: str):
+        path = [self]
+        for level in topic_filter.split("/"):
+            node = path[-1].children.get(level)
+            if node is None:
+                return
+            path.append(node)
+        if topic_filter in path[-1].filters:
+            path[-1].filters.remove(topic_filter)
+        
+        # Prune levels left without filters or children
+        for level, node, parent in zip(reversed(topic_filter.split("/")), reversed(path[1:]), reversed(path[:-1])):
+            if node.filters or node.children:
+                break
+            del parent.children[level]
+    
+    def match(self, topic: str) -> List[str]:
+        """Filters matching a topic, wildcards do not match $-prefixed topics at the first level"""
+        matches = []
+        levels = topic.split("/")
+        if levels[0].startswith("$"):
+            child = self.children.get(levels[0])
+            if child is not None:
+                child._match(levels, 1, matches)
+        else:
+            self._match(levels, 0, matches)
+        return matches
+    
+    def _match(self, levels: List[str], i: int, matches: List[str]):
+        # '#' also matches the parent level, "a/#" matches "a"
+        wildcard = self.children.get("#")
+        if wildcard is not None:
+            matches.extend(wildcard.filters)
+        if i == len(levels):
+            matches.extend(self.filters)
+            return
+        child = self.children.get(levels[i])
+        if child is not None:
+            child._match(levels, i + 1, matches)
+        plus = self.children.get("+")
+        if plus is not None:
+            plus._match(levels, i + 1, matches)
+
+
+def _tls_context(ciphers: str) -> ssl.SSLContext:
+    """Shared client TLS context per cipher list, verifying brokers against the system CAs like tls_set()"""
+    context = _tls_contexts.get(ciphers)
+    if context is None:
+        context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+        context.set_ciphers(ciphers)
+        _tls_contexts[ciphers] = context
+    return context
+
+
+async def _resolve_host(host: str, port: int) -> str:
+    """Resolve a broker host on the event loop's resolver so paho's connect() skips its blocking lookup"""
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return infos[0][4][0]
+
+
 class MqttService(BaseProtocolService):
     """MQTT protocol service - Real implementation"""
     
     def __init__(self):
         super().__init__("mqtt")
-        self.clients: Dict[str, mqtt.Client] = {}
+        self.clients: Dict[str, List[mqtt.Client]] = {}
+        self._rr_idx: Dict[str, int] = {}
         self.message_callbacks: Dict[str, Callable] = {}
         self.subscribed_topics: Dict[str, Dict[str, Any]] = {}
+        self._publish_queues: Dict[str, asyncio.Queue] = {}
+        self._publishers: Dict[str, asyncio.Task] = {}
+        self._network_tasks: Dict[str, List[asyncio.Task]] = {}
+        # Broker acknowledgements still outstanding, by (pool slot, message id)
+        self._pending_confirms: Dict[str, Dict[Tuple[int, int], asyncio.Future]] = {}
+        # Set by _on_connect once the broker has answered the CONNECT, by (protocol_id, pool slot)
+        self._connect_events: Dict[Tuple[str, int], asyncio.Event] = {}
+        # Hot counters in parallel arrays indexed by a per-connection slot, see get_connection_info
+        self._slots: Dict[str, int] = {}
+        self._free_slots: List[int] = []
+        self._recv_counts = array.array('Q')
+        self._pub_counts = array.array('Q')
+        self._last_activity = array.array('d')  # time.monotonic()
+        # (level, message, metadata, timestamp) events waiting for _log_flusher
+        self._log_ring: Dict[str, deque] = defaultdict(lambda: deque(maxlen=_LOG_RING_SIZE))
+        self._log_flush_task: Optional[asyncio.Task] = None
+        # Subscribed topic filters per connection, for routing received messages
+        self._topic_tries: Dict[str, _TopicTrie] = {}
+        # Spare payload buffers, last_messages records own their buffer until evicted
+        self._payload_pool: List[bytearray] = []
     
     async def start_protocol(self, protocol_id: str, configuration: Dict[str, Any]) -> bool:
         """Start MQTT protocol"""
@@ -34,10 +212,10 @@ class MqttService(BaseProtocolService):
             broker_port = configuration.get("brokerPort", 1883)
             client_id = configuration.get("clientId", f"client_{protocol_id}")
             username = configuration.get("username")
-            password = configuration.get("password")
             keep_alive = configuration.get("keepAlive", 60)
             qos = configuration.get("qos", 1)
             use_ssl = configuration.get("useSSL", False)
+            self._set_log_level(protocol_id, configuration)
             
             await self._log_protocol_event(
                 protocol_id, "info",
@@ -45,61 +223,47 @@ class MqttService(BaseProtocolService):
                 {"broker_host": broker_host, "broker_port": broker_port, "client_id": client_id}
             )
             
-            # Create MQTT client
-            client = mqtt.Client(client_id=client_id, protocol=mqtt.MQTTv311)
-            
-            # Set authentication if provided
-            if username and password:
-                client.username_pw_set(username, password)
-            
-            # Configure SSL if requested
-            if use_ssl:
-                client.tls_set()
-            
-            # Set up callbacks
-            client.on_connect = self._on_connect
-            client.on_disconnect = self._on_disconnect
-            client.on_message = self._on_message
-            client.on_publish = self._on_publish
-            client.on_subscribe = self._on_subscribe
-            
-            # Store client reference
-            self.clients[protocol_id] = client
-            client._protocol_id = protocol_id  # Store protocol ID in client
-            
-            # Connect to broker
-            connection_result = await asyncio.to_thread(
-                client.connect, broker_host, broker_port, keep_alive
-            )
-            
-            if connection_result != mqtt.MQTT_ERR_SUCCESS:
-                raise Exception(f"MQTT connection failed with code: {connection_result}")
-            
-            # Start the network loop in a separate thread
-            client.loop_start()
-            
-            # Wait for connection to be established
-            await asyncio.sleep(1)
-            
-            if not client.is_connected():
-                raise Exception("MQTT client failed to connect")
+            # Connect the client pool, each client needs its own id at the broker
+            pool_size = max(1, int(configuration.get("clientPoolSize", 1)))
+            client_ids = [client_id] if pool_size == 1 else [f"{client_id}_{i}" for i in range(pool_size)]
+            
+            # TLS keeps the host name for certificate verification
+            connect_host = broker_host if use_ssl else await _resolve_host(broker_host, broker_port)
+            self.clients[protocol_id] = []
+            self._network_tasks[protocol_id] = []
+            results = await asyncio.gather(*[
+                self._connect_client(protocol_id, slot, pool_client_id, connect_host, configuration)
+                for slot, pool_client_id in enumerate(client_ids)
+            ], return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            self.clients[protocol_id].sort(key=lambda client: client._pool_slot)
             
             # Store connection info
             self.active_connections[protocol_id] = {
                 "broker_host": broker_host,
                 "broker_port": broker_port,
                 "client_id": client_id,
+                "pool_size": pool_size,
                 "username": username,
                 "keep_alive": keep_alive,
                 "qos": qos,
                 "status": "connected",
-                "last_activity": datetime.utcnow(),
                 "subscribed_topics": {},
-                "published_messages": 0,
-                "received_messages": 0,
+                "last_messages": OrderedDict(),
+                "last_messages_max": max(1, int(configuration.get("lastMessagesLimit", _LAST_MESSAGES_MAX))),
                 "base_throughput": 500  # bytes per second estimate
             }
-            
+            self._allocate_slot(protocol_id)
+            self._topic_tries[protocol_id] = _TopicTrie()
+            self._pending_confirms[protocol_id] = {}
+            self._publish_queues[protocol_id] = asyncio.Queue()
+            self._publishers[protocol_id] = asyncio.create_task(self._publisher(protocol_id))
+            
+            self._start_coarse_clock()
+            if not self._log_flush_task or self._log_flush_task.done():
+                self._log_flush_task = asyncio.create_task(self._log_flusher())
             await self.start_monitoring()
             await self._log_protocol_event(
                 protocol_id, "info",
@@ -113,24 +277,158 @@ class MqttService(BaseProtocolService):
                 protocol_id, "error",
                 f"Failed to start MQTT: {str(e)}"
             )
-            if protocol_id in self.clients:
-                self.clients[protocol_id].loop_stop()
-                del self.clients[protocol_id]
+            for task in self._network_tasks.pop(protocol_id, ()):
+                task.cancel()
+            for client in self.clients.pop(protocol_id, ()):
+                client.disconnect()
             return False
     
+    async def _connect_client(self, protocol_id: str, slot: int, client_id: str, connect_host: str,
+                              configuration: Dict[str, Any]):
+        """Create one pooled client, connect it and wait for the broker's CONNACK"""
+        broker_port = configuration.get("brokerPort", 1883)
+        username = configuration.get("username")
+        password = configuration.get("password")
+        keep_alive = configuration.get("keepAlive", 60)
+        
+        # Create MQTT client
+        client = mqtt.Client(client_id=client_id, protocol=mqtt.MQTTv311)
+        
+        # Set authentication if provided
+        if username and password:
+            client.username_pw_set(username, password)
+        
+        # Configure SSL if requested
+        if configuration.get("useSSL", False):
+            client.tls_set_context(_tls_context(configuration.get("tlsCiphers", _TLS_CIPHERS)))
+        
+        # Set up callbacks
+        client.on_connect = self._on_connect
+        client.on_disconnect = self._on_disconnect
+        client.on_message = self._on_message
+        client.on_publish = self._on_publish
+        client.on_subscribe = self._on_subscribe
+        _attach_to_loop(client, asyncio.get_running_loop())
+        
+        # Store client reference
+        self.clients[protocol_id].append(client)
+        client._protocol_id = protocol_id  # Store protocol ID in client
+        client._pool_slot = slot
+        
+        connected = self._connect_events[(protocol_id, slot)] = asyncio.Event()
+        try:
+            # Connect to broker
+            connection_result = await asyncio.to_thread(
+                client.connect, connect_host, broker_port, keep_alive
+            )
+            
+            if connection_result != mqtt.MQTT_ERR_SUCCESS:
+                raise Exception(f"MQTT connection failed with code: {connection_result}")
+            
+            # Socket I/O runs on the event loop, this task handles keepalive and reconnects
+            self._network_tasks[protocol_id].append(asyncio.create_task(self._network_loop(protocol_id, client)))
+            
+            # Wait for the broker's CONNACK
+            try:
+                await asyncio.wait_for(connected.wait(), configuration.get("connectTimeout", keep_alive))
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            self._connect_events.pop((protocol_id, slot), None)
+        
+        if not client.is_connected():
+            raise Exception(f"MQTT client {client_id} failed to connect")
+        
+        return client
+    
+    def _allocate_slot(self, protocol_id: str):
+        """Reserve zeroed counter slots for a connection"""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._recv_counts)
+            self._recv_counts.append(0)
+            self._pub_counts.append(0)
+            self._last_activity.append(0.0)
+        self._recv_counts[slot] = 0
+        self._pub_counts[slot] = 0
+        self._last_activity[slot] = time.monotonic()
+        self._slots[protocol_id] = slot
+    
+    def _release_slot(self, protocol_id: str):
+        """Return a connection's counter slots, zeroed so totals stay correct"""
+        slot = self._slots.pop(protocol_id, None)
+        if slot is not None:
+            self._recv_counts[slot] = 0
+            self._pub_counts[slot] = 0
+            self._free_slots.append(slot)
+    
+    async def get_connection_info(self, protocol_id: str) -> Optional[Dict[str, Any]]:
+        """Get connection information, with the counters materialized from the slot arrays"""
+        info = self.active_connections.get(protocol_id)
+        slot = self._slots.get(protocol_id)
+        if info is None or slot is None:
+            return info
+        idle = time.monotonic() - self._last_activity[slot]
+        return {
+            **info,
+            "received_messages": self._recv_counts[slot],
+            "published_messages": self._pub_counts[slot],
+            "last_activity": datetime.utcnow() - timedelta(seconds=idle)
+        }
+    
+    def get_service_stats(self) -> Dict[str, Any]:
+        """Get service statistics, including message totals over all connections"""
+        stats = super().get_service_stats()
+        stats["received_messages"] = sum(self._recv_counts)
+        stats["published_messages"] = sum(self._pub_counts)
+        return stats
+    
+    async def start_protocols(self, configurations: List[Tuple[str, Dict[str, Any]]]) -> List[bool]:
+        """Start several MQTT protocols concurrently so one slow broker does not delay the others"""
+        return await asyncio.gather(*[
+            self.start_protocol(protocol_id, configuration) for protocol_id, configuration in configurations
+        ])
+    
     async def stop_protocol(self, protocol_id: str) -> bool:
         """Stop MQTT protocol"""
         try:
-            if protocol_id in self.clients:
-                client = self.clients[protocol_id]
-                client.loop_stop()
+            for task in [self._publishers.pop(protocol_id, None), *self._network_tasks.pop(protocol_id, ())]:
+                if task and not task.done():
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+            queue = self._publish_queues.pop(protocol_id, None)
+            while queue is not None and not queue.empty():
+                future = queue.get_nowait()[-1]
+                if not future.done():
+                    future.set_exception(Exception("Client disconnected"))
+            for future in self._pending_confirms.pop(protocol_id, {}).values():
+                future.cancel()
+            
+            for client in self.clients.pop(protocol_id, ()):
                 client.disconnect()
-                del self.clients[protocol_id]
+            self._rr_idx.pop(protocol_id, None)
             
             if protocol_id in self.active_connections:
                 del self.active_connections[protocol_id]
+            self._release_slot(protocol_id)
+            self._topic_tries.pop(protocol_id, None)
+            self.log_levels.pop(protocol_id, None)
+            
+            await self._flush_log_ring(protocol_id)
+            self._log_ring.pop(protocol_id, None)
             
             if not self.active_connections:
+                if self._log_flush_task and not self._log_flush_task.done():
+                    self._log_flush_task.cancel()
+                    try:
+                        await self._log_flush_task
+                    except asyncio.CancelledError:
+                        pass
+                await self._stop_coarse_clock()
                 await self.stop_monitoring()
             
             await self._log_protocol_event(
@@ -158,6 +456,20 @@ class MqttService(BaseProtocolService):
             username = configuration.get("username")
             password = configuration.get("password")
             
+            # Liveness only needs the broker to accept TCP, the MQTT CONNECT is
+            # only attempted when credentials have to be validated
+            if not configuration.get("fullHandshakeTest", False):
+                try:
+                    _, writer = await asyncio.wait_for(
+                        asyncio.open_connection(broker_host, broker_port),
+                        timeout=configuration.get("testTimeout", 1.0)
+                    )
+                    writer.close()
+                    await writer.wait_closed()
+                    return True
+                except (OSError, asyncio.TimeoutError):
+                    return False
+            
             test_client = mqtt.Client(client_id=f"test_client_{datetime.utcnow().timestamp()}")
             
             if username and password:
@@ -165,7 +477,7 @@ class MqttService(BaseProtocolService):
             
             try:
                 result = await asyncio.to_thread(
-                    test_client.connect, broker_host, broker_port, 10
+                    test_client.connect, await _resolve_host(broker_host, broker_port), broker_port, 10
                 )
                 test_client.disconnect()
                 return result == mqtt.MQTT_ERR_SUCCESS
@@ -182,6 +494,11 @@ class MqttService(BaseProtocolService):
             logger.info(f"MQTT client {protocol_id} connected successfully")
         else:
             logger.error(f"MQTT client {protocol_id} connection failed with code {rc}")
+        
+        # Runs on the event loop thread, the socket is read from there
+        connected = self._connect_events.get((protocol_id, getattr(client, '_pool_slot', 0)))
+        if connected is not None:
+            connected.set()
     
     def _on_disconnect(self, client, userdata, rc):
         """MQTT disconnect callback"""
@@ -190,35 +507,159 @@ class MqttService(BaseProtocolService):
     
     def _on_message(self, client, userdata, msg):
         """MQTT message received callback"""
-        protocol_id = getattr(client, '_protocol_id', 'unknown')
+        protocol_id = client._protocol_id
+        connection = self.active_connections.get(protocol_id)
+        if connection is None:
+            return
         
-        if protocol_id in self.active_connections:
-            connection = self.active_connections[protocol_id]
-            connection["received_messages"] += 1
-            connection["last_activity"] = datetime.utcnow()
-            
-            # Store last message for topic
-            if "last_messages" not in connection:
-                connection["last_messages"] = {}
-            
-            connection["last_messages"][msg.topic] = {
-                "payload": msg.payload.decode('utf-8', errors='ignore'),
-                "qos": msg.qos,
-                "retain": msg.retain,
-                "timestamp": datetime.utcnow()
-            }
+        slot = self._slots[protocol_id]
+        self._recv_counts[slot] += 1
+        self._last_activity[slot] = time.monotonic()
+        
+        # paho decodes msg.topic on every access, so read it once. Interned, repeated
+        # topics share one key object whose hash is already cached.
+        topic = sys.intern(msg.topic)
+        
+        # Count the message against every subscription filter it matched
+        subscribed_topics = connection["subscribed_topics"]
+        for topic_filter in self._topic_tries[protocol_id].match(topic):
+            subscription = subscribed_topics.get(topic_filter)
+            if subscription is not None:
+                subscription["messages_received"] += 1
+        
+        # Store last message for topic, decoded only when it is read. A topic's record and
+        # payload buffer are overwritten in place, so msg is not retained past the callback.
+        last_messages = connection["last_messages"]
+        record = last_messages.get(topic)
+        if record is None:
+            pool = self._payload_pool
+            record = last_messages[topic] = {"payload": pool.pop() if pool else bytearray()}
+            if len(last_messages) > connection["last_messages_max"]:
+                _, evicted = last_messages.popitem(last=False)
+                if len(pool) < _PAYLOAD_POOL_MAX:
+                    pool.append(evicted["payload"])
+        else:
+            last_messages.move_to_end(topic)
+        record["payload"][:] = msg.payload
+        record["qos"] = msg.qos
+        record["retain"] = msg.retain
+        record["timestamp"] = self._coarse_now
     
     def _on_publish(self, client, userdata, mid):
         """MQTT publish callback"""
         protocol_id = getattr(client, '_protocol_id', 'unknown')
-        if protocol_id in self.active_connections:
-            self.active_connections[protocol_id]["published_messages"] += 1
+        slot = self._slots.get(protocol_id)
+        if slot is not None:
+            self._pub_counts[slot] += 1
+        
+        confirms = self._pending_confirms.get(protocol_id)
+        future = confirms.pop((getattr(client, '_pool_slot', 0), mid), None) if confirms else None
+        if future and not future.done():
+            future.set_result(True)
     
     def _on_subscribe(self, client, userdata, mid, granted_qos):
         """MQTT subscribe callback"""
         protocol_id = getattr(client, '_protocol_id', 'unknown')
         logger.info(f"MQTT client {protocol_id} subscription confirmed with QoS {granted_qos}")
     
+    def _queue_event(self, protocol_id: str, level: str, message: str, metadata: Dict = None):
+        """Buffer a protocol event for the next batched write instead of logging it inline"""
+        self._log_ring[protocol_id].append((level, message, metadata, self._coarse_now))
+    
+    async def _flush_log_ring(self, protocol_id: str):
+        """Write out the buffered events of a connection"""
+        ring = self._log_ring.get(protocol_id)
+        if ring:
+            batch = list(ring)
+            ring.clear()
+            await self._log_protocol_events(protocol_id, batch)
+    
+    async def _log_flusher(self):
+        """Write buffered events of all connections every _LOG_FLUSH_INTERVAL"""
+        while True:
+            try:
+                await asyncio.sleep(_LOG_FLUSH_INTERVAL)
+                for protocol_id in list(self._log_ring):
+                    await self._flush_log_ring(protocol_id)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"MQTT log flush error: {e}")
+    
+    async def _network_loop(self, protocol_id: str, client):
+        """Run paho's keepalive and retry housekeeping, reconnecting when the broker drops the client"""
+        while True:
+            try:
+                await asyncio.sleep(1)
+                if client.loop_misc() == mqtt.MQTT_ERR_NO_CONN:
+                    logger.info(f"MQTT client {protocol_id} reconnecting")
+                    await asyncio.to_thread(client.reconnect)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.warning(f"MQTT reconnect failed for {protocol_id}: {e}")
+    
+    async def _publisher(self, protocol_id: str):
+        """Hand queued publishes to paho in batches"""
+        queue = self._publish_queues[protocol_id]
+        pool = self.clients[protocol_id]
+        confirms = self._pending_confirms[protocol_id]
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = []
+            try:
+                batch.append(await queue.get())
+                _drain(queue, batch, _PUBLISH_BATCH_MAX)
+                if len(batch) < _PUBLISH_BATCH_MAX:
+                    # Give concurrent publishers a moment to join the batch
+                    await asyncio.sleep(_PUBLISH_BATCH_WAIT)
+                    _drain(queue, batch, _PUBLISH_BATCH_MAX)
+                
+                # publish() only queues the packet, the socket is written from the event loop
+                offset = self._rr_idx.get(protocol_id, 0)
+                self._rr_idx[protocol_id] = offset + len(batch)
+                results = _publish_batch(pool, offset, batch)
+                for item, (slot, result) in zip(batch, results):
+                    future = item[-1]
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                        continue
+                    # Tracked before on_publish can run, it fires from the event loop
+                    if result.rc == mqtt.MQTT_ERR_SUCCESS:
+                        confirms[(slot, result.mid)] = loop.create_future()
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                for item in batch:
+                    if not item[-1].done():
+                        item[-1].set_exception(Exception("Client disconnected"))
+                break
+            except Exception as e:
+                logger.error(f"MQTT publish batch error for {protocol_id}: {e}")
+                for item in batch:
+                    if not item[-1].done():
+                        item[-1].set_exception(e)
+    
+    async def flush_confirms(self, protocol_id: str, mids: Optional[List[Tuple[int, int]]] = None,
+                             timeout: Optional[float] = None) -> bool:
+        """Wait until the broker has acknowledged the given publishes, or all outstanding ones"""
+        confirms = self._pending_confirms.get(protocol_id)
+        if confirms is None:
+            raise Exception("Client not connected")
+        
+        if mids is None:
+            futures = list(confirms.values())
+        else:
+            # Keys are (pool slot, message id), missing ones have already been acknowledged
+            futures = [confirms[mid] for mid in mids if mid in confirms]
+        if not futures:
+            return True
+        
+        # asyncio.wait leaves the futures alone on timeout, other callers may be waiting on them
+        done, pending = await asyncio.wait(futures, timeout=timeout)
+        return not pending and not any(future.cancelled() for future in done)
+    
     async def read_data_point(self, connection_id: str, data_point_config: Dict[str, Any]) -> Any:
         """Read MQTT topic value (from last received message)"""
         try:
@@ -240,14 +681,14 @@ class MqttService(BaseProtocolService):
                 }
             
             msg_data = last_messages[topic]
-            payload = msg_data["payload"]
+            payload = msg_data["payload"]  # bytearray, reused by the next message on the topic
             
-            # Try to parse JSON payload
+            # Try to parse JSON payload, both JSON backends take the raw bytes
             try:
-                value = json.loads(payload)
+                value = _json_loads(payload)
             except (json.JSONDecodeError, ValueError):
                 # If not JSON, return as string
-                value = payload
+                value = payload.decode('utf-8', errors='ignore')
             
             return {
                 "value": value,
@@ -267,35 +708,35 @@ class MqttService(BaseProtocolService):
             if connection_id not in self.clients:
                 raise Exception("Client not connected")
             
-            client = self.clients[connection_id]
-            connection = self.active_connections[connection_id]
-            
             topic = data_point_config.get("topic", "actuators/valve")
             qos = data_point_config.get("qos", 1)
             retain = data_point_config.get("retain", False)
             
-            # Prepare payload
+            # Prepare payload, JSON goes to paho as bytes without a str round trip
             if isinstance(value, (dict, list)):
-                payload = json.dumps(value)
+                payload = _json_dumps(value)
             else:
                 payload = str(value)
             
-            # Publish message
-            result = await asyncio.to_thread(
-                client.publish, topic, payload, qos, retain
-            )
+            # Publish message, batched with other publishes pending on this connection
+            future = asyncio.get_running_loop().create_future()
+            self._publish_queues[connection_id].put_nowait((topic, payload, qos, retain, future))
+            result = await future
             
             if result.rc != mqtt.MQTT_ERR_SUCCESS:
                 raise Exception(f"Publish failed with code {result.rc}")
             
             # Update statistics
-            connection["last_activity"] = datetime.utcnow()
-            
-            await self._log_protocol_event(
-                connection_id, "info",
-                f"MQTT publish: Topic '{topic}' = {payload}",
-                {"topic": topic, "qos": qos, "retain": retain, "payload_length": len(payload)}
-            )
+            slot = self._slots.get(connection_id)
+            if slot is not None:
+                self._last_activity[slot] = time.monotonic()
+            
+            if self._log_level_enabled(connection_id, "info"):
+                self._queue_event(
+                    connection_id, "info",
+                    f"MQTT publish: Topic '{topic}' = {value}",
+                    {"topic": topic, "qos": qos, "retain": retain, "payload_length": len(payload)}
+                )
             
             return True
             
@@ -312,15 +753,18 @@ class MqttService(BaseProtocolService):
             if connection_id not in self.clients:
                 raise Exception("Client not connected")
             
-            client = self.clients[connection_id]
+            # Subscriptions live on the first pooled client so each message arrives once
+            client = self.clients[connection_id][0]
             connection = self.active_connections[connection_id]
             
-            result = await asyncio.to_thread(client.subscribe, topic, qos)
+            # Non-blocking, the SUBSCRIBE packet is written from the event loop
+            result = client.subscribe(topic, qos)
             
             if result[0] != mqtt.MQTT_ERR_SUCCESS:
                 raise Exception(f"Subscribe failed with code {result[0]}")
             
             # Store subscription info
+            self._topic_tries[connection_id].add(topic)
             connection["subscribed_topics"][topic] = {
                 "qos": qos,
                 "subscribed_at": datetime.utcnow(),
@@ -348,10 +792,10 @@ class MqttService(BaseProtocolService):
             if connection_id not in self.clients:
                 return False
             
-            client = self.clients[connection_id]
+            client = self.clients[connection_id][0]
             connection = self.active_connections[connection_id]
             
-            result = await asyncio.to_thread(client.unsubscribe, topic)
+            result = client.unsubscribe(topic)
             
             if result[0] != mqtt.MQTT_ERR_SUCCESS:
                 raise Exception(f"Unsubscribe failed with code {result[0]}")
@@ -359,6 +803,7 @@ class MqttService(BaseProtocolService):
             # Remove subscription info
             if topic in connection["subscribed_topics"]:
                 del connection["subscribed_topics"][topic]
+            self._topic_tries[connection_id].remove(topic)
             
             await self._log_protocol_event(
                 connection_id, "info",
@@ -1,6 +1,8 @@
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 try:
@@ -14,6 +16,30 @@ from ..base_protocol import BaseProtocolService
 
 logger = logging.getLogger(__name__)
 
+# Default publishing interval in ms of the subscription backing data point reads
+_PUBLISHING_INTERVAL = 100
+# Keepalive periods without any publish response after which notified values are not trusted
+_STALE_KEEPALIVES = 3
+# Default limit of nodes monitored per connection, least recently read ones are dropped
+_MAX_MONITORED_ITEMS = 1000
+
+
+class _DataChangeHandler:
+    """Keeps the latest DataValue the server pushed for each monitored node"""
+    
+    def __init__(self, latest: Dict[Any, Any]):
+        self.latest = latest
+        self.failed = False
+    
+    def datachange_notification(self, node, val, data):
+        self.latest[node] = data.monitored_item.Value
+    
+    def status_change_notification(self, status):
+        # The server reports a subscription timeout or closed session this way
+        self.failed = True
+        self.latest.clear()
+
+
 class OpcUaService(BaseProtocolService):
     """OPC-UA protocol service - Real implementation"""
     
@@ -21,6 +47,15 @@ class OpcUaService(BaseProtocolService):
         super().__init__("opc-ua")
         self.clients: Dict[str, Client] = {}
         self.sessions: Dict[str, Dict] = {}
+        # Node handles by connection and node id string, reused across polls
+        self._node_cache: Dict[str, Dict[str, Node]] = defaultdict(dict)
+        # Read values are served from server-pushed MonitoredItem notifications
+        self._subscriptions: Dict[str, Any] = {}
+        self._handlers: Dict[str, _DataChangeHandler] = {}
+        # Monitored item handles by node, in least recently read order
+        self._monitored: Dict[str, OrderedDict] = {}
+        self._max_monitored: Dict[str, int] = {}
+        self._latest: Dict[str, Dict[Node, Any]] = {}
     
     async def start_protocol(self, protocol_id: str, configuration: Dict[str, Any]) -> bool:
         """Start OPC-UA protocol"""
@@ -58,6 +93,15 @@ class OpcUaService(BaseProtocolService):
             # Store client
             self.clients[protocol_id] = client
             
+            # Nodes are added to the subscription as they are first read
+            if configuration.get("useSubscriptions", True):
+                publishing_interval = configuration.get("publishingInterval", _PUBLISHING_INTERVAL)
+                latest = self._latest[protocol_id] = {}
+                handler = self._handlers[protocol_id] = _DataChangeHandler(latest)
+                self._monitored[protocol_id] = OrderedDict()
+                self._max_monitored[protocol_id] = configuration.get("maxMonitoredItems", _MAX_MONITORED_ITEMS)
+                self._subscriptions[protocol_id] = await client.create_subscription(publishing_interval, handler)
+            
             # Get session info
             session_id = f"session_{protocol_id}"
             self.sessions[session_id] = {
@@ -76,6 +120,7 @@ class OpcUaService(BaseProtocolService):
                 "base_throughput": 2000  # bytes per second estimate
             }
             
+            self._start_coarse_clock()
             await self.start_monitoring()
             await self._log_protocol_event(
                 protocol_id, "info",
@@ -89,6 +134,7 @@ class OpcUaService(BaseProtocolService):
                 protocol_id, "error",
                 f"Failed to start OPC-UA: {str(e)}"
             )
+            self._forget_subscription(protocol_id)
             if protocol_id in self.clients:
                 try:
                     await self.clients[protocol_id].disconnect()
@@ -100,6 +146,13 @@ class OpcUaService(BaseProtocolService):
     async def stop_protocol(self, protocol_id: str) -> bool:
         """Stop OPC-UA protocol"""
         try:
+            subscription = self._forget_subscription(protocol_id)
+            if subscription is not None:
+                try:
+                    await subscription.delete()
+                except Exception as e:
+                    logger.warning(f"Error deleting OPC-UA subscription for {protocol_id}: {e}")
+            
             if protocol_id in self.clients:
                 client = self.clients[protocol_id]
                 await client.disconnect()
@@ -114,7 +167,10 @@ class OpcUaService(BaseProtocolService):
             if protocol_id in self.active_connections:
                 del self.active_connections[protocol_id]
             
+            self._node_cache.pop(protocol_id, None)
+            
             if not self.active_connections:
+                await self._stop_coarse_clock()
                 await self.stop_monitoring()
             
             await self._log_protocol_event(
@@ -150,45 +206,155 @@ class OpcUaService(BaseProtocolService):
         except Exception:
             return False
     
+    def _get_node(self, connection_id: str, node_id: str) -> Node:
+        """Get the cached node handle for a node id"""
+        nodes = self._node_cache[connection_id]
+        node = nodes.get(node_id)
+        if node is None:
+            node = nodes[node_id] = self.clients[connection_id].get_node(node_id)
+        return node
+    
+    @staticmethod
+    def _data_value_result(node_id: str, data_value) -> Dict[str, Any]:
+        """Convert a DataValue into a data point result"""
+        return {
+            "value": data_value.Value.Value if data_value.Value is not None else None,
+            "status_code": data_value.StatusCode.name if data_value.StatusCode else "Good",
+            "source_timestamp": data_value.SourceTimestamp.isoformat() if data_value.SourceTimestamp else datetime.utcnow().isoformat(),
+            "server_timestamp": data_value.ServerTimestamp.isoformat() if data_value.ServerTimestamp else datetime.utcnow().isoformat(),
+            "node_id": node_id
+        }
+    
+    def _forget_subscription(self, connection_id: str):
+        """Drop the subscription state of a connection and return its subscription"""
+        self._handlers.pop(connection_id, None)
+        self._monitored.pop(connection_id, None)
+        self._max_monitored.pop(connection_id, None)
+        self._latest.pop(connection_id, None)
+        return self._subscriptions.pop(connection_id, None)
+    
+    def _subscription_healthy(self, connection_id: str) -> bool:
+        """Check that the server still publishes notifications for the connection"""
+        handler = self._handlers.get(connection_id)
+        if handler is None or handler.failed:
+            return False
+        # The client's publish loop stops when the session is lost
+        publish_task = getattr(self.clients[connection_id].uaclient, "_publish_task", None)
+        if publish_task is not None and publish_task.done():
+            return False
+        
+        # Unchanged values are not notified, but the server answers with a keepalive at least every keepalive period
+        subscription = self._subscriptions[connection_id]
+        last_publish_at = getattr(subscription, "last_publish_at", None)
+        if last_publish_at is None:
+            return True
+        parameters = subscription.parameters
+        keepalive_period = parameters.RequestedPublishingInterval / 1000 * max(parameters.RequestedMaxKeepAliveCount or 1, 1)
+        return time.monotonic() - last_publish_at < max(keepalive_period * _STALE_KEEPALIVES, 1.0)
+    
+    async def _monitor(self, connection_id: str, nodes: List[Node]):
+        """Add nodes to the connection's subscription so later reads are served from notifications"""
+        subscription = self._subscriptions[connection_id]
+        monitored = self._monitored[connection_id]
+        try:
+            handles = await subscription.subscribe_data_change(nodes)
+        except Exception as e:
+            logger.warning(f"Could not monitor OPC-UA nodes on {connection_id}: {e}")
+            return
+        
+        for node, handle in zip(nodes, handles):
+            if isinstance(handle, int):
+                monitored[node] = handle
+        
+        # Unsubscribe the least recently read nodes beyond the limit
+        excess = len(monitored) - self._max_monitored[connection_id]
+        if excess > 0:
+            latest = self._latest[connection_id]
+            dropped = []
+            for _ in range(excess):
+                node, handle = monitored.popitem(last=False)
+                latest.pop(node, None)
+                dropped.append(handle)
+            try:
+                await subscription.unsubscribe(dropped)
+            except Exception as e:
+                logger.warning(f"Could not unsubscribe OPC-UA nodes on {connection_id}: {e}")
+    
+    async def _read_data_values(self, connection_id: str, data_point_configs: List[Dict[str, Any]]) -> Tuple[List[str], list]:
+        """Read the Value attribute of several nodes in a single Read request"""
+        if connection_id not in self.clients:
+            raise Exception("Session not active")
+        
+        client = self.clients[connection_id]
+        connection = self.active_connections[connection_id]
+        
+        node_ids = [config.get("nodeId", "ns=2;i=2") for config in data_point_configs]
+        nodes = [self._get_node(connection_id, node_id) for node_id in node_ids]
+        
+        # Monitored nodes are answered from the latest notification while the subscription is healthy
+        values = {}
+        subscribed = connection_id in self._subscriptions
+        if subscribed:
+            latest = self._latest[connection_id]
+            monitored = self._monitored[connection_id]
+            if self._subscription_healthy(connection_id):
+                for node in nodes:
+                    if node in monitored:
+                        monitored.move_to_end(node)
+                    if node in latest:
+                        values[node] = latest[node]
+            else:
+                # Changes may have been missed, notifications count again once publishing resumes
+                latest.clear()
+                subscribed = False
+        
+        missing = [node for node in dict.fromkeys(nodes) if node not in values]
+        if missing:
+            # Value, status and both timestamps of every node come back in one response
+            read = await client.uaclient.read_attributes([node.nodeid for node in missing], ua.AttributeIds.Value)
+            values.update(zip(missing, read))
+            
+            if subscribed:
+                unmonitored = [node for node in missing if node not in monitored]
+                if unmonitored:
+                    await self._monitor(connection_id, unmonitored)
+                
+                # Serve newly monitored nodes from this read until their first notification
+                for node, data_value in zip(missing, read):
+                    if node in monitored:
+                        latest.setdefault(node, data_value)
+        
+        data_values = [values[node] for node in nodes]
+        
+        # Update connection activity
+        connection["last_activity"] = self._coarse_now
+        
+        return node_ids, data_values
+    
+    async def read_data_points(self, connection_id: str, data_point_configs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Read several OPC-UA node values in a single request"""
+        if not OPCUA_AVAILABLE:
+            raise Exception("OPC-UA library not available")
+        
+        try:
+            node_ids, data_values = await self._read_data_values(connection_id, data_point_configs)
+            return [self._data_value_result(node_id, data_value) for node_id, data_value in zip(node_ids, data_values)]
+            
+        except Exception as e:
+            raise Exception(f"OPC-UA read error: {str(e)}")
+    
     async def read_data_point(self, connection_id: str, data_point_config: Dict[str, Any]) -> Any:
         """Read OPC-UA node value"""
         if not OPCUA_AVAILABLE:
             raise Exception("OPC-UA library not available")
         
         try:
-            if connection_id not in self.clients:
-                raise Exception("Session not active")
-            
-            client = self.clients[connection_id]
-            connection = self.active_connections[connection_id]
-            
-            node_id = data_point_config.get("nodeId", "ns=2;i=2")
-            
-            # Get node
-            node = client.get_node(node_id)
-            
-            # Read value
-            value = await node.read_value()
+            node_ids, data_values = await self._read_data_values(connection_id, [data_point_config])
             
-            # Read additional attributes
-            status_code = await node.read_attribute(ua.AttributeIds.StatusCode)
-            source_timestamp = await node.read_attribute(ua.AttributeIds.SourceTimestamp)
-            server_timestamp = await node.read_attribute(ua.AttributeIds.ServerTimestamp)
+            # A single point read raises on a bad status, like Node.read_data_value
+            data_values[0].StatusCode.check()
             
-            # Update connection activity
-            connection["last_activity"] = datetime.utcnow()
-            
-            # Convert OPC-UA types to Python types
-            if hasattr(value, 'Value'):
-                value = value.Value
-            
-            return {
-                "value": value,
-                "status_code": str(status_code.Value) if hasattr(status_code, 'Value') else "Good",
-                "source_timestamp": source_timestamp.Value.isoformat() if hasattr(source_timestamp, 'Value') and source_timestamp.Value else datetime.utcnow().isoformat(),
-                "server_timestamp": server_timestamp.Value.isoformat() if hasattr(server_timestamp, 'Value') and server_timestamp.Value else datetime.utcnow().isoformat(),
-                "node_id": node_id
-            }
+            return self._data_value_result(node_ids[0], data_values[0])
             
         except Exception as e:
             raise Exception(f"OPC-UA read error: {str(e)}")
@@ -202,19 +368,21 @@ class OpcUaService(BaseProtocolService):
             if connection_id not in self.clients:
                 raise Exception("Session not active")
             
-            client = self.clients[connection_id]
             connection = self.active_connections[connection_id]
             
             node_id = data_point_config.get("nodeId", "ns=2;i=2")
             
             # Get node
-            node = client.get_node(node_id)
+            node = self._get_node(connection_id, node_id)
             
             # Write value
             await node.write_value(value)
             
+            # Read the node from the server until the change is notified
+            self._latest.get(connection_id, {}).pop(node, None)
+            
             # Update connection activity
-            connection["last_activity"] = datetime.utcnow()
+            connection["last_activity"] = self._coarse_now
             
             await self._log_protocol_event(
                 connection_id, "info",
@@ -231,6 +399,32 @@ class OpcUaService(BaseProtocolService):
             )
             return False
     
+    @staticmethod
+    async def _describe_node(node: Node) -> Dict[str, Any]:
+        """Read the browse attributes of a node in a single Read request"""
+        browse_name, display_name, node_class, data_type, access_level = await node.read_attributes([
+            ua.AttributeIds.BrowseName,
+            ua.AttributeIds.DisplayName,
+            ua.AttributeIds.NodeClass,
+            ua.AttributeIds.DataType,
+            ua.AttributeIds.AccessLevel
+        ])
+        node_class = ua.NodeClass(node_class.Value.Value)
+        
+        # DataType and AccessLevel only carry a good status for variables
+        is_variable = node_class == ua.NodeClass.Variable
+        data_type = data_type.Value.Value if is_variable and data_type.StatusCode.is_good() else None
+        access_level = access_level.Value.Value if is_variable and access_level.StatusCode.is_good() else None
+        
+        return {
+            "node_id": node.nodeid.to_string(),
+            "browse_name": browse_name.Value.Value.Name,
+            "display_name": display_name.Value.Value.Text,
+            "node_class": node_class.name,
+            "data_type": data_type.to_string() if data_type else None,
+            "access_level": access_level
+        }
+    
     async def browse_nodes(self, connection_id: str, node_id: str = None) -> List[Dict]:
         """Browse OPC-UA nodes"""
         if not OPCUA_AVAILABLE:
@@ -246,40 +440,20 @@ class OpcUaService(BaseProtocolService):
             if node_id is None:
                 node = client.get_root_node()
             else:
-                node = client.get_node(node_id)
+                node = self._get_node(connection_id, node_id)
             
             # Browse children
             children = await node.get_children()
             
+            # One Read per child, all children in flight at once
+            described = await asyncio.gather(*[self._describe_node(child) for child in children], return_exceptions=True)
+            
             result = []
-            for child in children:
-                try:
-                    # Get node attributes
-                    browse_name = await child.read_browse_name()
-                    display_name = await child.read_display_name()
-                    node_class = await child.read_node_class()
-                    data_type = None
-                    access_level = None
-                    
-                    # Get additional info for variables
-                    if node_class == ua.NodeClass.Variable:
-                        try:
-                            data_type = await child.read_data_type()
-                            access_level = await child.read_attribute(ua.AttributeIds.AccessLevel)
-                        except:
-                            pass
-                    
-                    result.append({
-                        "node_id": child.nodeid.to_string(),
-                        "browse_name": browse_name.Name,
-                        "display_name": display_name.Text,
-                        "node_class": node_class.name,
-                        "data_type": data_type.to_string() if data_type else None,
-                        "access_level": access_level.Value if hasattr(access_level, 'Value') else None
-                    })
-                except Exception as e:
-                    logger.warning(f"Error reading node attributes: {e}")
+            for entry in described:
+                if isinstance(entry, Exception):
+                    logger.warning(f"Error reading node attributes: {entry}")
                     continue
+                result.append(entry)
             
             return result
             
@@ -1,10 +1,18 @@
+import array
 import asyncio
+import ctypes
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import struct
+import time
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
 
 try:
     import snap7
+    from snap7.types import S7DataItem
     from snap7.util import *
     PROFINET_AVAILABLE = True
 except ImportError:
@@ -14,13 +22,351 @@ from ..base_protocol import BaseProtocolService
 
 logger = logging.getLogger(__name__)
 
+# Slots of the per-connection stats array
+_READS = 0
+_WRITES = 1
+_LAST_ACTIVITY = 2  # time.monotonic_ns()
+
+# S7 area codes and the byte word length used in multi-variable reads
+_AREA_CODES = {"PE": 0x81, "PA": 0x82, "MK": 0x83, "DB": 0x84}
+_S7_WL_BYTE = 0x02
+_AREA_READERS = {
+    "DB": lambda client, db_number, start, size: client.db_read(db_number, start, size),
+    "MK": lambda client, db_number, start, size: client.mb_read(start, size),
+    "PE": lambda client, db_number, start, size: client.eb_read(start, size),
+    "PA": lambda client, db_number, start, size: client.ab_read(start, size),
+}
+_AREA_WRITERS = {
+    "DB": lambda client, db_number, start, data: client.db_write(db_number, start, data),
+    "MK": lambda client, db_number, start, data: client.mb_write(start, data),
+    "PE": lambda client, db_number, start, data: client.eb_write(start, data),
+    "PA": lambda client, db_number, start, data: client.ab_write(start, data),
+}
+
+# Big-endian element formats of the array write path
+_ARRAY_FORMATS = {"REAL": "f", "DINT": "i", "INT": "h", "WORD": "H", "DWORD": "I"}
+
+_UNPACK_WORD = struct.Struct(">H").unpack_from
+_UNPACK_DWORD = struct.Struct(">I").unpack_from
+_UNPACK_INT = struct.Struct(">h").unpack_from
+_UNPACK_DINT = struct.Struct(">i").unpack_from
+_UNPACK_REAL = struct.Struct(">f").unpack_from
+
+# Struct codes of the types decoded together from one range with a single unpack
+_BATCH_CODES = {"BYTE": "B", "WORD": "H", "DWORD": "I", "INT": "h", "DINT": "i", "REAL": "f"}
+
+# Decoders by data type, reading a data point at an offset into a read buffer
+_DECODERS = {
+    "BOOL": lambda data, offset, config: bool(data[offset] >> config.get("bit", 0) & 1),
+    "BYTE": lambda data, offset, config: data[offset],
+    "WORD": lambda data, offset, config: _UNPACK_WORD(data, offset)[0],
+    "DWORD": lambda data, offset, config: _UNPACK_DWORD(data, offset)[0],
+    "INT": lambda data, offset, config: _UNPACK_INT(data, offset)[0],
+    "DINT": lambda data, offset, config: _UNPACK_DINT(data, offset)[0],
+    "REAL": lambda data, offset, config: _UNPACK_REAL(data, offset)[0],
+    "STRING": lambda data, offset, config: get_string(
+        data, offset, config.get("maxLength", config.get("size", 4) - 2)
+    ),
+}
+
+
+def _decode_raw(data: bytearray, offset: int, config: Dict[str, Any]) -> str:
+    """Return the bytes of a data point of unknown type as hex"""
+    return data[offset:offset + config.get("size", 4)].hex()
+
+
+# Ranges of the same area separated by at most this many bytes are read as one
+_MERGE_GAP = 5
+# Minimum PDU every S7 CPU negotiates
+_DEFAULT_PDU_LENGTH = 240
+# Outstanding requests a CPU family handles well, matched on its module type name
+_PARALLEL_BY_CPU = (("CPU 15", 8), ("CPU 12", 4))
+# Per-client write buffer, large enough for the longest S7 string
+_SCRATCH_SIZE = 256
+# Seconds a byte read for a BOOL write is trusted for later bit writes to the same byte
+_BIT_CACHE_TTL = 1.0
+# Seconds a test_connection client stays connected for reuse by later probes
+_PROBE_CLIENT_TTL = 60
+# Consecutive failed reads that open a connection's circuit, and how long it stays open
+_BREAKER_FAILURES = 3
+_BREAKER_OPEN_SECONDS = 5.0
+# Seconds between info events for successful writes; writes in between are counted
+_WRITE_LOG_INTERVAL = 1.0
+# Number of read plans kept per service, keyed by the item set they were built for
+_PLAN_CACHE_SIZE = 256
+# Snap7 accepts at most 20 items in a multi-variable read
+_MAX_MULTI_VARS = 20
+# Response bytes of the first item of a read and of each additional item
+_READ_OVERHEAD = 18
+_READ_ITEM_OVERHEAD = 6
+# Request bytes of the read header and of each item
+_REQUEST_OVERHEAD = 12
+_REQUEST_ITEM_SIZE = 12
+
+
+def _plan_reads(items: List[tuple], pdu_length: int, merge_gap: int = _MERGE_GAP) -> List[list]:
+    """Merge (area, db_number, start, size) items into ranges and pack the ranges into PDU-sized packets.
+    
+    Returns packets of [area, db_number, start, size, [(item_index, offset), ...]] ranges.
+    """
+    max_data = pdu_length - _READ_OVERHEAD
+    by_block = defaultdict(list)
+    for i, (area, db_number, start, size) in enumerate(items):
+        by_block[(area, db_number)].append((start, size, i))
+    
+    ranges = []
+    for (area, db_number), block in by_block.items():
+        block.sort()
+        current = None
+        for start, size, i in block:
+            if current is not None:
+                end = current[2] + current[3]
+                merged_size = max(end, start + size) - current[2]
+                if start - end <= merge_gap and merged_size <= max_data:
+                    current[3] = merged_size
+                    current[4].append((i, start - current[2]))
+                    continue
+            current = [area, db_number, start, size, [(i, 0)]]
+            ranges.append(current)
+    
+    # A range too large for one response goes out alone and snap7 splits it
+    max_items = min(_MAX_MULTI_VARS, (pdu_length - _REQUEST_OVERHEAD) // _REQUEST_ITEM_SIZE)
+    packets = []
+    packet = []
+    used = 0
+    for read_range in ranges:
+        cost = read_range[3] + (_READ_ITEM_OVERHEAD if packet else _READ_OVERHEAD)
+        if packet and (len(packet) >= max_items or used + cost > pdu_length):
+            packets.append(packet)
+            packet = []
+            cost = read_range[3] + _READ_OVERHEAD
+            used = 0
+        packet.append(read_range)
+        used += cost
+    if packet:
+        packets.append(packet)
+    return packets
+
+
+def _decode_layout(members: List[tuple], items: List[tuple], data_types: List[str]) -> tuple:
+    """Build one struct covering the numeric items of a merged range
+    
+    Returns (unpack_from or None, item indexes it yields values for, members decoded one by one).
+    """
+    fmt = ">"
+    cursor = 0
+    batch = []
+    fallback = []
+    for item_index, offset in sorted(members, key=lambda member: member[1]):
+        code = _BATCH_CODES.get(data_types[item_index])
+        width = struct.calcsize(">" + code) if code else 0
+        # Overlapping items and items narrower than their type are decoded on their own
+        if code is None or offset < cursor or width > items[item_index][3]:
+            fallback.append((item_index, offset))
+            continue
+        if offset > cursor:
+            fmt += f"{offset - cursor}x"
+        fmt += code
+        cursor = offset + width
+        batch.append(item_index)
+    unpack = struct.Struct(fmt).unpack_from if batch else None
+    return unpack, batch, fallback
+
+
+def _max_parallel(module_type_name: str) -> int:
+    """Estimate how many requests can be outstanding against a CPU"""
+    for prefix, max_parallel in _PARALLEL_BY_CPU:
+        if module_type_name.startswith(prefix):
+            return max_parallel
+    return 1
+
+
+class _LinkError(Exception):
+    """A read that failed on the connection rather than on a single item"""
+
+
+def _read_packet(client, packet: list) -> list:
+    """Read the ranges of one packet, returning a bytearray or exception per range"""
+    if len(packet) == 1:
+        area, db_number, start, size = packet[0][:4]
+        try:
+            return [_AREA_READERS[area](client, db_number, start, size)]
+        except Exception as e:
+            # snap7 prefixes errors the CPU returned for the item itself with "CPU"
+            if str(e).strip().startswith("CPU"):
+                return [e]
+            return [_LinkError(str(e))]
+    
+    items = (S7DataItem * len(packet))()
+    buffers = []
+    for item, read_range in zip(items, packet):
+        area, db_number, start, size = read_range[:4]
+        buffer = ctypes.create_string_buffer(size)
+        item.Area = _AREA_CODES[area]
+        item.WordLen = _S7_WL_BYTE
+        item.DBNumber = db_number
+        item.Start = start
+        item.Amount = size
+        item.pData = ctypes.cast(buffer, ctypes.POINTER(ctypes.c_uint8))
+        buffers.append(buffer)
+    
+    try:
+        client.read_multi_vars(items)
+    except Exception as e:
+        return [_LinkError(str(e))] * len(packet)
+    
+    return [
+        bytearray(buffer.raw) if item.Result == 0 else Exception(f"S7 item error 0x{item.Result:x}")
+        for item, buffer in zip(items, buffers)
+    ]
+
+
+def _read_packets(client, packets: List[list]) -> List[list]:
+    """Read all packets back to back in one worker thread call"""
+    return [_read_packet(client, packet) for packet in packets]
+
 class ProfinetService(BaseProtocolService):
     """Profinet protocol service - Real implementation using snap7"""
     
     def __init__(self):
         super().__init__("profinet")
-        self.clients: Dict[str, snap7.client.Client] = {}
+        self.clients: Dict[str, List[snap7.client.Client]] = {}
+        # Idle clients of each PLC; a client is used by one call at a time
+        self.pools: Dict[str, asyncio.Queue] = {}
         self.device_info: Dict[str, Dict] = {}
+        self._stats: Dict[str, array.array] = {}
+        # Per connection: [monotonic time the next write event may be logged, writes not logged since]
+        self._write_log_state: Dict[str, list] = defaultdict(lambda: [0.0, 0])
+        # Read circuit breaker per connection: [consecutive failures, open until (monotonic), 0 when closed]
+        self._breakers: Dict[str, list] = {}
+        self._read_plans: OrderedDict = OrderedDict()
+        # Reusable write buffers, one per pooled client so concurrent writes never share one
+        self._scratch: Dict[Any, bytearray] = {}
+        # Last written byte of BOOL writes per connection, keyed by (area, db_number, start)
+        self._bit_cache: Dict[str, Dict[tuple, tuple]] = defaultdict(dict)
+        # Connected test_connection clients and when they connected, keyed by "ip:rack:slot:port"
+        self._probe_clients: Dict[str, Tuple[Any, float]] = {}
+        self._probe_reaper: Optional[asyncio.Task] = None
+        # One worker thread per pooled client of a PLC
+        self.executors: Dict[str, ThreadPoolExecutor] = {}
+    
+    async def _run(self, protocol_id: str, func, *args):
+        """Run a blocking snap7 call on the worker threads of a PLC"""
+        return await asyncio.get_running_loop().run_in_executor(self.executors[protocol_id], func, *args)
+    
+    @asynccontextmanager
+    async def _acquire(self, protocol_id: str):
+        """Borrow an idle client of a PLC, waiting for one if all are busy"""
+        pool = self.pools[protocol_id]
+        client = await pool.get()
+        try:
+            yield client
+        finally:
+            pool.put_nowait(client)
+    
+    def _invalidate_bits(self, protocol_id: str, area: str, db_number: int, start: int, size: int):
+        """Forget cached BOOL bytes covered by a wider write"""
+        cache = self._bit_cache.get(protocol_id)
+        if cache:
+            for offset in range(start, start + size):
+                cache.pop((area, db_number, offset), None)
+    
+    async def _connect_client(self, protocol_id: str, ip_address: str, rack: int, slot: int, port: int,
+                              connection_type: str) -> "snap7.client.Client":
+        """Create an S7 client and connect it to the PLC"""
+        client = snap7.client.Client()
+        
+        # Configure connection type
+        if connection_type == "PG":
+            client.set_connection_type(0x01)  # PG connection
+        elif connection_type == "OP":
+            client.set_connection_type(0x02)  # OP connection
+        else:
+            client.set_connection_type(0x03)  # S7 Basic connection
+        
+        # Set connection parameters
+        client.set_connection_params(ip_address, 0x100, 0x200)  # Local/Remote TSAP
+        
+        try:
+            await self._run(protocol_id, client.connect, ip_address, rack, slot, port)
+            if not client.get_connected():
+                raise Exception("Failed to establish connection")
+        except Exception:
+            client.disconnect()
+            raise
+        return client
+    
+    def _get_read_plan(self, items: List[tuple], data_types: List[str], pdu_length: int) -> List[list]:
+        """Return the packets for an item set, reusing the plan of earlier scans of the same items
+        
+        Each range of the plan carries the decode layout of its items as a sixth element.
+        """
+        key = (pdu_length, tuple(items), tuple(data_types))
+        packets = self._read_plans.get(key)
+        if packets is None:
+            packets = _plan_reads(items, pdu_length)
+            for packet in packets:
+                for read_range in packet:
+                    read_range.append(_decode_layout(read_range[4], items, data_types))
+            self._read_plans[key] = packets
+            if len(self._read_plans) > _PLAN_CACHE_SIZE:
+                self._read_plans.popitem(last=False)
+        else:
+            self._read_plans.move_to_end(key)
+        return packets
+    
+    def _breaker_allows(self, protocol_id: str) -> bool:
+        """Check the read circuit, letting a single probe through once its open period ends"""
+        breaker = self._breakers[protocol_id]
+        if not breaker[1]:
+            return True
+        now = time.monotonic()
+        if now < breaker[1]:
+            return False
+        # Half open: this read probes the PLC while the others keep failing fast
+        breaker[1] = now + _BREAKER_OPEN_SECONDS
+        return True
+    
+    def _breaker_record(self, protocol_id: str, ok: bool) -> bool:
+        """Record the outcome of a read, returning True when the circuit just opened"""
+        breaker = self._breakers[protocol_id]
+        if ok:
+            breaker[0] = 0
+            breaker[1] = 0
+            return False
+        breaker[0] += 1
+        if breaker[0] >= _BREAKER_FAILURES:
+            breaker[1] = time.monotonic() + _BREAKER_OPEN_SECONDS
+            return breaker[0] == _BREAKER_FAILURES
+        return False
+    
+    def _sample_write_log(self, protocol_id: str) -> Optional[int]:
+        """Admit one successful-write event per interval, returning how many writes were skipped before it"""
+        if not self._log_level_enabled(protocol_id, "info"):
+            return None
+        state = self._write_log_state[protocol_id]
+        now = time.monotonic()
+        if now < state[0]:
+            state[1] += 1
+            return None
+        skipped = state[1]
+        state[0] = now + _WRITE_LOG_INTERVAL
+        state[1] = 0
+        return skipped
+    
+    async def get_connection_info(self, protocol_id: str) -> Optional[Dict[str, Any]]:
+        """Get connection information, with the counters materialized from the stats array"""
+        info = self.active_connections.get(protocol_id)
+        stats = self._stats.get(protocol_id)
+        if info is None or stats is None:
+            return info
+        idle_ns = time.monotonic_ns() - stats[_LAST_ACTIVITY]
+        return {
+            **info,
+            "db_reads": stats[_READS],
+            "db_writes": stats[_WRITES],
+            "last_activity": datetime.utcnow() - timedelta(microseconds=idle_ns / 1000)
+        }
     
     async def start_protocol(self, protocol_id: str, configuration: Dict[str, Any]) -> bool:
         """Start Profinet protocol"""
@@ -35,6 +381,7 @@ class ProfinetService(BaseProtocolService):
             port = configuration.get("port", 102)
             device_name = configuration.get("deviceName", "PLC-Device")
             connection_type = configuration.get("connectionType", "PG")  # PG, OP, or S7_BASIC
+            self._set_log_level(protocol_id, configuration)
             
             await self._log_protocol_event(
                 protocol_id, "info",
@@ -42,31 +389,19 @@ class ProfinetService(BaseProtocolService):
                 {"device_name": device_name, "ip_address": ip_address, "rack": rack, "slot": slot}
             )
             
-            # Create S7 client
-            client = snap7.client.Client()
-            
-            # Configure connection type
-            if connection_type == "PG":
-                client.set_connection_type(0x01)  # PG connection
-            elif connection_type == "OP":
-                client.set_connection_type(0x02)  # OP connection
-            else:
-                client.set_connection_type(0x03)  # S7 Basic connection
-            
-            # Set connection parameters
-            client.set_connection_params(ip_address, 0x100, 0x200)  # Local/Remote TSAP
+            pool_size = max(1, configuration.get("poolSize", 2))
+            self.executors[protocol_id] = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix=f"s7-{protocol_id}")
+            clients = []
             
             try:
                 # Connect to PLC
-                await asyncio.to_thread(client.connect, ip_address, rack, slot, port)
-                
-                if not client.get_connected():
-                    raise Exception("Failed to establish connection")
+                client = await self._connect_client(protocol_id, ip_address, rack, slot, port, connection_type)
+                clients.append(client)
                 
                 # Get PLC information
                 cpu_info = {}
                 try:
-                    cpu_info_raw = await asyncio.to_thread(client.get_cpu_info)
+                    cpu_info_raw = await self._run(protocol_id, client.get_cpu_info)
                     if cpu_info_raw:
                         cpu_info = {
                             "module_type_name": cpu_info_raw.ModuleTypeName.decode('utf-8', errors='ignore'),
@@ -79,20 +414,47 @@ class ProfinetService(BaseProtocolService):
                     logger.warning(f"Could not get CPU info: {e}")
                     cpu_info = {"status": "connected", "info": "Limited device info"}
                 
-                # Store client and device info
-                self.clients[protocol_id] = client
+                # PDU size negotiated during connect, used to size batched reads
+                try:
+                    pdu_length = await self._run(protocol_id, client.get_pdu_length)
+                except Exception as e:
+                    logger.warning(f"Could not get PDU length: {e}")
+                    pdu_length = _DEFAULT_PDU_LENGTH
+                
+                # Open the rest of the pool, up to what the CPU handles in parallel
+                max_parallel = configuration.get("maxParallel") or _max_parallel(cpu_info.get("module_type_name", ""))
+                extra = await asyncio.gather(*(
+                    self._connect_client(protocol_id, ip_address, rack, slot, port, connection_type)
+                    for _ in range(min(pool_size, max_parallel) - 1)
+                ), return_exceptions=True)
+                for result in extra:
+                    if isinstance(result, Exception):
+                        logger.warning(f"Could not open pooled Profinet connection: {result}")
+                    else:
+                        clients.append(result)
+                
+                # Store clients and device info
+                pool = asyncio.Queue()
+                for pooled_client in clients:
+                    pool.put_nowait(pooled_client)
+                self.clients[protocol_id] = clients
+                self.pools[protocol_id] = pool
                 self.device_info[protocol_id] = {
                     "device_name": device_name,
                     "ip_address": ip_address,
                     "rack": rack,
                     "slot": slot,
+                    "port": port,
                     "cpu_info": cpu_info,
-                    "connection_type": connection_type
+                    "connection_type": connection_type,
+                    "pdu_length": pdu_length
                 }
                 
             except Exception as e:
                 logger.error(f"Profinet connection failed: {e}")
-                client.disconnect()
+                for pooled_client in clients:
+                    pooled_client.disconnect()
+                self.executors.pop(protocol_id).shutdown(wait=False)
                 return False
             
             # Store connection info
@@ -105,11 +467,12 @@ class ProfinetService(BaseProtocolService):
                 "connection_type": connection_type,
                 "status": "connected",
                 "cpu_info": cpu_info,
-                "last_activity": datetime.utcnow(),
-                "db_reads": 0,
-                "db_writes": 0,
+                "max_parallel": max_parallel,
+                "pool_size": len(clients),
                 "base_throughput": 8000  # bytes per second estimate
             }
+            self._stats[protocol_id] = array.array('Q', [0, 0, time.monotonic_ns()])
+            self._breakers[protocol_id] = [0, 0]
             
             await self.start_monitoring()
             await self._log_protocol_event(
@@ -130,19 +493,27 @@ class ProfinetService(BaseProtocolService):
         """Stop Profinet protocol"""
         try:
             if protocol_id in self.clients:
-                client = self.clients[protocol_id]
-                try:
-                    await asyncio.to_thread(client.disconnect)
-                except Exception as e:
-                    logger.warning(f"Error disconnecting Profinet client: {e}")
+                for client in self.clients[protocol_id]:
+                    try:
+                        await self._run(protocol_id, client.disconnect)
+                    except Exception as e:
+                        logger.warning(f"Error disconnecting Profinet client: {e}")
                 
-                del self.clients[protocol_id]
+                for client in self.clients.pop(protocol_id):
+                    self._scratch.pop(client, None)
+                del self.pools[protocol_id]
+                self._bit_cache.pop(protocol_id, None)
+                self.executors.pop(protocol_id).shutdown(wait=False)
             
             if protocol_id in self.device_info:
                 del self.device_info[protocol_id]
             
             if protocol_id in self.active_connections:
                 del self.active_connections[protocol_id]
+            self._stats.pop(protocol_id, None)
+            self._breakers.pop(protocol_id, None)
+            self._write_log_state.pop(protocol_id, None)
+            self.log_levels.pop(protocol_id, None)
             
             if not self.active_connections:
                 await self.stop_monitoring()
@@ -161,6 +532,46 @@ class ProfinetService(BaseProtocolService):
             )
             return False
     
+    async def stop_monitoring(self):
+        """Stop monitoring and close the test_connection clients"""
+        await super().stop_monitoring()
+        await self._close_probe_clients()
+    
+    async def _reap_probe_clients(self):
+        """Disconnect test_connection clients as their reuse window ends"""
+        try:
+            while self._probe_clients:
+                expires_at = min(connected_at for _, connected_at in self._probe_clients.values()) + _PROBE_CLIENT_TTL
+                await asyncio.sleep(max(expires_at - time.monotonic(), 0))
+                
+                now = time.monotonic()
+                for key, (probe_client, connected_at) in list(self._probe_clients.items()):
+                    if now - connected_at >= _PROBE_CLIENT_TTL:
+                        del self._probe_clients[key]
+                        try:
+                            await asyncio.to_thread(probe_client.disconnect)
+                        except Exception as e:
+                            logger.warning(f"Error disconnecting Profinet probe client: {e}")
+        finally:
+            self._probe_reaper = None
+    
+    async def _close_probe_clients(self):
+        """Disconnect all test_connection clients and stop their reaper"""
+        if self._probe_reaper is not None:
+            self._probe_reaper.cancel()
+            try:
+                await self._probe_reaper
+            except asyncio.CancelledError:
+                pass
+            self._probe_reaper = None
+        
+        probe_clients, self._probe_clients = self._probe_clients, {}
+        for probe_client, _ in probe_clients.values():
+            try:
+                await asyncio.to_thread(probe_client.disconnect)
+            except Exception as e:
+                logger.warning(f"Error disconnecting Profinet probe client: {e}")
+    
     async def test_connection(self, address: str, configuration: Dict[str, Any]) -> bool:
         """Test Profinet connection"""
         if not PROFINET_AVAILABLE:
@@ -172,12 +583,33 @@ class ProfinetService(BaseProtocolService):
             slot = configuration.get("slot", 1)
             port = configuration.get("port", 102)
             
+            probe_key = f"{ip_address}:{rack}:{slot}:{port}"
+            
+            # get_connected() is only a local flag, so a reused client must answer a request
+            cached = self._probe_clients.get(probe_key)
+            if cached is not None:
+                try:
+                    await asyncio.to_thread(cached[0].get_cpu_state)
+                    return True
+                except Exception:
+                    if self._probe_clients.get(probe_key) is cached:
+                        del self._probe_clients[probe_key]
+                    try:
+                        await asyncio.to_thread(cached[0].disconnect)
+                    except Exception:
+                        pass
+            
             test_client = snap7.client.Client()
             
             try:
-                test_client.connect(ip_address, rack, slot, port)
+                await asyncio.to_thread(test_client.connect, ip_address, rack, slot, port)
                 connected = test_client.get_connected()
-                test_client.disconnect()
+                if connected:
+                    self._probe_clients[probe_key] = (test_client, time.monotonic())
+                    if self._probe_reaper is None:
+                        self._probe_reaper = asyncio.create_task(self._reap_probe_clients())
+                else:
+                    test_client.disconnect()
                 return connected
             except Exception:
                 try:
@@ -189,170 +621,253 @@ class ProfinetService(BaseProtocolService):
         except Exception:
             return False
     
-    async def read_data_point(self, connection_id: str, data_point_config: Dict[str, Any]) -> Any:
-        """Read Profinet data block"""
-        if not PROFINET_AVAILABLE:
-            raise Exception("Profinet library not available")
+    async def read_data_points(self, connection_id: str, data_point_configs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Read several data points, merging nearby ranges into multi-variable requests
         
+        Returns columns in the order of the configs: "values", a "status" bitmap with bit i set
+        when item i was read, "errors" by index, "raw" hex by index for includeRaw items, and
+        one "timestamp_ns" (time.time_ns()) for the whole batch.
+        """
         try:
             if connection_id not in self.clients:
                 raise Exception("Profinet client not connected")
             
-            client = self.clients[connection_id]
-            connection = self.active_connections[connection_id]
-            
-            area = data_point_config.get("area", "DB")  # DB, MK, PE, PA, CT, TM
-            db_number = data_point_config.get("dbNumber", 1)
-            start = data_point_config.get("start", 0)
-            size = data_point_config.get("size", 4)
-            data_type = data_point_config.get("dataType", "REAL")
-            
-            # Read data based on area
-            if area == "DB":
-                # Data Block
-                data = await asyncio.to_thread(client.db_read, db_number, start, size)
-            elif area == "MK":
-                # Merker (Memory)
-                data = await asyncio.to_thread(client.mb_read, start, size)
-            elif area == "PE":
-                # Process Input
-                data = await asyncio.to_thread(client.eb_read, start, size)
-            elif area == "PA":
-                # Process Output
-                data = await asyncio.to_thread(client.ab_read, start, size)
-            else:
-                raise Exception(f"Unsupported area: {area}")
-            
-            # Convert data based on type
-            if data_type == "BOOL":
-                bit = data_point_config.get("bit", 0)
-                value = get_bool(data, 0, bit)
-            elif data_type == "BYTE":
-                value = get_int(data, 0)
-            elif data_type == "WORD":
-                value = get_word(data, 0)
-            elif data_type == "DWORD":
-                value = get_dword(data, 0)
-            elif data_type == "INT":
-                value = get_int(data, 0)
-            elif data_type == "DINT":
-                value = get_dint(data, 0)
-            elif data_type == "REAL":
-                value = get_real(data, 0)
-            elif data_type == "STRING":
-                max_len = data_point_config.get("maxLength", size - 2)
-                value = get_string(data, 0, max_len)
-            else:
-                # Return raw bytes
-                value = data.hex()
+            stats = self._stats[connection_id]
+            
+            count = len(data_point_configs)
+            values: List[Any] = [None] * count
+            status = bytearray((count + 7) // 8)
+            errors: Dict[int, str] = {}
+            raw: Dict[int, str] = {}
+            items = []
+            data_types = []
+            item_configs = []
+            for i, config in enumerate(data_point_configs):
+                area = config.get("area", "DB")  # DB, MK, PE, PA, CT, TM
+                if area not in _AREA_CODES:
+                    errors[i] = f"Unsupported area: {area}"
+                    continue
+                db_number = config.get("dbNumber", 1) if area == "DB" else 0
+                items.append((area, db_number, config.get("start", 0), config.get("size", 4)))
+                data_types.append(config.get("dataType", "REAL"))
+                item_configs.append(i)
+            
+            result = {"values": values, "status": status, "errors": errors, "raw": raw,
+                      "timestamp_ns": time.time_ns()}
+            
+            if items and not self._breaker_allows(connection_id):
+                for i in item_configs:
+                    errors[i] = "PLC unreachable, reads paused"
+                return result
+            
+            packets = self._get_read_plan(items, data_types, self.device_info[connection_id]["pdu_length"])
+            # Spread the packets over the pooled clients
+            workers = min(len(self.clients[connection_id]), len(packets))
+            packet_data = [None] * len(packets)
+            if workers:
+                try:
+                    groups = await asyncio.gather(*(
+                        self._read_group(connection_id, packets[k::workers]) for k in range(workers)
+                    ))
+                except Exception:
+                    await self._record_read(connection_id, False)
+                    raise
+                for k, group_data in enumerate(groups):
+                    packet_data[k::workers] = group_data
+                
+                # Errors of single items do not mean the PLC is unreachable
+                ok = not any(
+                    isinstance(data, _LinkError)
+                    for range_data in packet_data for data in range_data
+                )
+                await self._record_read(connection_id, ok)
+            
+            for packet, range_data in zip(packets, packet_data):
+                for read_range, data in zip(packet, range_data):
+                    members, (unpack, batch, fallback) = read_range[4:]
+                    if isinstance(data, Exception):
+                        for item_index, _ in members:
+                            errors[item_configs[item_index]] = str(data)
+                        continue
+                    
+                    # Numeric items come out of one unpack, the rest through their decoders
+                    decoded = []
+                    if unpack is not None:
+                        try:
+                            decoded.extend(zip(batch, unpack(data)))
+                        except Exception as e:
+                            for item_index in batch:
+                                errors[item_configs[item_index]] = str(e)
+                    for item_index, offset in fallback:
+                        config = data_point_configs[item_configs[item_index]]
+                        try:
+                            decoded.append((item_index, _DECODERS.get(data_types[item_index], _decode_raw)(data, offset, config)))
+                        except Exception as e:
+                            errors[item_configs[item_index]] = str(e)
+                    
+                    offsets = None
+                    for item_index, value in decoded:
+                        i = item_configs[item_index]
+                        values[i] = value
+                        status[i >> 3] |= 1 << (i & 7)
+                        if data_point_configs[i].get("includeRaw"):
+                            offsets = offsets or dict(members)
+                            offset = offsets[item_index]
+                            raw[i] = data[offset:offset + items[item_index][3]].hex()
             
             # Update statistics
-            connection["db_reads"] += 1
-            connection["last_activity"] = datetime.utcnow()
+            stats[_READS] += len(items)
+            stats[_LAST_ACTIVITY] = time.monotonic_ns()
             
-            return {
-                "value": value,
-                "area": area,
-                "db_number": db_number if area == "DB" else None,
-                "address": start,
-                "size": size,
-                "data_type": data_type,
-                "raw_data": data.hex(),
-                "status": "Success",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            result["timestamp_ns"] = time.time_ns()
+            return result
             
         except Exception as e:
             raise Exception(f"Profinet read error: {str(e)}")
     
+    async def _record_read(self, connection_id: str, ok: bool):
+        """Feed a read outcome to the circuit breaker, logging once when it opens"""
+        if self._breaker_record(connection_id, ok):
+            await self._log_protocol_event(
+                connection_id, "warning",
+                f"Profinet reads failing, pausing reads for {_BREAKER_OPEN_SECONDS:.0f}s"
+            )
+    
+    async def _read_group(self, connection_id: str, packets: List[list]) -> List[list]:
+        """Read a group of packets on one pooled client, reconnecting it if the link dropped"""
+        async with self._acquire(connection_id) as client:
+            if not client.get_connected():
+                info = self.device_info[connection_id]
+                await self._run(connection_id, client.connect, info["ip_address"], info["rack"], info["slot"], info["port"])
+            return await self._run(connection_id, _read_packets, client, packets)
+    
+    async def read_data_point(self, connection_id: str, data_point_config: Dict[str, Any]) -> Any:
+        """Read Profinet data block"""
+        columns = await self.read_data_points(connection_id, [data_point_config])
+        if not columns["status"][0] & 1:
+            raise Exception(f"Profinet read error: {columns['errors'].get(0, 'no data')}")
+        
+        area = data_point_config.get("area", "DB")
+        result = {
+            "value": columns["values"][0],
+            "area": area,
+            "db_number": data_point_config.get("dbNumber", 1) if area == "DB" else None,
+            "address": data_point_config.get("start", 0),
+            "size": data_point_config.get("size", 4),
+            "data_type": data_point_config.get("dataType", "REAL"),
+            "status": "Success",
+            "timestamp": datetime.utcfromtimestamp(columns["timestamp_ns"] / 1e9).isoformat()
+        }
+        if 0 in columns["raw"]:
+            result["raw_data"] = columns["raw"][0]
+        return result
+    
     async def write_data_point(self, connection_id: str, data_point_config: Dict[str, Any], value: Any) -> bool:
         """Write Profinet data block"""
-        if not PROFINET_AVAILABLE:
-            raise Exception("Profinet library not available")
-        
         try:
             if connection_id not in self.clients:
                 raise Exception("Profinet client not connected")
             
-            client = self.clients[connection_id]
-            connection = self.active_connections[connection_id]
+            stats = self._stats[connection_id]
             
             area = data_point_config.get("area", "DB")
-            db_number = data_point_config.get("dbNumber", 1)
+            if area not in _AREA_CODES:
+                raise Exception(f"Unsupported area: {area}")
+            # Only DBs are numbered, so BOOL cache keys match those of read_data_points and write_array
+            db_number = data_point_config.get("dbNumber", 1) if area == "DB" else 0
             start = data_point_config.get("start", 0)
             data_type = data_point_config.get("dataType", "REAL")
             
-            # Prepare data buffer based on type
-            if data_type == "BOOL":
-                bit = data_point_config.get("bit", 0)
-                # Read current byte, modify bit, write back
-                current_data = await asyncio.to_thread(client.db_read, db_number, start, 1)
-                set_bool(current_data, 0, bit, bool(value))
-                data = current_data
+            async with self._acquire(connection_id) as client:
+                buf = self._scratch.get(client)
+                if buf is None:
+                    buf = self._scratch[client] = bytearray(_SCRATCH_SIZE)
                 
-            elif data_type == "BYTE":
-                data = bytearray(1)
-                set_int(data, 0, int(value))
-                
-            elif data_type == "WORD":
-                data = bytearray(2)
-                set_word(data, 0, int(value))
-                
-            elif data_type == "DWORD":
-                data = bytearray(4)
-                set_dword(data, 0, int(value))
-                
-            elif data_type == "INT":
-                data = bytearray(2)
-                set_int(data, 0, int(value))
-                
-            elif data_type == "DINT":
-                data = bytearray(4)
-                set_dint(data, 0, int(value))
-                
-            elif data_type == "REAL":
-                data = bytearray(4)
-                set_real(data, 0, float(value))
+                # Prepare data buffer based on type
+                if data_type == "BOOL":
+                    bit = data_point_config.get("bit", 0)
+                    # Modify the bit in the current byte, reading it only when no recent write left it cached
+                    bit_key = (area, db_number, start)
+                    cached = self._bit_cache[connection_id].get(bit_key)
+                    if cached is not None and cached[1] > time.monotonic():
+                        current_data = bytearray(cached[0])
+                    else:
+                        current_data = await self._run(connection_id, _AREA_READERS[area], client, db_number, start, 1)
+                    set_bool(current_data, 0, bit, bool(value))
+                    data = current_data
+                    
+                elif data_type == "BYTE":
+                    set_byte(buf, 0, int(value))
+                    data = memoryview(buf)[:1]
+                    
+                elif data_type == "WORD":
+                    set_word(buf, 0, int(value))
+                    data = memoryview(buf)[:2]
+                    
+                elif data_type == "DWORD":
+                    set_dword(buf, 0, int(value))
+                    data = memoryview(buf)[:4]
+                    
+                elif data_type == "INT":
+                    set_int(buf, 0, int(value))
+                    data = memoryview(buf)[:2]
+                    
+                elif data_type == "DINT":
+                    set_dint(buf, 0, int(value))
+                    data = memoryview(buf)[:4]
+                    
+                elif data_type == "REAL":
+                    set_real(buf, 0, float(value))
+                    data = memoryview(buf)[:4]
+                    
+                elif data_type == "STRING":
+                    max_len = data_point_config.get("maxLength", 254)
+                    data = buf if max_len + 2 <= _SCRATCH_SIZE else bytearray(max_len + 2)  # +2 for length bytes
+                    set_string(data, 0, str(value), max_len)
+                    data = memoryview(data)[:max_len + 2]
+                    
+                else:
+                    # Raw bytes
+                    if isinstance(value, str):
+                        data = bytearray.fromhex(value)
+                    else:
+                        data = bytearray(value)
                 
-            elif data_type == "STRING":
-                max_len = data_point_config.get("maxLength", 254)
-                data = bytearray(max_len + 2)  # +2 for length bytes
-                set_string(data, 0, str(value), max_len)
+                # Write data based on area
+                if area == "DB":
+                    await self._run(connection_id, client.db_write, db_number, start, data)
+                elif area == "MK":
+                    await self._run(connection_id, client.mb_write, start, data)
+                elif area == "PE":
+                    await self._run(connection_id, client.eb_write, start, data)
+                elif area == "PA":
+                    await self._run(connection_id, client.ab_write, start, data)
+                else:
+                    raise Exception(f"Unsupported area: {area}")
                 
-            else:
-                # Raw bytes
-                if isinstance(value, str):
-                    data = bytearray.fromhex(value)
+                if data_type == "BOOL":
+                    self._bit_cache[connection_id][bit_key] = (data, time.monotonic() + _BIT_CACHE_TTL)
                 else:
-                    data = bytearray(value)
-            
-            # Write data based on area
-            if area == "DB":
-                await asyncio.to_thread(client.db_write, db_number, start, data)
-            elif area == "MK":
-                await asyncio.to_thread(client.mb_write, start, data)
-            elif area == "PE":
-                await asyncio.to_thread(client.eb_write, start, data)
-            elif area == "PA":
-                await asyncio.to_thread(client.ab_write, start, data)
-            else:
-                raise Exception(f"Unsupported area: {area}")
+                    self._invalidate_bits(connection_id, area, db_number, start, len(data))
             
             # Update statistics
-            connection["db_writes"] += 1
-            connection["last_activity"] = datetime.utcnow()
-            
-            await self._log_protocol_event(
-                connection_id, "info",
-                f"Profinet write: {area}{db_number if area == 'DB' else ''}.{start} = {value}",
-                {
-                    "area": area,
-                    "db_number": db_number if area == "DB" else None,
-                    "address": start,
-                    "value": value,
-                    "data_type": data_type
-                }
-            )
+            stats[_WRITES] += 1
+            stats[_LAST_ACTIVITY] = time.monotonic_ns()
+            
+            skipped = self._sample_write_log(connection_id)
+            if skipped is not None:
+                await self._log_protocol_event(
+                    connection_id, "info",
+                    f"Profinet write: {area}{db_number if area == 'DB' else ''}.{start} = {value}",
+                    {
+                        "area": area,
+                        "db_number": db_number if area == "DB" else None,
+                        "address": start,
+                        "value": value,
+                        "data_type": data_type,
+                        "writes_not_logged": skipped
+                    }
+                )
             
             return True
             
@@ -369,9 +884,8 @@ class ProfinetService(BaseProtocolService):
             if connection_id not in self.clients:
                 raise Exception("Profinet client not connected")
             
-            client = self.clients[connection_id]
-            
-            data = await asyncio.to_thread(client.db_read, db_number, start, size)
+            async with self._acquire(connection_id) as client:
+                data = await self._run(connection_id, client.db_read, db_number, start, size)
             return data
             
         except Exception as e:
@@ -383,25 +897,71 @@ class ProfinetService(BaseProtocolService):
             if connection_id not in self.clients:
                 raise Exception("Profinet client not connected")
             
-            client = self.clients[connection_id]
-            connection = self.active_connections[connection_id]
+            stats = self._stats[connection_id]
+            
+            async with self._acquire(connection_id) as client:
+                await self._run(connection_id, client.db_write, db_number, start, data)
+            self._invalidate_bits(connection_id, "DB", db_number, start, len(data))
             
-            await asyncio.to_thread(client.db_write, db_number, start, data)
+            stats[_WRITES] += 1
+            stats[_LAST_ACTIVITY] = time.monotonic_ns()
             
-            connection["db_writes"] += 1
-            connection["last_activity"] = datetime.utcnow()
+            skipped = self._sample_write_log(connection_id)
+            if skipped is not None:
+                await self._log_protocol_event(
+                    connection_id, "info",
+                    f"Profinet DB write: DB{db_number}.{start}, {len(data)} bytes",
+                    {"writes_not_logged": skipped}
+                )
+            
+            return True
             
+        except Exception as e:
             await self._log_protocol_event(
-                connection_id, "info",
-                f"Profinet DB write: DB{db_number}.{start}, {len(data)} bytes"
+                connection_id, "error",
+                f"Profinet DB write error: {str(e)}"
             )
+            return False
+    
+    async def write_array(self, connection_id: str, area: str, db_number: int, start: int,
+                          data_type: str, values: List[Any]) -> bool:
+        """Write consecutive values of one numeric type with a single request"""
+        try:
+            if connection_id not in self.clients:
+                raise Exception("Profinet client not connected")
+            if area not in _AREA_WRITERS:
+                raise Exception(f"Unsupported area: {area}")
+            if data_type not in _ARRAY_FORMATS:
+                raise Exception(f"Unsupported array data type: {data_type}")
+            
+            stats = self._stats[connection_id]
+            db_number = db_number if area == "DB" else 0
+            
+            fmt = f">{len(values)}{_ARRAY_FORMATS[data_type]}"
+            data = bytearray(struct.calcsize(fmt))
+            struct.pack_into(fmt, data, 0, *values)
+            
+            async with self._acquire(connection_id) as client:
+                await self._run(connection_id, _AREA_WRITERS[area], client, db_number, start, data)
+            self._invalidate_bits(connection_id, area, db_number, start, len(data))
+            
+            stats[_WRITES] += 1
+            stats[_LAST_ACTIVITY] = time.monotonic_ns()
+            
+            skipped = self._sample_write_log(connection_id)
+            if skipped is not None:
+                await self._log_protocol_event(
+                    connection_id, "info",
+                    f"Profinet array write: {area}{db_number or ''}.{start}, {len(values)} x {data_type}",
+                    {"writes_not_logged": skipped}
+                )
             
             return True
             
         except Exception as e:
             await self._log_protocol_event(
                 connection_id, "error",
-                f"Profinet DB write error: {str(e)}"
+                f"Profinet array write error: {str(e)}"
             )
             return False
     
@@ -411,10 +971,10 @@ class ProfinetService(BaseProtocolService):
             if connection_id not in self.clients:
                 raise Exception("Profinet client not connected")
             
-            client = self.clients[connection_id]
-            
             # Get CPU status
-            cpu_state = await asyncio.to_thread(client.get_cpu_state)
+            async with self._acquire(connection_id) as client:
+                cpu_state = await self._run(connection_id, client.get_cpu_state)
+                connected = client.get_connected()
             
             status_map = {
                 0: "Unknown",
@@ -425,7 +985,7 @@ class ProfinetService(BaseProtocolService):
             return {
                 "cpu_state": status_map.get(cpu_state, f"Unknown({cpu_state})"),
                 "cpu_state_code": cpu_state,
-                "connected": client.get_connected(),
+                "connected": connected,
                 "timestamp": datetime.utcnow().isoformat()
             }
             
@@ -1,26 +1,108 @@
 import asyncio
+from array import array
 import json
 import logging
-from typing import Dict, Set, Any, Optional
-from datetime import datetime
+import time
+import zlib
+from itertools import islice
+from typing import Dict, Any, Optional, Iterator, List, Set
+from datetime import datetime, timedelta
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    
+    def _encode(value) -> bytes:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _encode(value) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+# Binary frames start with a codec byte; payloads above the threshold are zlib compressed once for all receivers
+FRAME_RAW = b"\x00"
+FRAME_ZLIB = b"\x01"
+COMPRESS_THRESHOLD = 512
+
+# Seconds without a heartbeat after which a connection counts as stale
+_STALE_AFTER = 300
+
+# Seconds an ISO timestamp string is reused by the messages built around the same time
+_TIMESTAMP_CACHE_SECONDS = 0.01
+
+# Compact array layout of high-rate messages: [type id, timestamp ms, ...fields]
+TYPE_MONITORING = 1
+
+# Broadcasts queued on a channel go out together, up to this many messages and encoded bytes per frame
+_MAX_BATCH = 256
+_MAX_BATCH_BYTES = 64 * 1024
+# Drained batches at least this long are encoded and compressed in a worker thread
+_OFFLOAD_MIN_BATCH = 16
+
+# Encoded messages buffered per connection before it is dropped as a slow consumer
+_SEND_QUEUE_SIZE = 512
+# Socket writes in flight at once across all connection writers
+_MAX_INFLIGHT_SENDS = 1024
+
+def _frame(payload: bytes) -> bytes:
+    """Prefix an encoded message with its codec byte, compressing large ones"""
+    if len(payload) > COMPRESS_THRESHOLD:
+        return FRAME_ZLIB + zlib.compress(payload, 1)
+    return FRAME_RAW + payload
+
+def _encode_batch(messages: List[Any], timestamp: str) -> List[bytes]:
+    """Encode drained messages into framed payloads of at most _MAX_BATCH_BYTES each"""
+    stamp = _encode(timestamp)
+    frames = []
+    items = []
+    size = 0
+    
+    def flush():
+        # A lone message goes out as is, a burst as {"type": "batch", "items": [...]}
+        if len(items) == 1:
+            payload = items[0]
+        else:
+            payload = b'{"type":"batch","timestamp":' + stamp + b',"items":[' + b",".join(items) + b"]}"
+        frames.append(_frame(payload))
+    
+    for message in messages:
+        encoded = _encode(message)
+        if items and size + len(encoded) > _MAX_BATCH_BYTES:
+            flush()
+            items = []
+            size = 0
+        items.append(encoded)
+        size += len(encoded) + 1
+    if items:
+        flush()
+    return frames
+
 class WebSocketManager:
     """Manager for WebSocket connections and broadcasting"""
     
     def __init__(self):
-        # Store active connections by channel
-        self.active_connections: Dict[str, Set[WebSocket]] = {
-            "monitoring": set(),
-            "connections": set(),
-            "logs": set()
+        # Store active connections by channel (dicts used as ordered sets, values unused)
+        self.active_connections: Dict[str, Dict[WebSocket, None]] = {
+            "monitoring": {},
+            "connections": {},
+            "logs": {}
         }
         self.connection_info: Dict[WebSocket, Dict[str, Any]] = {}
         self.heartbeat_task: Optional[asyncio.Task] = None
         self.cleanup_task: Optional[asyncio.Task] = None
+        # Messages waiting for the batch flusher of each channel
+        self._outbox: Dict[str, asyncio.Queue] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        # Pending closes of dropped connections, referenced until they finish
+        self._close_tasks: Set[asyncio.Task] = set()
+        self.dropped_messages = 0
+        self._send_slots = asyncio.Semaphore(_MAX_INFLIGHT_SENDS)
+        # (ISO timestamp, loop time it was formatted at)
+        self._ts_cache = ("", float("-inf"))
+        # Channel counts, rebuilt on demand after connect/disconnect
+        self._counts: Optional[Dict[str, Any]] = None
         logger.info("WebSocket Manager initialized")
     
     async def connect(self, websocket: WebSocket, channel: str, client_info: Dict[str, Any] = None):
@@ -29,17 +111,23 @@ class WebSocketManager:
             await websocket.accept()
             
             if channel not in self.active_connections:
-                self.active_connections[channel] = set()
+                self.active_connections[channel] = {}
             
-            self.active_connections[channel].add(websocket)
-            self.connection_info[websocket] = {
+            self.active_connections[channel][websocket] = None
+            self._counts = None
+            info = self.connection_info[websocket] = {
                 "channel": channel,
                 "connected_at": datetime.utcnow(),  # Changed from datetime.now()
                 "client_info": client_info or {},
-                "messages_sent": 0,
+                # Single-slot counter the writer bumps without touching this dict
+                "sent": array("Q", [0]),
                 "messages_received": 0,
-                "last_heartbeat": datetime.utcnow()
+                "last_heartbeat_mono": time.monotonic(),
+                "queue": asyncio.Queue(maxsize=_SEND_QUEUE_SIZE),
+                # Cleared on disconnect; send paths check this instead of client_state
+                "alive": True
             }
+            info["writer"] = asyncio.create_task(self._writer_loop(websocket, info))
             
             logger.info(f"WebSocket connected to channel '{channel}'. Total connections in channel: {len(self.active_connections[channel])}")
             
@@ -48,30 +136,43 @@ class WebSocketManager:
                 "type": "connection_confirmed",
                 "data": {
                     "channel": channel,
-                    "server_time": datetime.utcnow().isoformat() + "Z",
+                    "server_time": self._now_iso(),
                     "message": f"Connected to {channel} channel"
                 }
             }, websocket)
             
         except Exception as e:
             logger.error(f"Error connecting WebSocket to channel {channel}: {e}")
+            # Do not leave a half-registered socket (and its writer) behind
+            self.disconnect(websocket)
             raise
     
+    def _now_iso(self) -> str:
+        """Current UTC time as an ISO string, formatted at most once per cache window"""
+        now = asyncio.get_running_loop().time()
+        if now - self._ts_cache[1] > _TIMESTAMP_CACHE_SECONDS:
+            self._ts_cache = (datetime.utcnow().isoformat() + "Z", now)
+        return self._ts_cache[0]
+    
     def disconnect(self, websocket: WebSocket):
         """Disconnect a WebSocket from all channels"""
+        self._counts = None
         try:
-            # Find and remove from all channels
-            channel_name = None
-            for channel, connections in self.active_connections.items():
-                if websocket in connections:
-                    connections.discard(websocket)
-                    channel_name = channel
-            
-            # Remove connection info
-            if websocket in self.connection_info:
-                connection_info = self.connection_info[websocket]
-                channel_name = connection_info.get("channel", channel_name)
-                del self.connection_info[websocket]
+            connection_info = self.connection_info.pop(websocket, None)
+            if connection_info is not None:
+                connection_info["alive"] = False
+                # The channel is known from the connection info, no need to scan
+                channel_name = connection_info["channel"]
+                self.active_connections.get(channel_name, {}).pop(websocket, None)
+                writer = connection_info.get("writer")
+                if writer and writer is not asyncio.current_task():
+                    writer.cancel()
+            else:
+                channel_name = None
+                for channel, connections in self.active_connections.items():
+                    if websocket in connections:
+                        del connections[websocket]
+                        channel_name = channel
             
             if channel_name:
                 logger.info(f"WebSocket disconnected from channel '{channel_name}'")
@@ -79,25 +180,63 @@ class WebSocketManager:
         except Exception as e:
             logger.error(f"Error disconnecting WebSocket: {e}")
     
+    async def _writer_loop(self, websocket: WebSocket, info: Dict[str, Any]):
+        """Send the queued messages of one connection in order"""
+        queue = info["queue"]
+        sent = info["sent"]
+        try:
+            while True:
+                payload = await queue.get()
+                async with self._send_slots:
+                    await websocket.send_bytes(payload)
+                sent[0] += 1
+        except asyncio.CancelledError:
+            pass
+        except WebSocketDisconnect:
+            self.disconnect(websocket)
+        except Exception as e:
+            logger.error(f"Error sending to WebSocket in {info['channel']}: {e}")
+            self.disconnect(websocket)
+    
+    def _queue_payload(self, websocket: WebSocket, info: Dict[str, Any], payload: bytes, to_remove: Optional[list] = None) -> bool:
+        """Hand an encoded message to a connection's writer, dropping the connection if it cannot keep up"""
+        try:
+            info["queue"].put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            self.dropped_messages += 1
+            logger.warning(f"Dropping slow WebSocket client in {info['channel']}: {_SEND_QUEUE_SIZE} messages pending")
+            if to_remove is None:
+                self.disconnect(websocket)
+            else:
+                to_remove.append(websocket)
+            task = asyncio.create_task(self._close(websocket))
+            self._close_tasks.add(task)
+            task.add_done_callback(self._close_tasks.discard)
+            return False
+    
+    @staticmethod
+    async def _close(websocket: WebSocket):
+        """Close a dropped connection, ignoring errors from a socket that is already gone"""
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+    
     async def send_personal_message(self, message: Dict[str, Any], websocket: WebSocket):
         """Send message to a specific WebSocket"""
         try:
             # Check if connection is still active
-            if websocket.client_state != WebSocketState.CONNECTED:
+            info = self.connection_info.get(websocket)
+            if info is None or not info["alive"]:
                 self.disconnect(websocket)
                 return False
             
             # Add timestamp if not present
             if "timestamp" not in message:
-                message["timestamp"] = datetime.utcnow().isoformat() + "Z"  # Changed from datetime.now()
+                message["timestamp"] = self._now_iso()  # Changed from datetime.now()
             
-            await websocket.send_text(json.dumps(message))
-            
-            # Update message counter
-            if websocket in self.connection_info:
-                self.connection_info[websocket]["messages_sent"] += 1
-            
-            return True
+            return self._queue_payload(websocket, info, _frame(_encode(message)))
             
         except WebSocketDisconnect:
             self.disconnect(websocket)
@@ -112,72 +251,126 @@ class WebSocketManager:
         if channel not in self.active_connections:
             logger.warning(f"Attempted to broadcast to non-existent channel: {channel}")
             return
+        if not self.active_connections[channel]:
+            return
         
         # Add timestamp to message
-        message["timestamp"] = datetime.utcnow().isoformat() + "Z"  # Changed from datetime.now()
+        message["timestamp"] = self._now_iso()  # Changed from datetime.now()
+        payload = _frame(_encode(message))
         
-        # Get copy of connections to avoid modification during iteration
-        connections = self.active_connections[channel].copy()
+        await self._send_payload(payload, channel)
+    
+    async def _send_payload(self, payload: bytes, channel: str):
+        """Queue an encoded message on the writers of all connections in a channel"""
+        # Iterate the live registry; removals are deferred until the loop is done
+        connections = self.active_connections[channel]
+        connection_info = self.connection_info
+        to_remove = []
         successful_sends = 0
         failed_sends = 0
         
         for connection in connections:
             try:
-                if connection.client_state == WebSocketState.CONNECTED:
-                    await connection.send_text(json.dumps(message))
-                    
-                    # Update message counter
-                    if connection in self.connection_info:
-                        self.connection_info[connection]["messages_sent"] += 1
-                    
-                    successful_sends += 1
+                info = connection_info.get(connection)
+                if info is not None and info["alive"]:
+                    if self._queue_payload(connection, info, payload, to_remove):
+                        successful_sends += 1
+                    else:
+                        failed_sends += 1
                 else:
                     # Connection is not active, remove it
-                    self.active_connections[channel].discard(connection)
-                    if connection in self.connection_info:
-                        del self.connection_info[connection]
+                    to_remove.append(connection)
                     failed_sends += 1
                     
             except WebSocketDisconnect:
-                self.disconnect(connection)
+                to_remove.append(connection)
                 failed_sends += 1
             except Exception as e:
                 logger.error(f"Error broadcasting to connection in {channel}: {e}")
                 # Remove broken connection
-                self.disconnect(connection)
+                to_remove.append(connection)
                 failed_sends += 1
         
+        for connection in to_remove:
+            self.disconnect(connection)
+        
         if failed_sends > 0:
             logger.info(f"Broadcast to {channel}: {successful_sends} successful, {failed_sends} failed")
     
+    def _enqueue(self, message: Any, channel: str):
+        """Queue a broadcast for the channel's batch flusher without waiting for the sends"""
+        if channel not in self.active_connections:
+            logger.warning(f"Attempted to broadcast to non-existent channel: {channel}")
+            return
+        if not self.active_connections[channel]:
+            return
+        
+        if isinstance(message, dict):
+            message["timestamp"] = self._now_iso()
+        
+        queue = self._outbox.get(channel)
+        if queue is None:
+            queue = self._outbox[channel] = asyncio.Queue()
+        task = self._flush_tasks.get(channel)
+        if task is None or task.done():
+            self._flush_tasks[channel] = asyncio.create_task(self._flush_loop(channel))
+        queue.put_nowait(message)
+    
+    async def _flush_loop(self, channel: str):
+        """Send a channel's queued messages, draining everything available into one batch frame"""
+        queue = self._outbox[channel]
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            try:
+                messages = [await queue.get()]
+                while len(messages) < _MAX_BATCH:
+                    try:
+                        messages.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                
+                # Bursts are encoded off the loop so it keeps serving sockets meanwhile
+                timestamp = self._now_iso()
+                if len(messages) >= _OFFLOAD_MIN_BATCH:
+                    frames = await loop.run_in_executor(None, _encode_batch, messages, timestamp)
+                else:
+                    frames = _encode_batch(messages, timestamp)
+                
+                for payload in frames:
+                    await self._send_payload(payload, channel)
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error flushing broadcasts for {channel}: {e}")
+    
     async def broadcast_monitoring_data(self, protocol_id: str, connection_id: str, metrics: Dict[str, Any]):
         """Broadcast monitoring data to monitoring channel"""
-        message = {
-            "type": "monitoring_data",
-            "data": {
-                "protocol_id": protocol_id,
-                "connection_id": connection_id,
-                "metrics": metrics,
-                "timestamp": datetime.utcnow().isoformat() + "Z"
-            }
-        }
-        await self.broadcast(message, "monitoring")
+        if not self.active_connections.get("monitoring"):
+            return
+        message = [TYPE_MONITORING, time.time_ns() // 1_000_000, protocol_id, connection_id, metrics]
+        self._enqueue(message, "monitoring")
     
     async def broadcast_connection_status(self, connection_id: str, status: str, data: Dict[str, Any] = None):
         """Broadcast connection status update"""
+        if not self.active_connections.get("connections"):
+            return
         message = {
             "type": "connection_status_update",
             "data": {
                 "connection_id": connection_id,
                 "status": status,
-                "updated_at": datetime.utcnow().isoformat() + "Z",
+                "updated_at": self._now_iso(),
                 **(data or {})
             }
         }
-        await self.broadcast(message, "connections")
+        self._enqueue(message, "connections")
     
     async def broadcast_log_entry(self, level: str, source: str, message_text: str, metadata: Dict[str, Any] = None):
         """Broadcast log entry to logs channel"""
+        if not self.active_connections.get("logs"):
+            return
         message = {
             "type": "log_entry",
             "data": {
@@ -185,57 +378,68 @@ class WebSocketManager:
                 "source": source,
                 "message": message_text,
                 "metadata": metadata or {},
-                "timestamp": datetime.utcnow().isoformat() + "Z"
+                "timestamp": self._now_iso()
             }
         }
-        await self.broadcast(message, "logs")
+        self._enqueue(message, "logs")
     
     async def send_heartbeat(self):
         """Send heartbeat to all connections"""
+        if not self.connection_info:
+            return
+        
+        server_time = self._now_iso()
         heartbeat_message = {
             "type": "heartbeat",
             "data": {
-                "server_time": datetime.utcnow().isoformat() + "Z",  # Changed from datetime.now()
+                "server_time": server_time,
                 "active_channels": {
                     channel: len(connections) 
                     for channel, connections in self.active_connections.items()
+                    if connections
                 }
-            }
+            },
+            "timestamp": server_time
         }
         
+        # One frame for every socket; each socket lives in exactly one channel
+        payload = _frame(_encode(heartbeat_message))
+        now = time.monotonic()
         total_sent = 0
-        for channel in self.active_connections:
-            connections_before = len(self.active_connections[channel])
-            await self.broadcast(heartbeat_message, channel)
-            total_sent += connections_before
-        
-        # Update heartbeat timestamp for all connections
-        current_time = datetime.utcnow()
-        for websocket, info in self.connection_info.items():
-            info["last_heartbeat"] = current_time
+        for websocket, info in list(self.connection_info.items()):
+            if websocket.client_state != WebSocketState.CONNECTED:
+                self.disconnect(websocket)
+            elif self._queue_payload(websocket, info, payload):
+                info["last_heartbeat_mono"] = now
+                total_sent += 1
         
         logger.debug(f"Heartbeat sent to {total_sent} connections across all channels")
     
     async def cleanup_broken_connections(self):
         """Clean up broken WebSocket connections"""
         broken_connections = []
-        current_time = datetime.utcnow()
+        now = time.monotonic()
         
         for websocket, info in list(self.connection_info.items()):
             try:
                 # Check if connection is stale (no heartbeat response in 5 minutes)
-                last_heartbeat = info.get("last_heartbeat", current_time)
-                if (current_time - last_heartbeat).total_seconds() > 300:  # 5 minutes
+                if now - info["last_heartbeat_mono"] > _STALE_AFTER:
                     broken_connections.append(websocket)
                     continue
                 
                 # Check connection state
                 if websocket.client_state != WebSocketState.CONNECTED:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"WebSocket in {info['channel']} still marked alive after leaving CONNECTED state")
                     broken_connections.append(websocket)
                     
             except Exception:
                 broken_connections.append(websocket)
         
+        # Sockets left in a channel without connection info are orphans
+        for connections in self.active_connections.values():
+            broken_connections.extend(ws for ws in connections if ws not in self.connection_info)
+        
         # Clean up broken connections
         for websocket in broken_connections:
             self.disconnect(websocket)
@@ -243,64 +447,78 @@ class WebSocketManager:
         if broken_connections:
             logger.info(f"Cleaned up {len(broken_connections)} broken WebSocket connections")
     
-    def get_connection_stats(self) -> Dict[str, Any]:
-        """Get WebSocket connection statistics"""
+    def get_connection_counts(self) -> Dict[str, Any]:
+        """Get per-channel and total connection counts (cached, treat as read-only)"""
+        if self._counts is None:
+            channels = {channel: len(connections) for channel, connections in self.active_connections.items()}
+            self._counts = {
+                "channels": channels,
+                "total_connections": sum(channels.values())
+            }
+        return self._counts
+    
+    def iter_connection_details(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield details for a page of connections, built only as they are consumed"""
         current_time = datetime.utcnow()
+        now = time.monotonic()
+        stop = None if limit is None else offset + limit
         
-        stats = {
-            "channels": {},
-            "total_connections": 0,
-            "connection_details": []
-        }
-        
-        for channel, connections in self.active_connections.items():
-            stats["channels"][channel] = len(connections)
-            stats["total_connections"] += len(connections)
-        
-        # Add detailed connection info
-        for websocket, info in self.connection_info.items():
-            connected_duration = (current_time - info["connected_at"]).total_seconds()
-            stats["connection_details"].append({
+        for info in islice(list(self.connection_info.values()), offset, stop):
+            yield {
                 "channel": info["channel"],
                 "connected_at": info["connected_at"].isoformat(),
-                "connected_duration_seconds": connected_duration,
-                "messages_sent": info["messages_sent"],
+                "connected_duration_seconds": (current_time - info["connected_at"]).total_seconds(),
+                "messages_sent": info["sent"][0],
                 "messages_received": info["messages_received"],
                 "client_info": info["client_info"],
-                "last_heartbeat": info.get("last_heartbeat", info["connected_at"]).isoformat()
-            })
-        
-        return stats
+                "last_heartbeat": (current_time - timedelta(seconds=now - info["last_heartbeat_mono"])).isoformat()
+            }
     
-    async def start_heartbeat_task(self, interval: int = 30):
-        """Start periodic heartbeat task"""
-        logger.info(f"Starting WebSocket heartbeat task with {interval}s interval")
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Get WebSocket connection statistics"""
+        counts = self.get_connection_counts()
+        return {
+            "channels": dict(counts["channels"]),
+            "total_connections": counts["total_connections"],
+            "connection_details": list(self.iter_connection_details())
+        }
+    
+    @staticmethod
+    async def _run_every(interval: float, job, name: str):
+        """Run a job on fixed ticks so time spent in the job does not stretch the period"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
         
         while True:
             try:
-                await self.send_heartbeat()
-                await asyncio.sleep(interval)
+                await job()
             except asyncio.CancelledError:
-                logger.info("Heartbeat task cancelled")
+                logger.info(f"{name} task cancelled")
                 break
             except Exception as e:
-                logger.error(f"Error in heartbeat task: {e}")
-                await asyncio.sleep(interval)
+                logger.error(f"Error in {name.lower()} task: {e}")
+            
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay <= 0:
+                # Overran a whole tick: start over from now instead of firing back-to-back
+                next_tick = loop.time()
+                delay = 0
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                logger.info(f"{name} task cancelled")
+                break
+    
+    async def start_heartbeat_task(self, interval: int = 30):
+        """Start periodic heartbeat task"""
+        logger.info(f"Starting WebSocket heartbeat task with {interval}s interval")
+        await self._run_every(interval, self.send_heartbeat, "Heartbeat")
     
     async def start_cleanup_task(self, interval: int = 120):
         """Start periodic cleanup task"""
         logger.info(f"Starting WebSocket cleanup task with {interval}s interval")
-        
-        while True:
-            try:
-                await self.cleanup_broken_connections()
-                await asyncio.sleep(interval)
-            except asyncio.CancelledError:
-                logger.info("Cleanup task cancelled")
-                break
-            except Exception as e:
-                logger.error(f"Error in cleanup task: {e}")
-                await asyncio.sleep(interval)
+        await self._run_every(interval, self.cleanup_broken_connections, "Cleanup")
     
     async def start_background_tasks(self):
         """Start all background tasks"""
@@ -328,6 +546,13 @@ class WebSocketManager:
             except asyncio.CancelledError:
                 pass
         
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+        
+        if self._close_tasks:
+            await asyncio.gather(*self._close_tasks, return_exceptions=True)
+        
         logger.info("WebSocket background tasks stopped")
 
 # Global WebSocket manager instance
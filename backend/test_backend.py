@@ -4,18 +4,44 @@ Test version of the backend that can run without MongoDB for demonstration
 """
 import asyncio
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
+from types import SimpleNamespace
 import random
 import json
 
+# ORJSONResponse needs the optional orjson package
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan"""
+    # The mock store stands where main.py opens its pooled MongoDB client; swap it here, not per endpoint
+    app.state.db = SimpleNamespace(
+        protocols=mock_protocols,
+        protocols_by_id=mock_protocols_by_id,
+        connections=mock_connections
+    )
+    yield
+
 app = FastAPI(
     title="Industrial Protocols Management API - Test Version",
     description="Test backend for industrial protocols management",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DefaultResponse,
+    lifespan=lifespan
 )
 
+async def get_database(request: Request):
+    """Get the data store opened at startup"""
+    return request.app.state.db
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -78,6 +104,11 @@ mock_protocols = [
     }
 ]
 
+# Lookup index over mock_protocols; keeps the first protocol of each id like the old scan did
+mock_protocols_by_id = {}
+for _protocol in mock_protocols:
+    mock_protocols_by_id.setdefault(_protocol["id"], _protocol)
+
 mock_connections = [
     {
         "id": "507f1f77bcf86cd799439015",
@@ -147,18 +178,18 @@ async def health_check():
     }
 
 @app.get("/api/protocols")
-async def get_protocols():
-    return mock_protocols
+async def get_protocols(db=Depends(get_database)):
+    return db.protocols
 
 @app.get("/api/protocols/{protocol_id}")
-async def get_protocol(protocol_id: str):
-    protocol = next((p for p in mock_protocols if p["id"] == protocol_id), None)
+async def get_protocol(protocol_id: str, db=Depends(get_database)):
+    protocol = db.protocols_by_id.get(protocol_id)
     if not protocol:
         raise HTTPException(status_code=404, detail="Protocol not found")
     return protocol
 
 @app.post("/api/protocols")
-async def create_protocol(protocol_data: dict):
+async def create_protocol(protocol_data: dict, db=Depends(get_database)):
     new_protocol = {
         "id": "507f1f77bcf86cd79943901" + str(random.randint(0, 9)),
         "name": protocol_data.get("name", "New Protocol"),
@@ -171,12 +202,14 @@ async def create_protocol(protocol_data: dict):
         "createdAt": datetime.now().isoformat(),
         "updatedAt": datetime.now().isoformat()
     }
-    mock_protocols.append(new_protocol)
+    db.protocols.append(new_protocol)
+    db.protocols_by_id.setdefault(new_protocol["id"], new_protocol)
+    _refresh_protocol_counts()
     return new_protocol
 
 @app.put("/api/protocols/{protocol_id}")
-async def update_protocol(protocol_id: str, protocol_data: dict):
-    protocol = next((p for p in mock_protocols if p["id"] == protocol_id), None)
+async def update_protocol(protocol_id: str, protocol_data: dict, db=Depends(get_database)):
+    protocol = db.protocols_by_id.get(protocol_id)
     if not protocol:
         raise HTTPException(status_code=404, detail="Protocol not found")
     
@@ -184,17 +217,23 @@ async def update_protocol(protocol_id: str, protocol_data: dict):
         if key in protocol:
             protocol[key] = value
     protocol["updatedAt"] = datetime.now().isoformat()
+    if protocol["id"] != protocol_id:
+        del db.protocols_by_id[protocol_id]
+        db.protocols_by_id.setdefault(protocol["id"], protocol)
+    if "status" in protocol_data:
+        _refresh_protocol_counts()
     return protocol
 
 @app.delete("/api/protocols/{protocol_id}")
-async def delete_protocol(protocol_id: str):
-    global mock_protocols
-    mock_protocols = [p for p in mock_protocols if p["id"] != protocol_id]
+async def delete_protocol(protocol_id: str, db=Depends(get_database)):
+    if db.protocols_by_id.pop(protocol_id, None) is not None:
+        db.protocols[:] = [p for p in db.protocols if p["id"] != protocol_id]
+        _refresh_protocol_counts()
     return {"success": True, "message": "Protocol deleted successfully"}
 
 @app.get("/api/connections")
-async def get_connections():
-    return mock_connections
+async def get_connections(db=Depends(get_database)):
+    return db.connections
 
 @app.post("/api/connections/{connection_id}/test")
 async def test_connection(connection_id: str):
@@ -208,38 +247,62 @@ async def test_connection(connection_id: str):
 async def get_monitoring_data():
     # Generate 10 recent monitoring data points
     data = [generate_mock_monitoring_data() for _ in range(10)]
-    return data
+    # Returning the response directly skips FastAPI's jsonable_encoder pass
+    return DefaultResponse(content=data)
+
+# Metrics payload built once; get_metrics only refreshes the random fields before encoding it
+_metrics_template = {
+    "timeRange": "1h",
+    "totalProtocols": 0,
+    "activeProtocols": 0,
+    "aggregatedMetrics": {
+        "bytesPerSecond": 0.0,
+        "messagesPerSecond": 0.0,
+        "errorRate": 0.0,
+        "latency": 0.0,
+        "connectionCount": len(mock_connections)
+    },
+    "protocolMetrics": {
+        "507f1f77bcf86cd799439011": {
+            "name": "Modbus TCP Main",
+            "type": "modbus-tcp",
+            "status": "connected",
+            "bytesPerSecond": 0.0,
+            "messagesPerSecond": 0.0,
+            "errorRate": 0.0,
+            "latency": 0.0,
+            "dataPoints": 50
+        }
+    },
+    "dataPoints": 50
+}
+
+def _refresh_protocol_counts():
+    """Update the protocol counts in the metrics template after protocols change"""
+    _metrics_template["totalProtocols"] = len(mock_protocols)
+    _metrics_template["activeProtocols"] = sum(1 for p in mock_protocols if p["status"] == "connected")
+
+_refresh_protocol_counts()
 
 @app.get("/api/monitoring/metrics")
 async def get_metrics(range: str = "1h"):
-    protocols_count = len(mock_protocols)
-    active_protocols = len([p for p in mock_protocols if p["status"] == "connected"])
+    metrics = _metrics_template
+    metrics["timeRange"] = range
     
-    return {
-        "timeRange": range,
-        "totalProtocols": protocols_count,
-        "activeProtocols": active_protocols,
-        "aggregatedMetrics": {
-            "bytesPerSecond": round(random.uniform(500, 3000), 2),
-            "messagesPerSecond": round(random.uniform(50, 200), 2),
-            "errorRate": round(random.uniform(0, 0.05), 3),
-            "latency": round(random.uniform(20, 80), 2),
-            "connectionCount": len(mock_connections)
-        },
-        "protocolMetrics": {
-            "507f1f77bcf86cd799439011": {
-                "name": "Modbus TCP Main",
-                "type": "modbus-tcp",
-                "status": "connected",
-                "bytesPerSecond": round(random.uniform(800, 1500), 2),
-                "messagesPerSecond": round(random.uniform(40, 80), 2),
-                "errorRate": round(random.uniform(0, 0.02), 3),
-                "latency": round(random.uniform(15, 50), 2),
-                "dataPoints": 50
-            }
-        },
-        "dataPoints": 50
-    }
+    aggregated = metrics["aggregatedMetrics"]
+    aggregated["bytesPerSecond"] = round(random.uniform(500, 3000), 2)
+    aggregated["messagesPerSecond"] = round(random.uniform(50, 200), 2)
+    aggregated["errorRate"] = round(random.uniform(0, 0.05), 3)
+    aggregated["latency"] = round(random.uniform(20, 80), 2)
+    
+    protocol = metrics["protocolMetrics"]["507f1f77bcf86cd799439011"]
+    protocol["bytesPerSecond"] = round(random.uniform(800, 1500), 2)
+    protocol["messagesPerSecond"] = round(random.uniform(40, 80), 2)
+    protocol["errorRate"] = round(random.uniform(0, 0.02), 3)
+    protocol["latency"] = round(random.uniform(15, 50), 2)
+    
+    # Encoded before yielding to the loop, so the shared template cannot change underneath
+    return DefaultResponse(content=metrics)
 
 @app.get("/api/logs")
 async def get_logs(level: str = None, source: str = None, page: int = 1, limit: int = 50):
@@ -318,10 +381,25 @@ if __name__ == "__main__":
     print("🌐 API Documentation: http://localhost:3001/docs")
     print("💻 Test frontend at: http://localhost:3000")
     
+    # uvloop and httptools are not available everywhere (uvloop has no Windows build)
+    try:
+        import uvloop  # noqa: F401
+        loop_impl = "uvloop"
+    except ImportError:
+        loop_impl = "asyncio"
+    try:
+        import httptools  # noqa: F401
+        http_impl = "httptools"
+    except ImportError:
+        http_impl = "h11"
+    
     uvicorn.run(
         "test_backend:app",
         host="0.0.0.0",
         port=3001,
         reload=True,
-        log_level="info"
+        log_level="info",
+        loop=loop_impl,
+        http=http_impl,
+        ws="websockets"
     )
\ No newline at end of file
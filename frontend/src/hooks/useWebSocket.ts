@@ -1,5 +1,39 @@
 import { useEffect, useRef, useState } from 'react';
 
+// Type ids of messages the server sends in compact array form
+const TYPE_MONITORING = 1;
+
+// Codec byte at the start of every binary frame
+const FRAME_ZLIB = 1;
+
+const textDecoder = new TextDecoder();
+
+// Binary frames carry a codec byte followed by raw or zlib compressed JSON
+async function decodeFrame(data: string | ArrayBuffer): Promise<string> {
+  if (typeof data === 'string') return data;
+  const bytes = new Uint8Array(data);
+  const body = bytes.subarray(1);
+  if (bytes[0] === FRAME_ZLIB) {
+    const stream = new Blob([body]).stream().pipeThrough(new DecompressionStream('deflate'));
+    return new Response(stream).text();
+  }
+  return textDecoder.decode(body);
+}
+
+// Expand compact array messages into the object form consumers expect
+function expandMessage(message: any) {
+  if (Array.isArray(message) && message[0] === TYPE_MONITORING) {
+    const [, timestampMs, protocolId, connectionId, metrics] = message;
+    const timestamp = new Date(timestampMs).toISOString();
+    return {
+      type: 'monitoring_data',
+      data: { protocol_id: protocolId, connection_id: connectionId, metrics, timestamp },
+      timestamp
+    };
+  }
+  return message;
+}
+
 interface UseWebSocketOptions {
   onMessage?: (data: any) => void;
   onConnect?: () => void;
@@ -16,6 +50,8 @@ export function useWebSocket(url: string, options: UseWebSocketOptions = {}) {
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null);
   const reconnectAttemptsRef = useRef(0);
+  // Frames decode asynchronously; chaining keeps them in arrival order
+  const decodeChainRef = useRef<Promise<void>>(Promise.resolve());
   
   const {
     onMessage,
@@ -31,6 +67,7 @@ export function useWebSocket(url: string, options: UseWebSocketOptions = {}) {
       setConnectionStatus('connecting');
       
       const ws = new WebSocket(url);
+      ws.binaryType = 'arraybuffer';
       wsRef.current = ws;
 
       ws.onopen = () => {
@@ -42,13 +79,19 @@ export function useWebSocket(url: string, options: UseWebSocketOptions = {}) {
       };
 
       ws.onmessage = (event) => {
-        try {
-          const data = JSON.parse(event.data);
-          setLastMessage(data);
-          onMessage?.(data);
-        } catch (error) {
-          console.error('Error parsing WebSocket message:', error);
-        }
+        decodeChainRef.current = decodeChainRef.current.then(async () => {
+          try {
+            const data = JSON.parse(await decodeFrame(event.data));
+            // Bursts of broadcasts arrive as one batch frame
+            const messages = (data.type === 'batch' ? data.items : [data]).map(expandMessage);
+            for (const message of messages) {
+              setLastMessage(message);
+              onMessage?.(message);
+            }
+          } catch (error) {
+            console.error('Error parsing WebSocket message:', error);
+          }
+        });
       };
 
       ws.onclose = () => {